@@ -10,7 +10,7 @@ import asyncio
 import os
 from dotenv import load_dotenv
 from claude_agent_sdk import ClaudeSDKClient, ClaudeAgentOptions, AssistantMessage, TextBlock
-from tools import travel_tools_server
+from tools import travel_tools_server, get_session_stats, reset_session, startup, shutdown
 
 # Load environment variables
 load_dotenv()
@@ -57,6 +57,12 @@ class AutonomousTravelAgent:
             allowed_tools=[
                 # Travel tools
                 "mcp__travel__get_weather_forecast",
+                "mcp__travel__get_weather_forecasts",
+                "mcp__travel__get_climate_normals",
+                "mcp__travel__geocode",
+                "mcp__travel__get_drive_times",
+                "mcp__travel__plan_walking_route",
+                "mcp__travel__nearby_pois",
                 "mcp__travel__create_trip",
                 "mcp__travel__add_task",
                 "mcp__travel__list_tasks",
@@ -64,6 +70,7 @@ class AutonomousTravelAgent:
                 "mcp__travel__update_task",
                 "mcp__travel__delete_task",
                 "mcp__travel__list_trips",
+                "mcp__travel__trip_breakdown",
                 # Web search for real-time info
                 "WebSearch"
             ],
@@ -115,7 +122,8 @@ class AutonomousTravelAgent:
         PHASE 2 - AUTONOMOUS PLANNING (Work Independently):
         Once you have sufficient information, work autonomously WITHOUT asking for approval:
 
-        1. CHECK WEATHER: Use get_weather_forecast for destination and potential day trip locations
+        1. CHECK WEATHER: Use get_weather_forecasts once for the destination and all day trip locations
+           (for trips more than ~9 days out, use get_climate_normals for typical conditions instead of WebSearch)
         2. RESEARCH: Use WebSearch to find:
            - Hotels/accommodations matching budget and style
            - Restaurants and dining recommendations
@@ -154,11 +162,18 @@ class AutonomousTravelAgent:
         ✓ Don't ask "Should I...?" or "Would you like me to...?" - just do it
 
         YOUR TOOLS:
-        - get_weather_forecast: Check weather (Marbella: 36.51, -4.88; Granada: 37.18, -3.60)
+        - get_weather_forecast: Check weather (Marbella: 36.51, -4.88; Granada: 37.18, -3.60); pass start_date/end_date (YYYY-MM-DD) to get exactly the trip dates
+        - get_weather_forecasts: Compare several locations side by side in one call
+        - get_climate_normals: Typical weather by month for dates beyond the forecast horizon (offline)
+        - geocode: Look up coordinates for a town by name instead of guessing or searching (offline)
+        - get_drive_times: Drive times for day-trip legs or a town-to-town matrix (offline, no WebSearch needed)
+        - plan_walking_route: Sequence a town's sights into a walking tour that fits the time available (offline)
+        - nearby_pois: Parking, restaurants and sights near a town or sight (offline; use before WebSearch)
         - WebSearch: Find hotels, restaurants, activities, current info
         - create_trip: Initialize trip in database
         - add_task: Create planning tasks with categories, priorities, dates
         - list_tasks: Review what you've created
+        - trip_breakdown: Check coverage by category and priority in one call
 
         WORK AUTONOMOUSLY until the goal is achieved. The user trusts you to plan efficiently."""
 
@@ -176,6 +191,12 @@ class AutonomousTravelAgent:
 
         WEATHER TOOL:
         - get_weather_forecast: Real-time forecasts from yr.no
+        - get_weather_forecasts: Multi-location comparison in a single call
+        - get_climate_normals: Monthly climate normals for trips beyond the ~9-day forecast
+        - geocode: Place name → coordinates; weather tools also accept location_name alone
+        - get_drive_times: Driving distance/time per leg of a route, or a matrix of towns
+        - plan_walking_route: Walking tour order, legs and arrival times for a set of sights
+        - nearby_pois: Nearest or within-radius car parks, restaurants, sights, viewpoints, beaches
         - Temperatures in Fahrenheit by default (Celsius available)
         - Coordinates: Marbella (36.51, -4.88), Granada (37.18, -3.60), Málaga (36.72, -4.42)
 
@@ -311,6 +332,11 @@ actionable trip plan."""
             await self.client.disconnect()
         self.client = ClaudeSDKClient(options=self.options)
         self._connected = False
+        reset_session()
+
+    def session_stats(self) -> dict:
+        """Return tool cache statistics (e.g. read cache hit rate), shared by all sessions in this process."""
+        return get_session_stats()
 
 
 async def autonomous_demo():
@@ -432,15 +458,22 @@ async def main():
         print("=" * 80 + "\n")
         return
 
-    if mode == "autonomous":
-        await autonomous_demo()
-    elif mode == "interactive":
-        await interactive_demo()
-    elif mode == "quick":
-        await quick_test()
-    else:
-        print(f"Unknown mode: {mode}")
-        print("Valid options: autonomous, interactive, quick")
+    # Start background tool services (forecast cache warmer)
+    await startup()
+
+    try:
+        if mode == "autonomous":
+            await autonomous_demo()
+        elif mode == "interactive":
+            await interactive_demo()
+        elif mode == "quick":
+            await quick_test()
+        else:
+            print(f"Unknown mode: {mode}")
+            print("Valid options: autonomous, interactive, quick")
+    finally:
+        # Close pooled HTTP connections held by the tools
+        await shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,392 @@
+"""
+Weather Tool Benchmarks
+Measures get_weather_forecast's HTTP path against the local met.no stand-in
+(met_stub.py), so no network access is needed.
+
+Usage: python benchmark_weather.py [benchmark_name] [requests]
+"""
+
+import asyncio
+import json
+import os
+import random
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import aiohttp
+
+import tools.climate_normals as climate_normals
+import tools.weather_cache as weather_cache
+import tools.weather_tool as weather_tool
+from met_stub import MetNoStub, load_fixtures, rebase_payload
+from tools.climate_tool import get_climate_normals
+from tools.rate_limit import TokenBucket
+
+
+def fixture_body(name: str = "marbella") -> bytes:
+    """A recorded ~9-day compact payload, rebased to the current hour."""
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return json.dumps(rebase_payload(load_fixtures()[name], start)).encode()
+
+
+def make_tls_context(workdir: str) -> tuple[ssl.SSLContext, ssl.SSLContext]:
+    """Create a self-signed certificate; return (server, client) SSL contexts."""
+    cert = os.path.join(workdir, "cert.pem")
+    key = os.path.join(workdir, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-keyout", key, "-out", cert, "-subj", "/CN=localhost",
+         "-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True, capture_output=True
+    )
+    server_ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server_ctx.load_cert_chain(cert, key)
+    client_ctx = ssl.create_default_context(cafile=cert)
+    return server_ctx, client_ctx
+
+
+def report(name: str, samples: list[float]):
+    """Print latency percentiles in milliseconds."""
+    ms = sorted(s * 1000 for s in samples)
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    print(f"  {name:<28} mean {statistics.mean(ms):7.2f} ms   p50 {statistics.median(ms):7.2f} ms   p99 {p99:7.2f} ms")
+
+
+async def session_benchmark(requests: int):
+    """Per-call ClientSession (previous behaviour) vs the shared pooled session."""
+    print("=" * 80)
+    print(f"SESSION REUSE: {requests} sequential uncached requests over local HTTPS")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        server_ctx, client_ctx = make_tls_context(workdir)
+        stub = MetNoStub()
+        url = await stub.start(ssl_context=server_ctx)
+        weather_tool.MET_NO_URL = url
+        weather_tool.SSL_CONTEXT = client_ctx
+        # Measure connection reuse, not the request budget
+        rate_limiter = weather_tool.rate_limiter
+        weather_tool.rate_limiter = TokenBucket(rate=1e9, capacity=10 ** 9)
+
+        try:
+            # Previous behaviour: new session, TCP connection and TLS handshake per call
+            fresh = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(url, params={"lat": 36.51, "lon": -4.88}, ssl=client_ctx,
+                                           headers=weather_tool.HEADERS) as response:
+                        await response.json()
+                fresh.append(time.perf_counter() - start)
+
+            # Shared session: connection and TLS session kept alive between calls
+            shared = []
+            for _ in range(requests):
+                weather_tool.forecast_cache.clear()
+                start = time.perf_counter()
+                await weather_tool.fetch_forecast(36.51, -4.88)
+                shared.append(time.perf_counter() - start)
+
+            report("new session per call", fresh)
+            report("shared pooled session", shared)
+        finally:
+            weather_tool.rate_limiter = rate_limiter
+            await weather_tool.close_session()
+            await stub.stop()
+
+
+async def burst_benchmark(requests: int):
+    """Concurrent identical lookups against a slow stub: coalesced into one request."""
+    print("=" * 80)
+    print(f"BURST: {requests} concurrent calls for the same coordinates, 250 ms upstream latency")
+    print("=" * 80)
+
+    stub = MetNoStub(latency=0.25)
+    weather_tool.MET_NO_URL = await stub.start()
+    weather_tool.forecast_cache.clear()
+    before = dict(weather_tool.request_stats)
+
+    async def one_call():
+        start = time.perf_counter()
+        await weather_tool.fetch_forecast(36.51, -4.88)
+        return time.perf_counter() - start
+
+    try:
+        samples = await asyncio.gather(*(one_call() for _ in range(requests)))
+        report("coalesced burst", list(samples))
+        print(f"  upstream requests: {stub.hits}   "
+              f"coalesced callers: {weather_tool.request_stats['coalesced'] - before['coalesced']}")
+    finally:
+        await weather_tool.close_session()
+        await stub.stop()
+
+
+async def parse_benchmark(requests: int):
+    """Full json decode of a ~9-day payload vs parse_forecast, with orjson (if installed) and json."""
+    print("=" * 80)
+    decoder = "orjson" if weather_tool.orjson is not None else "json (orjson not installed)"
+    print(f"PARSE: {requests} decodes of a ~9-day compact payload, parse_forecast uses {decoder}")
+    print("=" * 80)
+
+    body = fixture_body()
+
+    def measure(name: str, decode):
+        samples = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            decode(body)
+            samples.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        result = decode(body)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        if hasattr(result, "to_dict"):
+            result = result.to_dict()
+        report(name, samples)
+        print(f"  {'':<28} peak alloc {peak / 1024:7.1f} KiB   retained {len(json.dumps(result)) / 1024:6.1f} KiB as JSON")
+
+    measure("json.loads (previous)", json.loads)
+    measure("parse_forecast", weather_tool.parse_forecast)
+    measure("parse_forecast (72h horizon)", lambda raw: weather_tool.parse_forecast(raw, horizon_hours=72))
+
+    if weather_tool.orjson is not None:
+        orjson, weather_tool.orjson = weather_tool.orjson, None
+        try:
+            measure("parse_forecast (json)", weather_tool.parse_forecast)
+        finally:
+            weather_tool.orjson = orjson
+
+
+async def daily_benchmark(requests: int):
+    """Per-entry dict walk over the raw payload vs ForecastSeries.daily_summaries."""
+    print("=" * 80)
+    print(f"DAILY: {requests} min/max/mean/precipitation summaries of a ~9-day forecast")
+    print("=" * 80)
+
+    body = fixture_body()
+    payload = json.loads(body)
+    series = weather_tool.parse_forecast(body)
+    tz = weather_tool.local_timezone()
+
+    def dict_walk():
+        days = {}
+        for entry in payload["properties"]["timeseries"]:
+            day = datetime.fromisoformat(entry["time"].replace("Z", "+00:00")).astimezone(tz).date()
+            data = entry["data"]
+            temp = data["instant"]["details"]["air_temperature"]
+            period = data.get("next_1_hours") or data.get("next_6_hours") or {}
+            rain = period.get("details", {}).get("precipitation_amount", 0.0)
+            low, high, total, count, precip = days.get(day, (temp, temp, 0.0, 0, 0.0))
+            days[day] = (min(low, temp), max(high, temp), total + temp, count + 1, precip + rain)
+        return days
+
+    def measure(name: str, summarize):
+        samples = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            summarize()
+            samples.append(time.perf_counter() - start)
+        report(name, samples)
+
+    measure("dict walk per entry", dict_walk)
+    measure("daily_summaries (all days)", lambda: series.daily_summaries(tz))
+    measure("daily_summaries (3 days)", lambda: series.daily_summaries(tz, days=3))
+
+
+async def cluster_benchmark(requests: int):
+    """Cache hit rate for jittered Costa del Sol coordinates: exact keys vs geohash + nearby reuse."""
+    print("=" * 80)
+    print(f"CLUSTER: {requests} lookups of 4 towns with coordinates jittered by up to ~300 m")
+    print("=" * 80)
+
+    towns = [(36.51, -4.88), (37.18, -3.60), (36.72, -4.42), (36.74, -5.17)]
+    rng = random.Random(42)
+    queries = [
+        (round(lat + rng.uniform(-0.003, 0.003), 4), round(lon + rng.uniform(-0.003, 0.003), 4))
+        for lat, lon in (rng.choice(towns) for _ in range(requests))
+    ]
+
+    stub = MetNoStub()
+    weather_tool.MET_NO_URL = await stub.start()
+    original = weather_tool.forecast_cache
+
+    async def measure(name: str, precision: int, nearby_km: float):
+        weather_tool.forecast_cache = weather_cache.ForecastCache(max_entries=256, nearby_km=nearby_km, precision=precision)
+        before = stub.hits
+        for lat, lon in queries:
+            await weather_tool.fetch_forecast(lat, lon)
+        stats = weather_tool.forecast_cache.stats()
+        print(f"  {name:<28} hit rate {stats['hit_rate']:6.1%}   upstream requests {stub.hits - before:5}   "
+              f"nearby hits {stats['nearby_hits']}")
+
+    try:
+        await measure("exact coordinates", 12, 0.0)
+        await measure("geohash precision 6", 6, 0.0)
+        await measure("geohash 6 + nearby 1.5 km", 6, 1.5)
+    finally:
+        weather_tool.forecast_cache = original
+        await weather_tool.close_session()
+        await stub.stop()
+
+
+async def load_benchmark(requests: int):
+    """Tool-call throughput and tail latency with upstream latency and injected 429/503s."""
+    print("=" * 80)
+    print(f"LOAD: {requests} get_weather_forecast calls from 16 workers, "
+          "30–70 ms upstream latency, 2% 429/503")
+    print("=" * 80)
+
+    stub = MetNoStub(latency=0.03, jitter=0.04, error_rate=0.02, retry_after="0", seed=7)
+    weather_tool.MET_NO_URL = await stub.start()
+    original = (weather_tool.forecast_cache, weather_tool.rate_limiter)
+
+    # Distinct cells across Andalusia (every call a cache miss) and a hot set of 20
+    cold = [(36.0 + (i // 50) * 0.05, -6.0 + (i % 50) * 0.05) for i in range(requests)]
+    hot = [cold[i % 20] for i in range(requests)]
+
+    async def measure(name: str, locations: list[tuple[float, float]], rate_limiter: TokenBucket):
+        weather_tool.forecast_cache = weather_cache.ForecastCache(max_entries=256)
+        weather_tool.rate_limiter = rate_limiter
+        before_hits, before = stub.hits, dict(weather_tool.request_stats)
+        queue = list(reversed(locations))
+        samples, errors = [], 0
+
+        async def worker():
+            nonlocal errors
+            while queue:
+                lat, lon = queue.pop()
+                start = time.perf_counter()
+                result = await weather_tool.get_weather_forecast.handler({"latitude": lat, "longitude": lon})
+                samples.append(time.perf_counter() - start)
+                errors += bool(result.get("is_error"))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(16)))
+        elapsed = time.perf_counter() - start
+
+        report(name, samples)
+        print(f"  {'':<28} {len(samples) / elapsed:7.1f} calls/s   upstream {stub.hits - before_hits:4}   "
+              f"retries {weather_tool.request_stats['retries'] - before['retries']:3}   errors {errors}")
+
+    try:
+        await measure("cold, 10 req/s budget", cold, TokenBucket(rate=10, capacity=10))
+        await measure("cold, no client limit", cold, TokenBucket(rate=1e9, capacity=10 ** 9))
+        await measure("20 hot locations", hot, TokenBucket(rate=10, capacity=10))
+    finally:
+        weather_tool.forecast_cache, weather_tool.rate_limiter = original
+        await weather_tool.close_session()
+        await stub.stop()
+
+
+async def hedge_benchmark(requests: int):
+    """Tail latency against a primary with slow outliers, without and with a hedging secondary."""
+    print("=" * 80)
+    print(f"HEDGE: {requests} uncached requests; primary 20–30 ms with 2% +800 ms outliers, secondary 20–30 ms")
+    print("=" * 80)
+
+    primary = MetNoStub(latency=0.02, jitter=0.01, tail_rate=0.02, tail_latency=0.8, seed=3)
+    secondary = MetNoStub(latency=0.02, jitter=0.01, seed=4)
+    weather_tool.MET_NO_URL = await primary.start()
+    secondary_url = await secondary.start()
+    original = (weather_tool.rate_limiter, weather_tool.primary_provider, weather_tool.secondary_provider)
+    weather_tool.rate_limiter = TokenBucket(rate=1e9, capacity=10 ** 9)
+
+    async def measure(name: str, hedge: bool):
+        weather_tool.primary_provider = weather_tool.MetNoProvider()
+        weather_tool.secondary_provider = weather_tool.ForecastProvider("mirror", secondary_url) if hedge else None
+        before = (primary.hits, secondary.hits, dict(weather_tool.request_stats))
+        samples = []
+        for _ in range(requests):
+            weather_tool.forecast_cache.clear()
+            start = time.perf_counter()
+            await weather_tool.fetch_forecast(36.51, -4.88)
+            samples.append(time.perf_counter() - start)
+
+        sent = primary.hits - before[0] + secondary.hits - before[1]
+        report(name, samples)
+        print(f"  {'':<28} upstream requests {sent} ({sent / requests:.2f} per call)   "
+              f"hedged {weather_tool.request_stats['hedged'] - before[2]['hedged']}   "
+              f"hedge wins {weather_tool.request_stats['hedge_wins'] - before[2]['hedge_wins']}")
+
+    try:
+        await measure("primary only", hedge=False)
+        await measure("hedged after primary p95", hedge=True)
+    finally:
+        weather_tool.rate_limiter, weather_tool.primary_provider, weather_tool.secondary_provider = original
+        await weather_tool.close_session()
+        await primary.stop()
+        await secondary.stop()
+
+
+async def climate_benchmark(requests: int):
+    """Offline climate normals: first lookup in a cell, repeat lookups, and a full tool call."""
+    print("=" * 80)
+    print(f"CLIMATE: {requests} climate normal lookups for random Andalusian coordinates (no network)")
+    print("=" * 80)
+
+    rng = random.Random(42)
+    points = [(rng.uniform(36.0, 38.5), rng.uniform(-7.4, -1.7)) for _ in range(requests)]
+    index = climate_normals.ClimateIndex()
+
+    def measure(name: str, lookup):
+        samples = []
+        for lat, lon in points:
+            start = time.perf_counter()
+            lookup(lat, lon)
+            samples.append(time.perf_counter() - start)
+        report(name, samples)
+
+    measure("cell (cold index)", index.cell)
+    measure("cell (warm index)", index.cell)
+    measure("12 months, altitude 740 m", lambda lat, lon: index.normals(lat, lon, 740))
+
+    samples = []
+    for lat, lon in points:
+        start = time.perf_counter()
+        await get_climate_normals.handler({"latitude": lat, "longitude": lon,
+                                           "start_date": "2026-03-07", "end_date": "2026-03-13"})
+        samples.append(time.perf_counter() - start)
+    report("tool call (7-day trip)", samples)
+    print(f"  {'':<28} {index.stats()['cells']} cells interpolated from {len(index.stations)} stations")
+
+
+BENCHMARKS = {
+    "session": session_benchmark,
+    "burst": burst_benchmark,
+    "parse": parse_benchmark,
+    "daily": daily_benchmark,
+    "cluster": cluster_benchmark,
+    "load": load_benchmark,
+    "hedge": hedge_benchmark,
+    "climate": climate_benchmark
+}
+
+
+async def main():
+    """Run one benchmark (or all) by name."""
+    name = sys.argv[1].lower() if len(sys.argv) > 1 else "all"
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    # Measure the HTTP path only; don't read or write weather_cache.db
+    weather_tool.forecast_cache.disk = None
+
+    if name == "all":
+        for benchmark in BENCHMARKS.values():
+            await benchmark(requests)
+    elif name in BENCHMARKS:
+        await BENCHMARKS[name](requests)
+    else:
+        print(f"Unknown benchmark: {name}")
+        print(f"Valid options: all, {', '.join(BENCHMARKS)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,7 +8,8 @@ import asyncio
 import os
 from dotenv import load_dotenv
 from claude_agent_sdk import ClaudeSDKClient, ClaudeAgentOptions, AssistantMessage, TextBlock
-from tools import travel_tools_server
+from tools import travel_tools_server, get_session_stats, reset_session, startup, shutdown
+from tools.reminder_scheduler import print_sink
 
 # Load environment variables
 load_dotenv()
@@ -50,7 +51,13 @@ class MarbellaConversationalAgent:
             You now have access to tools for enhanced trip planning:
 
             WEATHER TOOL:
-            - get_weather_forecast: Get weather forecasts for any location
+            - get_weather_forecast: Get weather forecasts for any location (pass start_date/end_date for a trip window)
+            - get_weather_forecasts: Compare several locations in one call (use instead of repeated single lookups)
+            - get_climate_normals: Typical weather by month, offline (use for trips more than ~9 days out instead of searching the web)
+            - geocode: Coordinates and elevation for any Andalusian town or Spanish city, offline (the weather tools also accept location_name alone)
+            - get_drive_times: Driving distance/time between towns, offline (list the stops in order for a day-trip route)
+            - plan_walking_route: Order sights into a walking tour with times, offline (pass dwell_minutes, must_see and a time budget)
+            - nearby_pois: Car parks, restaurants, sights, viewpoints and beaches near a town or sight, offline (check here before searching the web)
             - Defaults to Fahrenheit (can specify Celsius if user prefers)
             - Marbella coordinates: lat=36.51, lon=-4.88
             - Use for day trips: Granada (37.18, -3.60), Málaga (36.72, -4.42), Ronda (36.74, -5.17)
@@ -60,6 +67,7 @@ class MarbellaConversationalAgent:
             - Add tasks with categories: accommodation, activities, dining, transport
             - Set priorities: low, medium, high
             - Track completion and due dates
+            - Use trip_breakdown for per-category/priority progress instead of listing every task
             - Help users build comprehensive travel checklists
             - Remember tasks across conversation turns to build comprehensive plans""",
 
@@ -69,13 +77,20 @@ class MarbellaConversationalAgent:
             # Allow all travel planning tools
             allowed_tools=[
                 "mcp__travel__get_weather_forecast",
+                "mcp__travel__get_weather_forecasts",
+                "mcp__travel__get_climate_normals",
+                "mcp__travel__geocode",
+                "mcp__travel__get_drive_times",
+                "mcp__travel__plan_walking_route",
+                "mcp__travel__nearby_pois",
                 "mcp__travel__create_trip",
                 "mcp__travel__add_task",
                 "mcp__travel__list_tasks",
                 "mcp__travel__complete_task",
                 "mcp__travel__update_task",
                 "mcp__travel__delete_task",
-                "mcp__travel__list_trips"
+                "mcp__travel__list_trips",
+                "mcp__travel__trip_breakdown"
             ],
 
             # Use default permission mode
@@ -126,6 +141,11 @@ class MarbellaConversationalAgent:
             await self.client.disconnect()
         self.client = ClaudeSDKClient(options=self.options)
         self._connected = False
+        reset_session()
+
+    def session_stats(self) -> dict:
+        """Return tool cache statistics (e.g. read cache hit rate), shared by all sessions in this process."""
+        return get_session_stats()
 
 
 async def demo_conversation():
@@ -138,8 +158,9 @@ async def demo_conversation():
     print("=" * 80)
     print("This agent maintains conversation history across multiple turns.\n")
 
-    # Create the conversational agent
+    # Create the conversational agent and start background tool services
     agent = MarbellaConversationalAgent()
+    await startup()
 
     # Multi-turn conversation demonstrating memory and context building
     conversation_turns = [
@@ -170,42 +191,46 @@ async def demo_conversation():
         }
     ]
 
-    print("Starting multi-turn conversation...\n")
-    print("=" * 80)
+    try:
+        print("Starting multi-turn conversation...\n")
+        print("=" * 80)
 
-    for turn_data in conversation_turns:
-        print(f"\n{'=' * 80}")
-        print(f"TURN {turn_data['turn']}")
-        print(f"Context Note: {turn_data['note']}")
+        for turn_data in conversation_turns:
+            print(f"\n{'=' * 80}")
+            print(f"TURN {turn_data['turn']}")
+            print(f"Context Note: {turn_data['note']}")
+            print("=" * 80)
+            print(f"\n👤 User: {turn_data['message']}\n")
+            print("-" * 80)
+            print("🤖 Assistant:\n")
+
+            try:
+                response = await agent.send_message(turn_data['message'])
+                print(response)
+
+            except Exception as e:
+                print(f"❌ Error: {e}")
+                print("\nMake sure you have:")
+                print("1. Installed dependencies: pip install -r requirements.txt")
+                print("2. Configured ANTHROPIC_API_KEY in your .env file")
+                print("3. Installed Claude CLI: npm install -g @anthropic-ai/claude-code")
+                break
+
+            # Small delay between turns
+            await asyncio.sleep(1)
+
+        print("\n\n" + "=" * 80)
+        print("✅ Conversation completed!")
         print("=" * 80)
-        print(f"\n👤 User: {turn_data['message']}\n")
-        print("-" * 80)
-        print("🤖 Assistant:\n")
-
-        try:
-            response = await agent.send_message(turn_data['message'])
-            print(response)
-
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            print("\nMake sure you have:")
-            print("1. Installed dependencies: pip install -r requirements.txt")
-            print("2. Configured ANTHROPIC_API_KEY in your .env file")
-            print("3. Installed Claude CLI: npm install -g @anthropic-ai/claude-code")
-            break
-
-        # Small delay between turns
-        await asyncio.sleep(1)
-
-    print("\n\n" + "=" * 80)
-    print("✅ Conversation completed!")
-    print("=" * 80)
-    print("\nKey observations:")
-    print("✓ Agent maintained context across all 5 turns")
-    print("✓ Remembered family composition (kids aged 6 and 9)")
-    print("✓ Connected beaches, restaurants, and activities coherently")
-    print("✓ Built a comprehensive plan based on accumulated preferences")
-    print("\nThis demonstrates the power of stateful conversations with memory!")
+        print("\nKey observations:")
+        print("✓ Agent maintained context across all 5 turns")
+        print("✓ Remembered family composition (kids aged 6 and 9)")
+        print("✓ Connected beaches, restaurants, and activities coherently")
+        print("✓ Built a comprehensive plan based on accumulated preferences")
+        print("\nThis demonstrates the power of stateful conversations with memory!")
+    finally:
+        # Close pooled HTTP connections held by the tools
+        await shutdown()
 
 
 async def interactive_mode():
@@ -218,37 +243,51 @@ async def interactive_mode():
     print("=" * 80)
     print("Have a conversation with your travel planning agent!")
     print("Type 'quit' or 'exit' to end the conversation.")
-    print("Type 'reset' to start a new conversation.\n")
+    print("Type 'reset' to start a new conversation.")
+    print("Type 'stats' to show tool cache statistics.\n")
     print("=" * 80)
 
     agent = MarbellaConversationalAgent()
+    # Print a reminder when a task is due within a day
+    await startup(reminder_sink=print_sink)
     turn = 0
 
-    while True:
-        turn += 1
-        print(f"\n[Turn {turn}]")
-        user_input = input("👤 You: ").strip()
-
-        if user_input.lower() in ['quit', 'exit']:
-            print("\n👋 Thanks for using the Marbella Travel Planning Agent!")
-            break
-
-        if user_input.lower() == 'reset':
-            await agent.reset_conversation()
-            turn = 0
-            print("🔄 Conversation reset. Starting fresh!\n")
-            continue
-
-        if not user_input:
-            continue
-
-        print("\n🤖 Assistant:")
-        try:
-            response = await agent.send_message(user_input)
-            print(response)
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            break
+    try:
+        while True:
+            turn += 1
+            print(f"\n[Turn {turn}]")
+            user_input = input("👤 You: ").strip()
+
+            if user_input.lower() in ['quit', 'exit']:
+                print("\n👋 Thanks for using the Marbella Travel Planning Agent!")
+                break
+
+            if user_input.lower() == 'reset':
+                await agent.reset_conversation()
+                turn = 0
+                print("🔄 Conversation reset. Starting fresh!\n")
+                continue
+
+            if user_input.lower() == 'stats':
+                cache = agent.session_stats()["read_cache"]
+                print(f"📊 Read cache: {cache['hits']} hits, {cache['misses']} misses "
+                      f"({cache['hit_rate']:.0%} hit rate, {cache['entries']} entries)")
+                turn -= 1
+                continue
+
+            if not user_input:
+                continue
+
+            print("\n🤖 Assistant:")
+            try:
+                response = await agent.send_message(user_input)
+                print(response)
+            except Exception as e:
+                print(f"❌ Error: {e}")
+                break
+    finally:
+        # Close pooled HTTP connections held by the tools
+        await shutdown()
 
 
 if __name__ == "__main__":
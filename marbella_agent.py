@@ -8,7 +8,7 @@ import asyncio
 import os
 from dotenv import load_dotenv
 from claude_agent_sdk import query, ClaudeAgentOptions, AssistantMessage, TextBlock
-from tools import travel_tools_server
+from tools import travel_tools_server, startup, shutdown
 
 # Load environment variables
 load_dotenv()
@@ -49,7 +49,13 @@ async def plan_trip(prompt: str) -> str:
         You now have access to tools for enhanced trip planning:
 
         WEATHER TOOL:
-        - get_weather_forecast: Get weather forecasts for any location
+        - get_weather_forecast: Get weather forecasts for any location (pass start_date/end_date for a trip window)
+        - get_weather_forecasts: Compare several locations in one call (use instead of repeated single lookups)
+        - get_climate_normals: Typical weather by month, offline (use for trips more than ~9 days out instead of searching the web)
+        - geocode: Coordinates and elevation for any Andalusian town or Spanish city, offline (the weather tools also accept location_name alone)
+        - get_drive_times: Driving distance/time between towns, offline (list the stops in order for a day-trip route)
+        - plan_walking_route: Order sights into a walking tour with times, offline (pass dwell_minutes, must_see and a time budget)
+        - nearby_pois: Car parks, restaurants, sights, viewpoints and beaches near a town or sight, offline (check here before searching the web)
         - Defaults to Fahrenheit (can specify Celsius if user prefers)
         - Marbella coordinates: lat=36.51, lon=-4.88
         - Use for day trips: Granada (37.18, -3.60), Málaga (36.72, -4.42), Ronda (36.74, -5.17)
@@ -59,6 +65,7 @@ async def plan_trip(prompt: str) -> str:
         - Add tasks with categories: accommodation, activities, dining, transport
         - Set priorities: low, medium, high
         - Track completion and due dates
+        - Use trip_breakdown for per-category/priority progress instead of listing every task
         - Help users build comprehensive travel checklists""",
 
         # MCP server with weather and task management tools
@@ -67,13 +74,20 @@ async def plan_trip(prompt: str) -> str:
         # Allow all travel planning tools
         allowed_tools=[
             "mcp__travel__get_weather_forecast",
+            "mcp__travel__get_weather_forecasts",
+            "mcp__travel__get_climate_normals",
+            "mcp__travel__geocode",
+            "mcp__travel__get_drive_times",
+            "mcp__travel__plan_walking_route",
+            "mcp__travel__nearby_pois",
             "mcp__travel__create_trip",
             "mcp__travel__add_task",
             "mcp__travel__list_tasks",
             "mcp__travel__complete_task",
             "mcp__travel__update_task",
             "mcp__travel__delete_task",
-            "mcp__travel__list_trips"
+            "mcp__travel__list_trips",
+            "mcp__travel__trip_breakdown"
         ],
 
         # Use default permission mode
@@ -111,6 +125,9 @@ async def main():
     print("-" * 70)
     print("Response:\n")
 
+    # Start background tool services (forecast cache warmer)
+    await startup()
+
     try:
         response = await plan_trip(example_prompt)
         print(response)
@@ -123,6 +140,10 @@ async def main():
         print("2. Configured ANTHROPIC_API_KEY in your .env file")
         print("3. Installed Claude CLI: npm install -g @anthropic-ai/claude-code")
 
+    finally:
+        # Close pooled HTTP connections held by the tools
+        await shutdown()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,275 @@
+"""
+Local met.no Stand-In Server
+Serves recorded Locationforecast compact payloads over HTTP so the weather
+tool can be exercised, load-tested and benchmarked without api.met.no.
+
+Usage:
+    python met_stub.py serve [--port 8765] [--latency 0.05] [--error-rate 0.02]
+    python met_stub.py record NAME LATITUDE LONGITUDE
+
+Point the weather tool at it with:
+    MET_NO_URL=http://127.0.0.1:8765/weatherapi/locationforecast/2.0/compact
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import ssl
+import sys
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from aiohttp import web
+
+# Recorded payloads: one api.met.no compact response per file
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "met_no")
+
+# Path served by api.met.no (and by the stub)
+FORECAST_PATH = "/weatherapi/locationforecast/2.0/compact"
+
+
+def load_fixtures(directory: str = FIXTURE_DIR) -> dict[str, dict]:
+    """Load every *.json fixture in directory, keyed by file name without extension."""
+    fixtures = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".json"):
+            with open(os.path.join(directory, filename), encoding="utf-8") as f:
+                fixtures[filename[:-5]] = json.load(f)
+    return fixtures
+
+
+def rebase_payload(payload: dict, start: datetime) -> dict:
+    """Return a copy of payload whose timeseries starts at `start` (steps kept)."""
+    timeseries = payload["properties"]["timeseries"]
+    if not timeseries:
+        return payload
+
+    first = datetime.fromisoformat(timeseries[0]["time"].replace("Z", "+00:00"))
+    offset = start - first
+    rebased = [
+        {**entry, "time": (datetime.fromisoformat(entry["time"].replace("Z", "+00:00")) + offset)
+            .strftime("%Y-%m-%dT%H:%M:%SZ")}
+        for entry in timeseries
+    ]
+    meta = {**payload["properties"].get("meta", {}), "updated_at": start.strftime("%Y-%m-%dT%H:%M:%SZ")}
+    return {**payload, "properties": {**payload["properties"], "meta": meta, "timeseries": rebased}}
+
+
+class MetNoStub:
+    """
+    aiohttp application that mimics api.met.no's compact endpoint.
+
+    Each request is answered with the fixture closest to the requested
+    coordinates, shifted so its first timestep is the current hour.
+    Responses carry Date, Expires and Last-Modified headers; Last-Modified
+    advances every update_interval seconds (a new "model run"), and a
+    request whose If-Modified-Since is not older gets a 304.
+
+    Args:
+        fixtures: name -> payload (default: load_fixtures())
+        latency: Seconds added to every response
+        jitter: Extra random latency, uniform in [0, jitter] seconds
+        tail_rate: Fraction of responses delayed by tail_latency (slow outliers)
+        tail_latency: Extra seconds added to those responses
+        error_rate: Fraction of requests answered with an injected error
+        error_statuses: Statuses to inject (chosen at random)
+        retry_after: Retry-After value sent with injected errors (None = omit)
+        expires_in: Seconds until the Expires time of each response
+        update_interval: Seconds between simulated forecast updates
+        seed: Random seed for reproducible latency and error injection
+    """
+
+    def __init__(
+        self,
+        fixtures: dict[str, dict] | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        tail_rate: float = 0.0,
+        tail_latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: tuple[int, ...] = (429, 503),
+        retry_after: str | None = "1",
+        expires_in: float = 1800,
+        update_interval: float = 3600,
+        seed: int | None = None
+    ):
+        self.fixtures = load_fixtures() if fixtures is None else fixtures
+        if not self.fixtures:
+            raise ValueError(f"No fixtures found in {FIXTURE_DIR}")
+        self.latency = latency
+        self.jitter = jitter
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.retry_after = retry_after
+        self.expires_in = expires_in
+        self.update_interval = update_interval
+        self.random = random.Random(seed)
+        self.queries: list[dict[str, str]] = []
+        self.status_counts: dict[int, int] = {}
+        # (fixture name, update number) -> encoded body
+        self._bodies: dict[tuple[str, int], bytes] = {}
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def hits(self) -> int:
+        """Number of requests received."""
+        return len(self.queries)
+
+    def _nearest_fixture(self, latitude: float, longitude: float) -> str:
+        def distance(name: str) -> float:
+            fixture_lon, fixture_lat = self.fixtures[name]["geometry"]["coordinates"][:2]
+            return math.hypot(fixture_lat - latitude, (fixture_lon - longitude) * math.cos(math.radians(latitude)))
+        return min(self.fixtures, key=distance)
+
+    def _body(self, name: str, update: int, modified: datetime) -> bytes:
+        """Encoded fixture rebased to this update (built once per update)."""
+        body = self._bodies.get((name, update))
+        if body is None:
+            self._bodies = {key: value for key, value in self._bodies.items() if key[1] == update}
+            start = modified.replace(minute=0, second=0, microsecond=0)
+            body = json.dumps(rebase_payload(self.fixtures[name], start), separators=(",", ":")).encode()
+            self._bodies[(name, update)] = body
+        return body
+
+    def _respond(self, status: int, headers: dict[str, str], body: bytes | None = None) -> web.Response:
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        return web.Response(status=status, body=body, headers=headers)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Serve one forecast request."""
+        self.queries.append(dict(request.query))
+
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if self.tail_rate and self.random.random() < self.tail_rate:
+            delay += self.tail_latency
+        if delay:
+            await asyncio.sleep(delay)
+
+        now = time.time()
+        headers = {"Date": format_datetime(datetime.fromtimestamp(now, timezone.utc), usegmt=True)}
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            if self.retry_after is not None:
+                headers["Retry-After"] = self.retry_after
+            return self._respond(self.random.choice(self.error_statuses), headers)
+
+        try:
+            latitude = float(request.query["lat"])
+            longitude = float(request.query["lon"])
+        except (KeyError, ValueError):
+            return self._respond(400, headers, b"lat and lon are required")
+
+        update = int(now // self.update_interval)
+        modified = datetime.fromtimestamp(update * self.update_interval, timezone.utc)
+        headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+        headers["Expires"] = format_datetime(datetime.fromtimestamp(now + self.expires_in, timezone.utc), usegmt=True)
+
+        since = request.headers.get("If-Modified-Since")
+        if since:
+            try:
+                if parsedate_to_datetime(since) >= modified:
+                    return self._respond(304, headers)
+            except (TypeError, ValueError):
+                pass
+
+        headers["Content-Type"] = "application/json"
+        return self._respond(200, headers, self._body(self._nearest_fixture(latitude, longitude), update, modified))
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(FORECAST_PATH, self.handle)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, ssl_context: ssl.SSLContext | None = None) -> str:
+        """Start serving; return the forecast URL (port 0 picks a free port)."""
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port, ssl_context=ssl_context)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        scheme = "https" if ssl_context else "http"
+        return f"{scheme}://{host}:{bound_port}{FORECAST_PATH}"
+
+    async def stop(self):
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def record(name: str, latitude: float, longitude: float, directory: str = FIXTURE_DIR) -> str:
+    """Fetch a live compact forecast from api.met.no and save it as a fixture."""
+    import aiohttp
+    from tools.weather_tool import HEADERS
+
+    url = "https://api.met.no" + FORECAST_PATH
+    params = {"lat": round(latitude, 4), "lon": round(longitude, 4)}
+    async with aiohttp.ClientSession(headers=HEADERS) as session:
+        async with session.get(url, params=params) as response:
+            response.raise_for_status()
+            payload = await response.json()
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+    return path
+
+
+async def serve(args: argparse.Namespace):
+    stub = MetNoStub(
+        latency=args.latency,
+        jitter=args.jitter,
+        tail_rate=args.tail_rate,
+        tail_latency=args.tail_latency,
+        error_rate=args.error_rate,
+        expires_in=args.expires_in,
+        update_interval=args.update_interval
+    )
+    url = await stub.start(args.host, args.port)
+    print(f"Serving {len(stub.fixtures)} fixture(s) at {url}")
+    print(f"Use: MET_NO_URL={url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stub.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for api.met.no")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Serve fixtures over HTTP")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--latency", type=float, default=0.0, help="seconds added to each response")
+    serve_parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency (seconds)")
+    serve_parser.add_argument("--tail-rate", type=float, default=0.0, help="fraction of slow responses")
+    serve_parser.add_argument("--tail-latency", type=float, default=0.0, help="extra latency of slow responses")
+    serve_parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 429/503 replies")
+    serve_parser.add_argument("--expires-in", type=float, default=1800, help="Expires header lifetime (seconds)")
+    serve_parser.add_argument("--update-interval", type=float, default=3600, help="seconds between forecast updates")
+
+    record_parser = commands.add_parser("record", help="Save a live api.met.no response as a fixture")
+    record_parser.add_argument("name")
+    record_parser.add_argument("latitude", type=float)
+    record_parser.add_argument("longitude", type=float)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+    else:
+        print(f"Saved {asyncio.run(record(args.name, args.latitude, args.longitude))}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Shared fixtures for the tool tests.
+
+Tests run without network access: the task tools get a throwaway SQLite
+file, and weather tests talk to the local met.no stand-in (met_stub.py).
+"""
+
+import contextlib
+
+import pytest
+
+from tools import task_manager_tool, weather_tool
+from tools.circuit_breaker import CircuitBreaker
+from tools.rate_limit import TokenBucket
+
+
+@pytest.fixture
+def trips_db(tmp_path, monkeypatch):
+    """Point the task tools at an empty database and start with an empty read cache."""
+    monkeypatch.setattr(task_manager_tool, "DB_PATH", str(tmp_path / "trips.db"))
+    task_manager_tool.read_cache.clear()
+    yield task_manager_tool.DB_PATH
+    task_manager_tool.read_cache.clear()
+
+
+@pytest.fixture
+def weather_env(monkeypatch):
+    """Empty memory-only forecast cache, fresh breaker and counters, no hedging."""
+    monkeypatch.setattr(weather_tool.forecast_cache, "disk", None)
+    monkeypatch.setattr(weather_tool, "circuit_breaker", CircuitBreaker(failure_threshold=5, reset_timeout=30))
+    monkeypatch.setattr(weather_tool, "rate_limiter", TokenBucket(rate=1000, capacity=1000))
+    monkeypatch.setattr(weather_tool, "secondary_provider", None)
+    for name in weather_tool.request_stats:
+        monkeypatch.setitem(weather_tool.request_stats, name, 0)
+    weather_tool.forecast_cache.clear()
+    yield
+    weather_tool.forecast_cache.clear()
+
+
+@pytest.fixture
+def serve_stub(weather_env, monkeypatch):
+    """Async context manager pointing the weather tools at a running MetNoStub."""
+    @contextlib.asynccontextmanager
+    async def serve(stub):
+        monkeypatch.setattr(weather_tool, "MET_NO_URL", await stub.start())
+        try:
+            yield stub
+        finally:
+            await weather_tool.close_session()
+            await stub.stop()
+
+    return serve
@@ -0,0 +1,115 @@
+"""Tests for the forecast cache warmer (against the local met.no stub)."""
+
+import asyncio
+import time
+
+import pytest
+
+from met_stub import MetNoStub
+from tools import cache_warmer, weather_tool
+from tools.cache_warmer import MIN_REFRESH_INTERVAL, CacheWarmer
+
+LOCATIONS = [("Marbella", 36.51, -4.88), ("Ronda", 36.74, -5.17)]
+
+
+def test_run_once_refreshes_due_locations_and_sleeps_until_the_next(serve_stub):
+    async def scenario():
+        async with serve_stub(MetNoStub(expires_in=900)) as stub:
+            warmer = CacheWarmer(LOCATIONS, lead_time=300)
+            first_delay = await warmer.run_once()
+            hits_after_first = stub.hits
+            second_delay = await warmer.run_once()
+            return warmer, first_delay, second_delay, hits_after_first, stub.hits
+
+    warmer, first_delay, second_delay, hits_after_first, hits = asyncio.run(scenario())
+    assert hits_after_first == hits == 2
+    assert warmer.refreshes == 2 and warmer.failures == 0
+    # Due lead_time before the 900 s expiry; Expires has whole-second resolution
+    assert first_delay == pytest.approx(600, abs=1.5)
+    assert second_delay == pytest.approx(600, abs=1.5)
+    assert len(weather_tool.forecast_cache) == 2
+
+
+def test_refreshes_are_spaced_when_expiry_is_inside_the_lead_time(serve_stub):
+    async def scenario():
+        async with serve_stub(MetNoStub(expires_in=120)) as stub:
+            warmer = CacheWarmer(LOCATIONS[:1], lead_time=300)
+            await warmer.run_once()
+            delay = await warmer.run_once()
+            return delay, stub.hits
+
+    delay, hits = asyncio.run(scenario())
+    # Already inside the lead time, but not re-requested before the entry expires
+    assert hits == 1
+    assert delay == pytest.approx(120, abs=1.5)
+
+
+def test_expired_entry_is_refreshed_with_a_304(serve_stub):
+    async def scenario():
+        async with serve_stub(MetNoStub(expires_in=0)) as stub:
+            warmer = CacheWarmer(LOCATIONS[:1], lead_time=0)
+            await warmer.run_once()
+            delay = await warmer.run_once()
+            hits_while_spaced = stub.hits
+            warmer._not_before.clear()
+            await warmer.run_once()
+            return warmer, delay, hits_while_spaced, dict(stub.status_counts)
+
+    warmer, delay, hits_while_spaced, statuses = asyncio.run(scenario())
+    assert hits_while_spaced == 1
+    assert delay == pytest.approx(MIN_REFRESH_INTERVAL, abs=1)
+    assert statuses == {200: 1, 304: 1}
+    assert warmer.refreshes == 2
+    assert weather_tool.forecast_cache.stats()["revalidated"] == 1
+
+
+def test_failed_refresh_is_counted_and_retried_later(serve_stub):
+    async def scenario():
+        async with serve_stub(MetNoStub(error_rate=1.0, error_statuses=(500,))) as stub:
+            warmer = CacheWarmer(LOCATIONS[:1])
+            delay = await warmer.run_once()
+            return warmer, delay, stub.hits
+
+    warmer, delay, hits = asyncio.run(scenario())
+    assert hits >= 1
+    assert (warmer.refreshes, warmer.failures) == (0, 1)
+    assert delay == pytest.approx(MIN_REFRESH_INTERVAL, abs=1)
+
+
+def test_warming_pauses_while_idle_and_resumes_on_lookups(serve_stub, monkeypatch):
+    monkeypatch.setattr(cache_warmer, "IDLE_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(weather_tool.forecast_cache, "last_lookup", None)
+
+    async def scenario():
+        async with serve_stub(MetNoStub()) as stub:
+            warmer = CacheWarmer(LOCATIONS, idle_timeout=0.05)
+            warmer.start()
+            await asyncio.sleep(0.02)
+            active = warmer.stats()
+            # Nothing is due again for a long while, so the loop is asleep now
+            await warmer.stop()
+            hits_active = stub.hits
+
+            # A fresh warmer whose last lookup is long past
+            weather_tool.forecast_cache.clear()
+            warmer = CacheWarmer(LOCATIONS, idle_timeout=0.05)
+            warmer.start()
+            warmer._started_at = time.monotonic() - 1
+            await asyncio.sleep(0.1)
+            idle = warmer.stats()
+            hits_idle = stub.hits
+
+            weather_tool.forecast_cache.last_lookup = time.monotonic()
+            await asyncio.sleep(0.05)
+            resumed_hits = stub.hits
+            await warmer.stop()
+            return active, hits_active, idle, hits_idle, resumed_hits, warmer.stats()
+
+    active, hits_active, idle, hits_idle, resumed_hits, stopped = asyncio.run(scenario())
+    assert active["running"] and not active["idle"]
+    assert hits_active == 2
+    assert idle["running"] and idle["idle"]
+    assert hits_idle == hits_active
+    assert resumed_hits == hits_active + 2
+    assert not stopped["running"]
+    assert stopped["locations"] == 2 and stopped["refreshes"] == 2
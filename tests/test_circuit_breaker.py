@@ -0,0 +1,64 @@
+"""Tests for the circuit breaker and its use by the weather tool."""
+
+import asyncio
+
+from met_stub import MetNoStub
+from tools import weather_tool
+from tools.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def test_opens_after_threshold_and_probes_once():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    assert breaker.allow_request()  # reset_timeout passed: this caller is the probe
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()
+    assert breaker.is_open()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow_request()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    breaker.reset_timeout = 0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.trips == 2
+
+
+def test_released_probe_lets_next_caller_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.release_probe()
+    assert breaker.allow_request()
+
+
+def test_cancelled_probe_request_does_not_wedge_breaker(serve_stub, monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    monkeypatch.setattr(weather_tool, "circuit_breaker", breaker)
+
+    async def scenario():
+        async with serve_stub(MetNoStub(latency=0.2)):
+            key = weather_tool.forecast_cache.key(36.51, -4.88)
+            probe = weather_tool._start_request(key)
+            assert breaker.state == HALF_OPEN
+            await asyncio.sleep(0.05)
+            probe.cancel()
+            await asyncio.gather(probe, return_exceptions=True)
+
+            # The next request becomes the probe and closes the circuit
+            return await weather_tool.fetch_forecast(36.51, -4.88)
+
+    assert len(asyncio.run(scenario())) > 0
+    assert breaker.state == CLOSED
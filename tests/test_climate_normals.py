@@ -0,0 +1,56 @@
+"""Tests for the offline climate normals index."""
+
+from datetime import date
+
+import pytest
+
+from tools.climate_normals import LAPSE_RATE, ClimateIndex, MonthNormals, month_spans
+
+HEADER = "station,latitude,longitude,elevation_m,month,tmax_c,tmin_c,precip_mm,rain_days,sun_hours\n"
+
+
+def write_stations(path, stations: list[tuple[str, float, float, float, float]]) -> str:
+    """One CSV row per station and month; tmax = base + month, tmin = base."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# test stations\n" + HEADER)
+        for name, latitude, longitude, elevation, base in stations:
+            for month in range(1, 13):
+                f.write(f"{name},{latitude},{longitude},{elevation},{month},{base + month},{base},{month * 10},{month},200\n")
+    return str(path)
+
+
+def test_single_station_values_and_lapse_rate(tmp_path):
+    index = ClimateIndex(write_stations(tmp_path / "normals.csv", [("Hill", 36.75, -5.15, 700, 10.0)]))
+    at_station = index.normals(36.75, -5.15)
+    july = at_station[6]
+
+    assert (july.month, july.name) == (7, "July")
+    assert july.tmax == pytest.approx(17.0)
+    assert july.tmin == pytest.approx(10.0)
+    assert (july.precip, july.rain_days, july.sun_hours) == (70.0, 7.0, 200.0)
+
+    at_sea_level = index.normals(36.75, -5.15, altitude=0)[6]
+    assert at_sea_level.tmax == pytest.approx(17.0 + 700 * LAPSE_RATE)
+
+
+def test_interpolates_between_stations_and_caches_cells(tmp_path):
+    index = ClimateIndex(write_stations(tmp_path / "normals.csv", [
+        ("West", 36.55, -5.05, 0, 10.0),
+        ("East", 36.55, -4.85, 0, 20.0)
+    ]))
+    midway = index.normals(36.55, -4.95)[0]
+    assert 14.5 < midway.tmin < 15.5
+
+    index.normals(36.56, -4.96)
+    assert index.stats() == {"stations": 2, "cells": 1, "lookups": 2}
+
+
+def test_out_of_range_has_no_normals(tmp_path):
+    index = ClimateIndex(write_stations(tmp_path / "normals.csv", [("Only", 36.5, -4.9, 0, 10.0)]), max_distance_km=50)
+    assert index.normals(40.4, -3.7) is None
+
+
+def test_month_spans_and_month_lengths():
+    assert month_spans(date(2026, 12, 28), date(2027, 2, 2)) == [(12, 4), (1, 31), (2, 2)]
+    assert month_spans(date(2026, 7, 10), date(2026, 7, 10)) == [(7, 1)]
+    assert [MonthNormals(m, 0, 0, 0, 0, 0).days for m in (2, 4, 12)] == [28, 30, 31]
@@ -0,0 +1,58 @@
+"""Tests for request coalescing in fetch_forecast (against a slow local met.no stub)."""
+
+import asyncio
+
+import pytest
+
+from met_stub import MetNoStub
+from tools import weather_tool
+from tools.weather_tool import WeatherFetchError, fetch_forecast
+
+CALLERS = 20
+
+
+def test_concurrent_callers_share_one_upstream_request(serve_stub):
+    async def scenario():
+        async with serve_stub(MetNoStub(latency=0.2)) as stub:
+            results = await asyncio.gather(*(fetch_forecast(36.51, -4.88) for _ in range(CALLERS)))
+            return results, stub.hits
+
+    results, hits = asyncio.run(scenario())
+    assert hits == 1
+    assert all(result is results[0] for result in results)
+    assert weather_tool.request_stats["requests"] == 1
+    assert weather_tool.request_stats["coalesced"] == CALLERS - 1
+    assert weather_tool._inflight == {}
+
+
+def test_failed_request_reaches_every_waiter_and_is_forgotten(serve_stub):
+    async def scenario():
+        stub = MetNoStub(latency=0.2, error_rate=1.0, error_statuses=(500,))
+        async with serve_stub(stub):
+            results = await asyncio.gather(
+                *(fetch_forecast(36.51, -4.88) for _ in range(CALLERS)),
+                return_exceptions=True
+            )
+            return results, stub.hits, dict(weather_tool._inflight)
+
+    results, hits, inflight = asyncio.run(scenario())
+    assert hits == 1
+    assert all(isinstance(result, WeatherFetchError) for result in results)
+    assert len({str(result) for result in results}) == 1
+    assert inflight == {}
+
+
+def test_cancelled_caller_does_not_cancel_shared_request(serve_stub):
+    async def scenario():
+        async with serve_stub(MetNoStub(latency=0.2)) as stub:
+            first = asyncio.ensure_future(fetch_forecast(36.51, -4.88))
+            second = asyncio.ensure_future(fetch_forecast(36.51, -4.88))
+            await asyncio.sleep(0.05)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second, stub.hits
+
+    result, hits = asyncio.run(scenario())
+    assert len(result.times) > 0
+    assert hits == 1
@@ -0,0 +1,74 @@
+"""Tests for get_weather_forecast's start_date/end_date window (against the local met.no stub)."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from met_stub import MetNoStub
+from tools import weather_tool
+from tools.weather_tool import MAX_DATE_WINDOW, get_weather_forecast, local_timezone
+
+MARBELLA = {"latitude": 36.51, "longitude": -4.88, "units": "celsius"}
+
+
+def text(result: dict) -> str:
+    return result["content"][0]["text"]
+
+
+def day(offset: int) -> str:
+    return (datetime.now(local_timezone()).date() + timedelta(days=offset)).isoformat()
+
+
+def window_lines(result: dict) -> list[str]:
+    """The per-day lines listed under the window heading."""
+    window = text(result).split("**Forecast for ", 1)[1].split("\n---\n", 1)[0]
+    return [line for line in window.splitlines() if line.startswith("- ")]
+
+
+def forecast(serve_stub, **args) -> tuple[dict, int]:
+    async def scenario():
+        async with serve_stub(MetNoStub()) as stub:
+            return await get_weather_forecast.handler({**MARBELLA, **args}), stub.hits
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("args, message", [
+    ({"start_date": day(3), "end_date": day(1)}, f"end_date ({day(1)}) is before start_date ({day(3)})"),
+    ({"start_date": day(0), "end_date": day(MAX_DATE_WINDOW)}, f"can span at most {MAX_DATE_WINDOW} days"),
+    ({"start_date": "next friday"}, "start_date must be a date in YYYY-MM-DD format. Got: next friday"),
+    ({"end_date": "2026-13-01"}, "end_date must be a date in YYYY-MM-DD format")
+])
+def test_invalid_window_is_rejected_before_fetching(serve_stub, args, message):
+    result, hits = forecast(serve_stub, **args)
+    assert result.get("is_error")
+    assert message in text(result)
+    assert hits == 0
+
+
+def test_window_lists_every_day_in_range(serve_stub):
+    result, _ = forecast(serve_stub, start_date=day(-2), end_date=day(MAX_DATE_WINDOW - 3))
+    assert not result.get("is_error")
+    lines = window_lines(result)
+    assert len(lines) == MAX_DATE_WINDOW
+    assert [line.split(" ", 2)[1] for line in lines] == [day(offset) for offset in range(-2, MAX_DATE_WINDOW - 2)]
+    assert lines[0].endswith("in the past, no forecast") and lines[1].endswith("in the past, no forecast")
+    assert "in the past" not in lines[2] and "beyond the forecast horizon" not in lines[2]
+
+
+def test_days_beyond_the_horizon_fall_back_to_climate_normals(serve_stub):
+    target = datetime.now(local_timezone()).date() + timedelta(days=20)
+    normals = weather_tool.climate_index.normals(36.51, -4.88)
+    assert normals is not None
+
+    result, _ = forecast(serve_stub, start_date=target.isoformat())
+    [line] = window_lines(result)
+    assert "beyond the forecast horizon (forecast ends " in line
+    assert f"typical for {normals[target.month - 1].name}: " in line
+
+
+def test_end_date_alone_starts_today(serve_stub):
+    result, _ = forecast(serve_stub, end_date=day(2))
+    assert f"**Forecast for {day(0)} to {day(2)}:**" in text(result)
+    assert len(window_lines(result)) == 3
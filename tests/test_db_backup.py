@@ -0,0 +1,143 @@
+"""Tests for online backups of the trips database."""
+
+import asyncio
+import os
+
+import aiosqlite
+import pytest
+
+import tools
+from tools import db_backup
+from tools.db_backup import BackupJob, create_backup, list_backups, prune_backups, verify_backup
+
+
+async def seed(db_path: str, rows: int = 200):
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+        await db.executemany("INSERT INTO notes (body) VALUES (?)", [("x" * 500,)] * rows)
+        await db.commit()
+
+
+def test_backup_while_another_connection_writes(tmp_path):
+    db_path, backup_dir = str(tmp_path / "trips.db"), str(tmp_path / "backups")
+
+    async def scenario():
+        await seed(db_path)
+        stop = asyncio.Event()
+
+        async def writer():
+            async with aiosqlite.connect(db_path) as db:
+                written = 0
+                while not stop.is_set():
+                    await db.execute("INSERT INTO notes (body) VALUES ('during')")
+                    await db.commit()
+                    written += 1
+                    await asyncio.sleep(0)
+                return written
+
+        writing = asyncio.create_task(writer())
+        path = await create_backup(db_path, backup_dir, pages_per_step=1, step_sleep=0.001)
+        stop.set()
+        written = await writing
+        return path, written, await verify_backup(path)
+
+    path, written, result = asyncio.run(scenario())
+    assert written > 0
+    assert result["ok"] and result["integrity"] == "ok"
+    assert 200 <= result["row_counts"]["notes"] <= 200 + written
+    assert list_backups(backup_dir) == [path]
+    assert not [name for name in os.listdir(backup_dir) if name.endswith(".partial")]
+
+
+def test_failed_copy_leaves_no_partial_file(tmp_path):
+    db_path, backup_dir = tmp_path / "trips.db", tmp_path / "backups"
+    db_path.write_bytes(b"this is not a database" * 100)
+
+    with pytest.raises(Exception):
+        asyncio.run(create_backup(str(db_path), str(backup_dir)))
+    assert os.listdir(backup_dir) == []
+
+
+def test_verify_reports_row_counts_and_corruption(tmp_path):
+    db_path, backup_dir = str(tmp_path / "trips.db"), str(tmp_path / "backups")
+    asyncio.run(seed(db_path, rows=50))
+    path = asyncio.run(create_backup(db_path, backup_dir))
+    assert asyncio.run(verify_backup(path)) == {"ok": True, "integrity": "ok", "row_counts": {"notes": 50}}
+
+    # Overwrite some of the table's pages; the header stays readable
+    with open(path, "r+b") as f:
+        f.seek(4096 * 3)
+        f.write(b"\xff" * 4096 * 2)
+    result = asyncio.run(verify_backup(path))
+    assert not result["ok"]
+    assert "malformed" in result["integrity"]
+
+
+def test_prune_keeps_the_newest(tmp_path):
+    names = [f"trips_database-2026010{day}-120000-000000.db" for day in range(1, 6)]
+    for name in names + ["notes.txt"]:
+        (tmp_path / name).write_text("")
+
+    removed = prune_backups(2, str(tmp_path))
+    assert sorted(os.path.basename(path) for path in removed) == names[:3]
+    assert [os.path.basename(path) for path in list_backups(str(tmp_path))] == names[:2:-1]
+    assert (tmp_path / "notes.txt").exists()
+    assert prune_backups(0, str(tmp_path)) and list_backups(str(tmp_path)) == []
+
+
+def test_job_deletes_snapshots_that_fail_verification(tmp_path, monkeypatch):
+    db_path, backup_dir = str(tmp_path / "trips.db"), str(tmp_path / "backups")
+    asyncio.run(seed(db_path, rows=5))
+    create = db_backup.create_backup
+
+    async def torn_backup(*args):
+        path = await create(*args)
+        with open(path, "r+b") as f:
+            f.seek(4096)
+            f.write(b"\xff" * 4096)
+        return path
+
+    monkeypatch.setattr(db_backup, "create_backup", torn_backup)
+    job = BackupJob(db_path=db_path, backup_dir=backup_dir)
+    with pytest.raises(RuntimeError, match="verification failed: .*malformed"):
+        asyncio.run(job.run_once())
+    assert list_backups(backup_dir) == []
+    assert job.last_backup is None
+
+
+def test_job_runs_on_interval_and_stops(tmp_path):
+    db_path, backup_dir = str(tmp_path / "trips.db"), str(tmp_path / "backups")
+
+    async def scenario():
+        assert await BackupJob(db_path=db_path, backup_dir=backup_dir).run_once() is None  # no database yet
+        await seed(db_path, rows=5)
+        job = BackupJob(interval=0.02, retention=2, db_path=db_path, backup_dir=backup_dir)
+        task = job.start()
+        assert job.start() is task
+        await asyncio.sleep(0.3)
+        await job.stop()
+        return job, task
+
+    job, task = asyncio.run(scenario())
+    assert task.done() and job._task is None
+    assert job.last_error is None
+    assert list_backups(backup_dir)[0] == job.last_backup
+    assert len(list_backups(backup_dir)) == 2
+
+
+def test_startup_runs_the_backup_job(tmp_path, monkeypatch, weather_env):
+    db_path, backup_dir = str(tmp_path / "trips.db"), str(tmp_path / "backups")
+    monkeypatch.setattr(tools, "database_backups", BackupJob(db_path=db_path, backup_dir=backup_dir))
+
+    async def scenario():
+        await seed(db_path, rows=5)
+        await tools.startup(warm_cache=False, backup_interval=0.02, backup_retention=3)
+        await asyncio.sleep(0.2)
+        running = not tools.database_backups._task.done()
+        await tools.shutdown()
+        return running
+
+    assert asyncio.run(scenario())
+    assert tools.database_backups._task is None
+    assert (tools.database_backups.interval, tools.database_backups.retention) == (0.02, 3)
+    assert len(list_backups(backup_dir)) == 3
@@ -0,0 +1,138 @@
+"""Tests for the offline road network and get_drive_times' argument handling."""
+
+import asyncio
+import itertools
+import math
+
+import pytest
+
+from tools.drive_time_tool import get_drive_times
+from tools.drive_times import (
+    AT_PLACE_KM,
+    DETOUR_FACTOR,
+    LOCAL_SPEED_KMH,
+    RoadNetwork,
+    estimate_drive,
+    load_links,
+    road_network
+)
+from tools.gazetteer import Place
+from tools.weather_cache import haversine_km
+
+
+def place(name: str, longitude: float, latitude: float = 0.0) -> Place:
+    return Place(name, (), "Test", latitude, longitude, 0, 1000, "town")
+
+
+PLACES = [place("A", 0.0), place("B", 0.5), place("C", 1.0), place("D", 3.0), place("E", 3.2)]
+BY_NAME = {p.name: p for p in PLACES}
+
+
+@pytest.fixture
+def network(tmp_path) -> RoadNetwork:
+    path = tmp_path / "links.csv"
+    # A-C direct is shorter but slower than going through B; D-E is not connected to the rest
+    path.write_text("# test links\nfrom,to,km,minutes\nA,B,60,40\nB,C,60,40\nA,C,100,100\nD,E,25,20\n",
+                    encoding="utf-8")
+    return RoadNetwork(str(path), places=PLACES, cache_size=2)
+
+
+def test_matrix_uses_fastest_path_both_ways(network):
+    a, b, c = BY_NAME["A"], BY_NAME["B"], BY_NAME["C"]
+    assert network.between_places(a, c) == network.between_places(c, a)
+    drive = network.between_places(a, c)
+    assert (drive.km, drive.minutes, drive.estimated) == (120, 80, False)
+    assert network.between_places(a, b).minutes == 40
+    assert network.between_places(a, a).minutes == 0
+
+
+def test_unreachable_and_unlinked_places(network):
+    assert network.between_places(BY_NAME["A"], BY_NAME["D"]) is None
+    outside = place("F", 10.0)
+    assert not network.has_place(outside)
+    assert network.between_places(BY_NAME["A"], outside) is None
+
+
+def test_unknown_link_names_are_rejected(tmp_path):
+    path = tmp_path / "links.csv"
+    path.write_text("from,to,km,minutes\nA,Nowhere,1,1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="unknown places: Nowhere"):
+        RoadNetwork(str(path), places=PLACES)
+
+
+def test_points_snap_to_nearest_place(network):
+    # At A and 5 km past C: matrix drive plus an estimated access leg at the C end
+    drive = network.between_points(0.0, 0.0, 0.0, 1.045)
+    leg = estimate_drive(haversine_km(0, 1.0, 0, 1.045))
+    assert drive.estimated
+    assert drive.km == pytest.approx(120 + leg.km)
+    assert drive.minutes == pytest.approx(80 + leg.minutes)
+
+    # Within AT_PLACE_KM of both ends counts as the places themselves
+    near = AT_PLACE_KM / 2 / haversine_km(0, 0, 0, 1)
+    assert network.between_points(0.0, near, 0.0, 1.0 - near) == network.between_places(BY_NAME["A"], BY_NAME["C"])
+
+
+def test_points_fall_back_to_straight_line(network):
+    # Far from every place
+    far = network.between_points(5.0, 0.0, 5.0, 1.0)
+    assert far == estimate_drive(haversine_km(5, 0, 5, 1))
+    # Both points snap to A
+    close = network.between_points(0.0, 0.01, 0.0, 0.05)
+    straight = haversine_km(0, 0.01, 0, 0.05)
+    assert close.estimated
+    assert close.km == pytest.approx(straight * DETOUR_FACTOR)
+    assert close.minutes == pytest.approx(straight * DETOUR_FACTOR / LOCAL_SPEED_KMH * 60)
+    # No route between the snapped places
+    assert network.between_points(0.0, 0.0, 0.0, 3.0).estimated
+
+
+def test_point_cache_hits_and_evicts_least_recent(network):
+    first = network.between_points(0.0, 0.0, 0.0, 1.0)
+    assert network.between_points(0.00001, 0.0, 0.0, 1.0) is first  # same key after rounding
+    network.between_points(0.0, 0.0, 0.0, 0.5)
+    network.between_points(0.0, 0.0, 0.0, 1.0)  # refresh the first pair
+    network.between_points(0.0, 0.5, 0.0, 1.0)  # evicts (A, B)
+
+    assert network.stats()["cached_pairs"] == 2
+    assert network.between_points(0.0, 0.0, 0.0, 1.0) is first
+    stats = network.stats()
+    assert (stats["hits"], stats["misses"]) == (3, 3)
+    network.between_points(0.0, 0.0, 0.0, 0.5)
+    assert network.stats()["misses"] == 4
+
+
+def test_bundled_matrix_matches_floyd_warshall():
+    links = load_links()
+    names = sorted({name for link in links for name in link[:2]})
+    index = {name: i for i, name in enumerate(names)}
+    minutes = [[0.0 if i == j else math.inf for j in range(len(names))] for i in range(len(names))]
+    for origin, destination, _, link_minutes in links:
+        a, b = index[origin], index[destination]
+        minutes[a][b] = minutes[b][a] = min(minutes[a][b], link_minutes)
+    for k, i, j in itertools.product(range(len(names)), repeat=3):
+        minutes[i][j] = min(minutes[i][j], minutes[i][k] + minutes[k][j])
+
+    nodes = {node.name: node for node in road_network.nodes}
+    for origin, destination in itertools.product(names, repeat=2):
+        drive = road_network.between_places(nodes[origin], nodes[destination])
+        expected = minutes[index[origin]][index[destination]]
+        if math.isinf(expected):
+            assert drive is None
+        else:
+            assert drive.minutes == pytest.approx(expected), (origin, destination)
+
+
+def test_tool_coerces_string_coordinates_and_rejects_non_numbers():
+    result = asyncio.run(get_drive_times.handler({"locations": [
+        "Marbella", {"name": "Beach", "latitude": "36.5", "longitude": "-4.95"}
+    ]}))
+    assert not result.get("is_error")
+    assert "Marbella" in result["content"][0]["text"] and "Beach" in result["content"][0]["text"]
+
+    for latitude in ("north", [36.5]):
+        result = asyncio.run(get_drive_times.handler({"locations": [
+            "Marbella", {"name": "Beach", "latitude": latitude, "longitude": -4.95}
+        ]}))
+        assert result.get("is_error")
+        assert "Invalid latitude/longitude for Beach (expected numbers)" in result["content"][0]["text"]
@@ -0,0 +1,45 @@
+"""Tests for forecast lifetimes taken from met.no's Expires header (against the local met.no stub)."""
+
+import asyncio
+
+import pytest
+
+from met_stub import MetNoStub
+from tools import weather_tool
+from tools.weather_cache import DEFAULT_TTL, ttl_from_headers
+from tools.weather_tool import fetch_forecast
+
+
+def test_ttl_is_measured_from_the_date_header():
+    headers = {"Date": "Wed, 01 Jul 2026 12:00:00 GMT", "Expires": "Wed, 01 Jul 2026 12:25:30 GMT"}
+    assert ttl_from_headers(headers) == 25 * 60 + 30
+    assert ttl_from_headers({**headers, "Expires": "Wed, 01 Jul 2026 11:00:00 GMT"}) == 0
+    assert ttl_from_headers({}) == DEFAULT_TTL
+    assert ttl_from_headers({"Expires": "soon"}) == DEFAULT_TTL
+    assert ttl_from_headers({"Expires": "0"}, default=60) == 60
+
+
+def test_cached_forecast_lives_until_expires(serve_stub):
+    async def scenario():
+        async with serve_stub(MetNoStub(expires_in=600)) as stub:
+            first = await fetch_forecast(36.51, -4.88)
+            second = await fetch_forecast(36.51, -4.88)
+            key = weather_tool.forecast_cache.key(36.51, -4.88)
+            return first, second, weather_tool.forecast_cache.expires_in(key), stub.hits
+
+    first, second, expires_in, hits = asyncio.run(scenario())
+    assert second is first
+    assert hits == 1
+    # Expires and Date have whole-second resolution
+    assert expires_in == pytest.approx(600, abs=1.5)
+
+
+def test_expired_forecast_is_requested_again(serve_stub):
+    async def scenario():
+        async with serve_stub(MetNoStub(expires_in=0)) as stub:
+            await fetch_forecast(36.51, -4.88)
+            await fetch_forecast(36.51, -4.88)
+            return stub.hits
+
+    assert asyncio.run(scenario()) == 2
+    assert weather_tool.forecast_cache.stats()["expired"] == 1
@@ -0,0 +1,101 @@
+"""Tests for met.no payload parsing and the column-oriented ForecastSeries."""
+
+import json
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+from met_stub import load_fixtures, rebase_payload
+from tools import weather_tool
+from tools.forecast_series import ForecastSeries
+from tools.weather_tool import parse_forecast
+
+START = datetime(2026, 7, 1, tzinfo=timezone.utc)
+
+
+def payload_body() -> bytes:
+    return json.dumps(rebase_payload(load_fixtures()["marbella"], START)).encode()
+
+
+def test_parse_keeps_every_timestep_with_either_decoder(monkeypatch):
+    body = payload_body()
+    timeseries = json.loads(body)["properties"]["timeseries"]
+
+    fast = parse_forecast(body)
+    monkeypatch.setattr(weather_tool, "orjson", None)
+    plain = parse_forecast(body)
+
+    assert len(fast) == len(plain) == len(timeseries)
+    assert fast.to_dict() == plain.to_dict()
+    assert fast.times[0] == START.timestamp()
+
+
+def test_parse_stops_at_horizon():
+    series = parse_forecast(payload_body(), horizon_hours=24)
+    assert series.times[-1] - series.times[0] <= 24 * 3600
+    assert series.times[-1] - series.times[0] >= 23 * 3600
+
+
+def test_tool_horizon_keeps_full_met_no_range():
+    body = payload_body()
+    assert len(parse_forecast(body, weather_tool.FORECAST_HORIZON_HOURS)) == len(parse_forecast(body))
+
+
+def synthetic_timeseries(hours: int) -> list[dict]:
+    """Hourly entries from START; temperature = hour index, 0.5 mm rain on odd hours."""
+    entries = []
+    for hour in range(hours):
+        when = START.timestamp() + hour * 3600
+        entries.append({
+            "time": datetime.fromtimestamp(when, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "data": {
+                "instant": {"details": {"air_temperature": float(hour), "wind_speed": 3.0}},
+                "next_1_hours": {
+                    "summary": {"symbol_code": "rain" if hour % 2 else "clearsky_day"},
+                    "details": {"precipitation_amount": 0.5 if hour % 2 else 0.0}
+                }
+            }
+        })
+    return entries
+
+
+def test_daily_summaries_split_on_local_midnight():
+    madrid = ZoneInfo("Europe/Madrid")  # UTC+2 in July: days start at 22:00 UTC
+    days = ForecastSeries.from_timeseries(synthetic_timeseries(48)).daily_summaries(madrid)
+
+    assert [day.date.isoformat() for day in days] == ["2026-07-01", "2026-07-02", "2026-07-03"]
+    assert [day.samples for day in days] == [22, 24, 2]
+    assert (days[0].temp_min, days[0].temp_max) == (0.0, 21.0)
+    assert (days[1].temp_min, days[1].temp_max, days[1].temp_mean) == (22.0, 45.0, 33.5)
+    assert days[1].precipitation == 6.0
+    assert days[1].symbol in ("rain", "clearsky")
+
+
+def test_daily_summaries_window_and_day_limit():
+    series = ForecastSeries.from_timeseries(synthetic_timeseries(96))
+    window = series.daily_summaries(timezone.utc, date(2026, 7, 2), date(2026, 7, 10))
+    assert [day.date for day in window] == [date(2026, 7, 2), date(2026, 7, 3), date(2026, 7, 4)]
+    assert [day.date for day in series.daily_summaries(timezone.utc, days=2)] == [date(2026, 7, 1), date(2026, 7, 2)]
+    assert series.last_date(timezone.utc) == date(2026, 7, 4)
+
+
+def test_gaps_are_skipped_and_round_trip_through_dict():
+    entries = synthetic_timeseries(24)
+    del entries[5]["data"]["instant"]["details"]["air_temperature"]
+    series = ForecastSeries.from_timeseries(entries)
+    day = series.daily_summaries(timezone.utc)[0]
+
+    assert series.has_gaps
+    assert (day.temp_min, day.temp_max) == (0.0, 23.0)
+    assert day.temp_mean == (sum(range(24)) - 5) / 23
+    assert ForecastSeries.from_dict(series.to_dict()).daily_summaries(timezone.utc) == [day]
+
+
+def test_daily_symbol_ignores_day_and_night_variants():
+    # 10 clear night hours outvote 8 + 6 hours of "fair" if each variant is counted separately
+    entries = synthetic_timeseries(24)
+    for hour, entry in enumerate(entries):
+        code = "clearsky_night" if hour < 10 else "fair_day" if hour < 18 else "fair_night"
+        entry["data"]["next_1_hours"]["summary"]["symbol_code"] = code
+
+    day = ForecastSeries.from_timeseries(entries).daily_summaries(timezone.utc)[0]
+    assert day.symbol == "fair"
@@ -0,0 +1,127 @@
+"""Tests for the offline gazetteer and the weather tools' location lookup."""
+
+import random
+
+import pytest
+
+from tools.gazetteer import EXACT, FUZZY, PREFIX, WORD, Gazetteer, NameTrie, normalize_name
+from tools.weather_tool import resolve_location
+
+HEADER = "name,alt_names,province,latitude,longitude,elevation_m,population,kind\n"
+
+PLACES = [
+    "Marbella,,Málaga,36.5101,-4.8825,27,147000,town",
+    "Puerto Banús,Puerto Banus|Banús,Málaga,36.4850,-4.9530,5,0,area",
+    "Mijas,,Málaga,36.5957,-4.6373,428,85000,town",
+    "La Cala de Mijas,La Cala,Málaga,36.5060,-4.6800,10,0,area",
+    "San Pedro,,Málaga,36.4870,-4.9910,20,40000,town",
+    "San Pedro,,Almería,36.8400,-2.0700,10,200,village",
+]
+
+
+@pytest.fixture
+def places(tmp_path) -> Gazetteer:
+    path = tmp_path / "places.csv"
+    path.write_text("# test places\n" + HEADER + "\n".join(PLACES) + "\n", encoding="utf-8")
+    return Gazetteer(str(path))
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance with adjacent transpositions, the slow way."""
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+def test_normalize_name_folds_case_accents_and_punctuation():
+    assert normalize_name("  Puerto  BANÚS ") == "puerto banus"
+    assert normalize_name("Córdoba") == normalize_name("cordoba")
+
+
+def test_trie_exact_and_prefix():
+    trie = NameTrie()
+    for index, key in enumerate(["ronda", "roquetas", "ron"]):
+        trie.insert(key, (index, True))
+    trie.insert("ronda", (3, False))
+
+    assert trie.keys == 3
+    assert trie.exact("ronda") == [(0, True), (3, False)]
+    assert trie.exact("rond") == []
+    assert sorted(trie.prefix("ro")) == [(0, True), (1, True), (2, True), (3, False)]
+    assert sorted(trie.prefix("ron")) == [(0, True), (2, True), (3, False)]
+    assert trie.prefix("x") == []
+
+
+def test_trie_fuzzy_matches_brute_force():
+    rng = random.Random(7)
+    keys = sorted({"".join(rng.choice("abcd") for _ in range(rng.randint(1, 7))) for _ in range(300)})
+    trie = NameTrie()
+    for index, key in enumerate(keys):
+        trie.insert(key, (index, True))
+
+    for _ in range(100):
+        query = "".join(rng.choice("abcd") for _ in range(rng.randint(1, 7)))
+        for max_distance in (1, 2):
+            found = sorted((distance, index) for distance, (index, _) in trie.fuzzy(query, max_distance))
+            expected = sorted((edit_distance(query, key), index) for index, key in enumerate(keys)
+                              if edit_distance(query, key) <= max_distance)
+            assert found == expected, (query, max_distance)
+
+
+def test_search_ranks_exact_word_prefix_and_fuzzy(places):
+    assert [(m.place.name, m.match) for m in places.search("marbella")] == [("Marbella", EXACT)]
+    assert [(m.place.name, m.match) for m in places.search("Banus")] == [("Puerto Banús", EXACT)]
+    assert [(m.place.name, m.match) for m in places.search("Mijas")] == [("Mijas", EXACT), ("La Cala de Mijas", WORD)]
+    assert [(m.place.name, m.match) for m in places.search("Marb")] == [("Marbella", PREFIX)]
+
+    typo = places.search("Marbela")
+    assert [(m.place.name, m.match, m.distance) for m in typo] == [("Marbella", FUZZY, 1)]
+    # An adjacent swap is one edit
+    swapped = places.resolve("Mabrella")
+    assert (swapped.place.name, swapped.match, swapped.distance) == ("Marbella", FUZZY, 1)
+    assert places.resolve("Xyz") is None
+
+
+def test_search_prefers_population_and_narrows_by_province(places):
+    assert places.resolve("San Pedro").place.province == "Málaga"
+    assert places.resolve("San Pedro, Almeria").place.province == "Almería"
+    # An unknown province leaves the results as they were
+    assert places.resolve("San Pedro, Nowhere").place.province == "Málaga"
+    assert places.stats()["places"] == len(PLACES)
+
+
+def test_resolve_location_accepts_exact_and_word_matches():
+    assert resolve_location("Marbella").place.name == "Marbella"
+    assert resolve_location("Banús").place.name == "Puerto Banús"
+    assert resolve_location("ronda, malaga").place.name == "Ronda"
+    assert resolve_location("Nevada").place.name == "Sierra Nevada"
+
+
+def test_resolve_location_rejects_word_matches_shared_by_several_places():
+    with pytest.raises(ValueError) as shared:
+        resolve_location("Frontera")
+    assert "'Frontera' is part of several place names" in str(shared.value)
+    for town in ("Jerez", "Arcos", "Conil", "Vejer"):
+        assert f"{town} de la Frontera, Cádiz" in str(shared.value)
+
+    with pytest.raises(ValueError) as prefix:
+        resolve_location("Sierra")
+    assert "Zahara de la Sierra, Cádiz; Sierra Nevada, Granada" in str(prefix.value)
+
+
+def test_resolve_location_lists_candidates_for_near_matches():
+    with pytest.raises(ValueError) as typo:
+        resolve_location("Marbela")
+    assert "No place is named exactly 'Marbela'" in str(typo.value)
+    assert "Marbella, Málaga" in str(typo.value)
+
+    with pytest.raises(ValueError) as prefix:
+        resolve_location("Marb")
+    assert "Did you mean: Marbella, Málaga" in str(prefix.value)
+
+    with pytest.raises(ValueError, match="Unknown location 'Xyzzy'"):
+        resolve_location("Xyzzy")
@@ -0,0 +1,64 @@
+"""Tests for hedged requests to a secondary forecast provider."""
+
+import asyncio
+import contextlib
+
+import pytest
+
+from met_stub import MetNoStub
+from tools import weather_tool
+from tools.weather_tool import ForecastProvider, _hedged_get
+
+
+@contextlib.asynccontextmanager
+async def providers(monkeypatch, primary_stub: MetNoStub, max_concurrent: int = weather_tool.MAX_CONCURRENT_REQUESTS):
+    """Primary and secondary providers backed by two stubs (session handling as in serve_stub)."""
+    secondary_stub = MetNoStub()
+    primary_url, secondary_url = await primary_stub.start(), await secondary_stub.start()
+    monkeypatch.setattr(weather_tool, "primary_provider", ForecastProvider("primary", primary_url, max_concurrent=max_concurrent))
+    monkeypatch.setattr(weather_tool, "secondary_provider", ForecastProvider("secondary", secondary_url))
+    try:
+        yield secondary_stub
+    finally:
+        await weather_tool.close_session()
+        await primary_stub.stop()
+        await secondary_stub.stop()
+
+
+def test_hedge_delay_is_p95_of_samples():
+    provider = ForecastProvider("p", "http://unused")
+    assert provider.hedge_delay() == weather_tool.HEDGE_DELAY_DEFAULT
+
+    provider.latencies.extend(i / 100 for i in range(1, 21))  # 0.01 .. 0.20
+    assert provider.hedge_delay() == pytest.approx(0.19)
+
+
+def test_local_queueing_does_not_trigger_hedges(weather_env, monkeypatch):
+    monkeypatch.setattr(weather_tool, "HEDGE_DELAY_DEFAULT", 0.15)
+    params = {"lat": 36.51, "lon": -4.88}
+
+    async def scenario():
+        async with providers(monkeypatch, MetNoStub(latency=0.1), max_concurrent=1) as secondary_stub:
+            # Three requests through one slot: the last waits ~0.2 s locally, but each is answered
+            # 0.1 s after it is sent, inside the 0.15 s hedge delay
+            responses = await asyncio.gather(*(_hedged_get(params, {}) for _ in range(3)))
+            return responses, secondary_stub.hits
+
+    responses, secondary_hits = asyncio.run(scenario())
+    assert [response.status for response in responses] == [200, 200, 200]
+    assert weather_tool.request_stats["hedged"] == 0
+    assert secondary_hits == 0
+
+
+def test_slow_primary_is_hedged(weather_env, monkeypatch):
+    monkeypatch.setattr(weather_tool, "HEDGE_DELAY_DEFAULT", 0.05)
+    params = {"lat": 36.51, "lon": -4.88}
+
+    async def scenario():
+        async with providers(monkeypatch, MetNoStub(latency=1.0)):
+            return await _hedged_get(params, {})
+
+    response = asyncio.run(scenario())
+    assert response.status == 200
+    assert response.provider.name == "secondary"
+    assert weather_tool.request_stats["hedged"] == weather_tool.request_stats["hedge_wins"] == 1
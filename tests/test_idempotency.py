@@ -0,0 +1,133 @@
+"""Tests for idempotency keys on the task write tools."""
+
+import asyncio
+import json
+
+import aiosqlite
+
+from tools import task_manager_tool
+from tools.task_manager_tool import add_task, create_trip, run_idempotent
+
+
+def text(result: dict) -> str:
+    return result["content"][0]["text"]
+
+
+async def count_tasks(db_path: str) -> int:
+    async with aiosqlite.connect(db_path) as db:
+        async with db.execute("SELECT COUNT(*) FROM tasks") as cursor:
+            return (await cursor.fetchone())[0]
+
+
+def test_repeated_key_returns_first_result_and_writes_once(trips_db):
+    async def scenario():
+        trip = await create_trip.handler({"trip_name": "Idem"})
+        assert not trip.get("is_error")
+        args = {"trip_id": "idem", "description": "Book hotel", "idempotency_key": "k1"}
+        first = await add_task.handler(args)
+        second = await add_task.handler(dict(args))
+        return first, second, await count_tasks(trips_db)
+
+    first, second, tasks = asyncio.run(scenario())
+    assert first == second
+    assert tasks == 1
+
+
+def test_key_reused_with_different_args_is_an_error(trips_db):
+    async def scenario():
+        await create_trip.handler({"trip_name": "Idem"})
+        await add_task.handler({"trip_id": "idem", "description": "Book hotel", "idempotency_key": "k1"})
+        reused = await add_task.handler({"trip_id": "idem", "description": "Book car", "idempotency_key": "k1"})
+        return reused, await count_tasks(trips_db)
+
+    reused, tasks = asyncio.run(scenario())
+    assert reused.get("is_error")
+    assert "different add_task call" in text(reused)
+    assert tasks == 1
+
+
+def test_key_survives_crash_after_write_commits(trips_db, monkeypatch):
+    original = task_manager_tool._add_task
+
+    async def crash_after_commit(args):
+        await original(args)
+        raise RuntimeError("process died")
+
+    async def scenario():
+        await create_trip.handler({"trip_name": "Idem"})
+        args = {"trip_id": "idem", "description": "Book hotel", "idempotency_key": "k1"}
+        monkeypatch.setattr(task_manager_tool, "_add_task", crash_after_commit)
+        try:
+            await add_task.handler(args)
+        except RuntimeError:
+            pass
+        monkeypatch.setattr(task_manager_tool, "_add_task", original)
+        retry = await add_task.handler(args)
+        return retry, await count_tasks(trips_db)
+
+    retry, tasks = asyncio.run(scenario())
+    assert "Added task #1" in text(retry)
+    assert tasks == 1
+
+
+def test_waiters_keep_lock_after_failed_first_call(trips_db):
+    running = 0
+    most_running = 0
+    calls = 0
+
+    async def handler(args):
+        nonlocal running, most_running, calls
+        calls += 1
+        failed = calls == 1
+        running += 1
+        most_running = max(most_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if failed:
+            return {"content": [{"type": "text", "text": "failed"}], "is_error": True}
+        return {"content": [{"type": "text", "text": "ok"}]}
+
+    async def scenario():
+        def call():
+            return run_idempotent("fake", {"idempotency_key": "k"}, handler)
+
+        first = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        second = asyncio.create_task(call())
+        third = []
+        # Arrives after the first call released the lock but before the second has taken it
+        first.add_done_callback(lambda _: third.append(asyncio.create_task(call())))
+        results = await asyncio.gather(first, second)
+        return results + [await third[0]]
+
+    first, second, third = asyncio.run(scenario())
+    assert first.get("is_error")
+    assert text(second) == text(third) == "ok"
+    assert calls == 2
+    assert most_running == 1
+    assert task_manager_tool._idempotency_locks == {}
+
+
+def test_key_stored_by_another_process_rolls_back_the_write(trips_db, monkeypatch):
+    original = task_manager_tool._add_task
+    other = {"content": [{"type": "text", "text": "✓ Added task #7 (other process)"}]}
+
+    async def other_process_commits_first(args):
+        # Same key, same arguments, committed after this call's lookup found nothing
+        async with aiosqlite.connect(trips_db) as db:
+            await db.execute(
+                "INSERT INTO idempotency_keys (tool_name, idempotency_key, args_hash, result) VALUES (?, ?, ?, ?)",
+                ("add_task", "k1", task_manager_tool.args_fingerprint(args), json.dumps(other))
+            )
+            await db.commit()
+        return await original(args)
+
+    async def scenario():
+        await create_trip.handler({"trip_name": "Idem"})
+        monkeypatch.setattr(task_manager_tool, "_add_task", other_process_commits_first)
+        result = await add_task.handler({"trip_id": "idem", "description": "Book hotel", "idempotency_key": "k1"})
+        return result, await count_tasks(trips_db)
+
+    result, tasks = asyncio.run(scenario())
+    assert result == other
+    assert tasks == 0
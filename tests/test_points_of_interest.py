@@ -0,0 +1,97 @@
+"""Tests for the POI KD-tree and index, and nearby_pois' argument handling."""
+
+import asyncio
+import math
+import random
+
+import pytest
+
+from tools.points_of_interest import KDTree, km_to_chord, poi_index, to_unit_vector
+from tools.poi_tool import nearby_pois
+from tools.weather_cache import haversine_km
+
+
+def text(result: dict) -> str:
+    return result["content"][0]["text"]
+
+
+def squared(a: tuple[float, float, float], b: tuple[float, float, float]) -> float:
+    return sum((x - y) ** 2 for x, y in zip(a, b))
+
+
+@pytest.fixture(scope="module")
+def cloud() -> list[tuple[float, float, float]]:
+    """Random points around southern Spain, with duplicates."""
+    rng = random.Random(5)
+    points = [to_unit_vector(rng.uniform(35.5, 38.5), rng.uniform(-7.0, -1.5)) for _ in range(400)]
+    return points + points[:20]
+
+
+def test_chord_matches_haversine():
+    for km in (0.1, 5, 120, 900):
+        a, b = to_unit_vector(36.5, -4.9), to_unit_vector(36.5, -4.9 + km / 89.4)
+        assert math.sqrt(squared(a, b)) == pytest.approx(km_to_chord(haversine_km(36.5, -4.9, 36.5, -4.9 + km / 89.4)))
+
+
+def test_within_matches_brute_force(cloud):
+    tree = KDTree(cloud, list(range(len(cloud))))
+    rng = random.Random(6)
+    for _ in range(50):
+        target = to_unit_vector(rng.uniform(35, 39), rng.uniform(-7.5, -1))
+        chord = km_to_chord(rng.choice([1, 10, 40, 150]))
+        expected = sorted((squared(p, target), i) for i, p in enumerate(cloud) if squared(p, target) <= chord * chord)
+        assert sorted(tree.within(target, chord)) == expected
+
+
+def test_nearest_matches_brute_force(cloud):
+    tree = KDTree(cloud, list(range(len(cloud))))
+    rng = random.Random(8)
+    for _ in range(50):
+        target = to_unit_vector(rng.uniform(35, 39), rng.uniform(-7.5, -1))
+        k = rng.choice([1, 3, 10, 500])
+        chord = rng.choice([math.inf, km_to_chord(30)])
+        found = tree.nearest(target, k, chord)
+        expected = sorted(squared(p, target) for p in cloud if squared(p, target) <= chord * chord)[:k]
+        assert [distance for distance, _ in found] == pytest.approx(expected)
+        assert all(squared(cloud[i], target) == distance for distance, i in found)
+
+
+def test_empty_tree_and_zero_k():
+    assert KDTree([], []).within((1.0, 0.0, 0.0), 1.0) == []
+    assert KDTree([(1.0, 0.0, 0.0)], [0]).nearest((1.0, 0.0, 0.0), 0) == []
+
+
+def test_index_merges_categories_nearest_first():
+    results = poi_index.nearby(36.5103, -4.8856, ["restaurant", "parking"], limit=4)
+    assert len(results) == 4
+    assert [km for km, _ in results] == sorted(km for km, _ in results)
+    assert {poi.category for _, poi in results} <= {"restaurant", "parking"}
+
+    everything = poi_index.nearby(36.5103, -4.8856, radius_km=2)
+    expected = [poi for poi in poi_index.pois if haversine_km(36.5103, -4.8856, poi.latitude, poi.longitude) <= 2]
+    assert sorted(poi.name for _, poi in everything) == sorted(poi.name for poi in expected)
+
+
+def test_tool_radius_returns_everything_within_it():
+    centre = poi_index.find("Plaza de los Naranjos")
+    inside = [poi for poi in poi_index.pois
+              if haversine_km(centre.latitude, centre.longitude, poi.latitude, poi.longitude) <= 40]
+    assert len(inside) > 25
+
+    result = asyncio.run(nearby_pois.handler({"location_name": "Plaza de los Naranjos", "radius_km": 40}))
+    listed = [line for line in text(result).splitlines() if line[:1].isdigit()]
+    assert len(listed) == len(inside)
+
+    limited = asyncio.run(nearby_pois.handler({"location_name": "Plaza de los Naranjos", "radius_km": 40, "limit": 3}))
+    assert len([line for line in text(limited).splitlines() if line[:1].isdigit()]) == 3
+
+
+@pytest.mark.parametrize("args, message", [
+    ({"limit": "many"}, "limit must be a whole number. Got: many"),
+    ({"radius_km": "far"}, "radius_km must be a number. Got: far"),
+    ({"radius_km": 80}, "radius_km must be between 0 and 50")
+])
+def test_tool_rejects_invalid_arguments(args, message):
+    result = asyncio.run(nearby_pois.handler({"location_name": "Marbella", **args}))
+    assert result.get("is_error")
+    assert message in text(result)
@@ -0,0 +1,43 @@
+"""Tests for the token bucket and retry delay helpers."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from tools.rate_limit import TokenBucket, backoff_delay, parse_retry_after
+
+
+def test_bucket_allows_burst_then_paces_to_rate():
+    async def scenario():
+        bucket = TokenBucket(rate=50, capacity=5)
+        start = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        burst = time.monotonic() - start
+        for _ in range(5):
+            await bucket.acquire()
+        return burst, time.monotonic() - start, bucket.waits
+
+    burst, total, waits = asyncio.run(scenario())
+    assert burst < 0.05
+    assert total >= 5 / 50 * 0.9
+    assert waits == 5
+
+
+def test_retry_after_seconds_and_http_date():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 28 <= parse_retry_after(later) <= 30
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 -0000") == 0.0
+
+
+def test_backoff_honours_retry_after_and_caps_jitter():
+    assert backoff_delay(3, "2") == 2.0
+    delays = [backoff_delay(10) for _ in range(200)]
+    assert all(0 <= delay <= 8.0 for delay in delays)
+    assert all(0 <= backoff_delay(0) <= 0.5 for _ in range(200))
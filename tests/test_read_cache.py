@@ -0,0 +1,92 @@
+"""Tests for the read-result cache used by list_trips/list_tasks/trip_breakdown."""
+
+import asyncio
+
+from tools import task_manager_tool
+from tools.task_manager_tool import ReadResultCache, add_task, create_trip, list_tasks
+
+
+def result(text: str) -> dict:
+    return {"content": [{"type": "text", "text": text}]}
+
+
+def test_put_discarded_after_invalidation_during_read():
+    cache = ReadResultCache()
+    key = cache.make_key("list_tasks", {"trip_id": "t"})
+
+    generation = cache.generation("t")
+    cache.invalidate_trip("t")  # a write lands while the read is running
+    cache.put(key, "t", result("stale"), generation)
+
+    assert cache.get(key) is None
+
+
+def test_write_to_other_trip_keeps_result():
+    cache = ReadResultCache()
+    key = cache.make_key("list_tasks", {"trip_id": "t"})
+
+    generation = cache.generation("t")
+    cache.invalidate_trip("other")
+    cache.put(key, "t", result("fresh"), generation)
+
+    assert cache.get(key) == result("fresh")
+
+
+def test_cross_trip_results_dropped_by_any_write():
+    cache = ReadResultCache()
+    key = cache.make_key("list_trips", {})
+
+    generation = cache.generation(None)
+    cache.invalidate_trip("t")
+    cache.put(key, None, result("stale"), generation)
+    assert cache.get(key) is None
+
+    cache.put(key, None, result("fresh"), cache.generation(None))
+    cache.invalidate_trip("t")
+    assert cache.get(key) is None
+
+
+def test_results_are_copies():
+    cache = ReadResultCache()
+    key = cache.make_key("list_tasks", {"trip_id": "t"})
+    stored = result("tasks")
+    cache.put(key, "t", stored)
+
+    stored["content"][0]["text"] = "changed by caller"
+    first = cache.get(key)
+    first["content"][0]["text"] = "changed again"
+
+    assert cache.get(key) == result("tasks")
+
+
+def test_clear_discards_reads_started_before():
+    cache = ReadResultCache()
+    key = cache.make_key("list_tasks", {"trip_id": "t"})
+
+    generation = cache.generation("t")
+    cache.clear()
+    cache.put(key, "t", result("old"), generation)
+
+    assert cache.get(key) is None
+
+
+def test_list_tasks_sees_task_added_during_read(trips_db, monkeypatch):
+    async def scenario():
+        await create_trip.handler({"trip_name": "Ronda"})
+        original = task_manager_tool._list_tasks
+
+        async def slow_list_tasks(args):
+            listed = await original(args)
+            # The write commits after the read queried but before it is cached
+            await add_task.handler({"trip_id": "ronda", "description": "Book Bardal"})
+            return listed
+
+        monkeypatch.setattr(task_manager_tool, "_list_tasks", slow_list_tasks)
+        first = await list_tasks.handler({"trip_id": "ronda"})
+        monkeypatch.setattr(task_manager_tool, "_list_tasks", original)
+        second = await list_tasks.handler({"trip_id": "ronda"})
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert "Book Bardal" not in first["content"][0]["text"]
+    assert "Book Bardal" in second["content"][0]["text"]
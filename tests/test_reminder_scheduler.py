@@ -0,0 +1,117 @@
+"""Tests for the due-date reminder scheduler."""
+
+import asyncio
+from datetime import date, datetime, timedelta
+
+from tools import task_manager_tool
+from tools.reminder_scheduler import ReminderScheduler
+from tools.task_manager_tool import add_task, complete_task, create_trip, delete_task, update_task
+
+NOW = datetime(2026, 7, 1, 12, 0).timestamp()
+
+
+def due_in(days: int) -> str:
+    return (datetime.fromtimestamp(NOW) + timedelta(days=days)).strftime("%Y-%m-%dT%H:%M")
+
+
+def test_reminders_pop_in_deadline_order():
+    scheduler = ReminderScheduler(lead_time=timedelta(hours=1))
+    for task_id, days in [(1, 3), (2, 1), (3, 2), (4, -1)]:
+        scheduler.on_task_changed(task_id, "trip", f"Task {task_id}", due_in(days), "pending")
+
+    due, delay = scheduler._pop_due(NOW)
+    assert [event.task_id for event in due] == [4]
+    assert delay == timedelta(days=1, hours=-1).total_seconds()
+
+    due, delay = scheduler._pop_due(NOW + timedelta(days=5).total_seconds())
+    assert [event.task_id for event in due] == [2, 3, 1]
+    assert delay is None and len(scheduler) == 0
+
+
+def test_changed_due_date_reschedules_and_other_edits_do_not():
+    scheduler = ReminderScheduler(lead_time=timedelta(0))
+    scheduler.on_task_changed(1, "trip", "Ferry", due_in(1), "pending")
+    scheduler.on_task_changed(1, "trip", "Ferry to Tangier", due_in(1), "pending")
+    assert len(scheduler._heap) == 1
+
+    scheduler.on_task_changed(1, "trip", "Ferry to Tangier", due_in(3), "pending")
+    due, delay = scheduler._pop_due(NOW + timedelta(days=2).total_seconds())
+    assert due == [] and delay == timedelta(days=1).total_seconds()
+
+    due, _ = scheduler._pop_due(NOW + timedelta(days=3).total_seconds())
+    assert [(event.description, event.due_date) for event in due] == [("Ferry to Tangier", due_in(3))]
+
+
+def test_completed_and_deleted_tasks_are_dropped():
+    scheduler = ReminderScheduler(lead_time=timedelta(0))
+    for task_id in (1, 2, 3):
+        scheduler.on_task_changed(task_id, "trip", "Task", due_in(task_id), "pending")
+    scheduler.on_task_changed(1, "trip", "Task", due_in(1), "completed")
+    scheduler.on_task_changed(2, "trip", "Task", None, "deleted")
+    # Clearing the due date drops the reminder too
+    scheduler.on_task_changed(3, "trip", "Task", None, "pending")
+
+    assert len(scheduler) == 0
+    assert scheduler._pop_due(NOW + timedelta(days=10).total_seconds()) == ([], None)
+
+
+def test_fired_reminder_is_not_repeated_until_due_date_changes():
+    scheduler = ReminderScheduler(lead_time=timedelta(days=1))
+    scheduler.on_task_changed(1, "trip", "Hotel", due_in(1), "pending")
+    assert len(scheduler._pop_due(NOW + 1)[0]) == 1
+
+    for _ in range(2):
+        scheduler.on_task_changed(1, "trip", "Hotel (sea view)", due_in(1), "pending")
+    assert scheduler._pop_due(NOW + 2) == ([], None)
+
+    scheduler.on_task_changed(1, "trip", "Hotel (sea view)", due_in(4), "pending")
+    assert scheduler._pop_due(NOW + timedelta(days=3).total_seconds() + 1)[0][0].due_date == due_in(4)
+
+
+def test_task_tools_emit_one_reminder_per_due_date(trips_db, monkeypatch):
+    monkeypatch.setattr(task_manager_tool, "task_listeners", [])
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    next_month = (date.today() + timedelta(days=30)).isoformat()
+    events = []
+
+    async def scenario():
+        await create_trip.handler({"trip_name": "Remind"})
+        scheduler = ReminderScheduler(sink=events.append, lead_time=timedelta(days=2))
+        await scheduler.start()
+        await add_task.handler({"trip_id": "remind", "description": "Book ferry", "due_date": tomorrow})
+        await asyncio.sleep(0.05)
+        await update_task.handler({"task_id": 1, "priority": "high"})
+        await update_task.handler({"task_id": 1, "description": "Book the ferry"})
+        await asyncio.sleep(0.05)
+        await complete_task.handler({"task_id": 1})
+        await add_task.handler({"trip_id": "remind", "description": "Car", "due_date": next_month})
+        await delete_task.handler({"task_id": 2})
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert [(event.task_id, event.description) for event in events] == [(1, "Book ferry")]
+    assert len(scheduler) == 0 and scheduler._fired == {}
+
+
+def test_failing_sink_is_logged_and_scheduler_keeps_running(caplog):
+    delivered = []
+
+    def sink(event):
+        if event.task_id == 1:
+            raise RuntimeError("sink down")
+        delivered.append(event.task_id)
+
+    async def scenario():
+        scheduler = ReminderScheduler(sink=sink, lead_time=timedelta(days=30))
+        await scheduler.start(load=False)
+        scheduler.on_task_changed(1, "trip", "A", date.today().isoformat(), "pending")
+        await asyncio.sleep(0.02)
+        scheduler.on_task_changed(2, "trip", "B", date.today().isoformat(), "pending")
+        await asyncio.sleep(0.02)
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert delivered == [2]
+    assert "Reminder sink" in caplog.text and "task #1" in caplog.text
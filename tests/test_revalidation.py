@@ -0,0 +1,72 @@
+"""Tests for conditional revalidation of expired forecasts (against the local met.no stub)."""
+
+import asyncio
+
+from met_stub import MetNoStub
+from tools import weather_tool
+from tools.weather_tool import fetch_forecast
+
+
+def count_parses(monkeypatch) -> list[int]:
+    """Count calls to weather_tool.parse_forecast; returns a one-element counter."""
+    calls = [0]
+    original = weather_tool.parse_forecast
+
+    def counting(*args, **kwargs):
+        calls[0] += 1
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(weather_tool, "parse_forecast", counting)
+    return calls
+
+
+def test_unchanged_forecast_is_revalidated_with_a_304(serve_stub, monkeypatch):
+    parses = count_parses(monkeypatch)
+
+    async def scenario():
+        async with serve_stub(MetNoStub(expires_in=0)) as stub:
+            first = await fetch_forecast(36.51, -4.88)
+            second = await fetch_forecast(36.51, -4.88)
+            return first, second, dict(stub.status_counts)
+
+    first, second, statuses = asyncio.run(scenario())
+    assert second is first
+    assert statuses == {200: 1, 304: 1}
+    assert parses[0] == 1
+    assert weather_tool.forecast_cache.stats()["revalidated"] == 1
+
+
+def test_304_extends_the_cached_entry(serve_stub):
+    async def scenario():
+        stub = MetNoStub(expires_in=0)
+        async with serve_stub(stub):
+            await fetch_forecast(36.51, -4.88)
+            stub.expires_in = 600
+            await fetch_forecast(36.51, -4.88)
+            await fetch_forecast(36.51, -4.88)
+            key = weather_tool.forecast_cache.key(36.51, -4.88)
+            return dict(stub.status_counts), weather_tool.forecast_cache.expires_in(key)
+
+    statuses, expires_in = asyncio.run(scenario())
+    assert statuses == {200: 1, 304: 1}
+    assert expires_in > 590
+
+
+def test_updated_forecast_is_downloaded_again(serve_stub, monkeypatch):
+    parses = count_parses(monkeypatch)
+
+    async def scenario():
+        async with serve_stub(MetNoStub(expires_in=0)) as stub:
+            first = await fetch_forecast(36.51, -4.88)
+            # The cached copy predates the stub's current model run
+            key = weather_tool.forecast_cache.key(36.51, -4.88)
+            payload, expires_at, _ = weather_tool.forecast_cache._entries[key]
+            weather_tool.forecast_cache._entries[key] = (payload, expires_at, "Mon, 01 Jan 2024 00:00:00 GMT")
+            second = await fetch_forecast(36.51, -4.88)
+            return first, second, dict(stub.status_counts)
+
+    first, second, statuses = asyncio.run(scenario())
+    assert second is not first
+    assert statuses == {200: 2}
+    assert parses[0] == 2
+    assert weather_tool.forecast_cache.stats()["revalidated"] == 0
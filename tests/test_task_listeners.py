@@ -0,0 +1,27 @@
+"""Tests for task mutation listeners."""
+
+import asyncio
+
+from tools import task_manager_tool
+from tools.task_manager_tool import add_task, create_trip
+
+
+def test_failing_listener_does_not_fail_committed_write(trips_db, monkeypatch):
+    seen = []
+
+    def broken(*args):
+        raise RuntimeError("listener bug")
+
+    monkeypatch.setattr(task_manager_tool, "task_listeners", [broken, lambda *args: seen.append(args)])
+
+    async def scenario():
+        await create_trip.handler({"trip_name": "Listen"})
+        args = {"trip_id": "listen", "description": "Book ferry", "due_date": "2026-07-01", "idempotency_key": "k"}
+        first = await add_task.handler(args)
+        second = await add_task.handler(args)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert not first.get("is_error")
+    assert second == first
+    assert seen == [(1, "listen", "Book ferry", "2026-07-01", "pending")]
@@ -0,0 +1,83 @@
+"""Tests for the task_rollup table behind trip_breakdown."""
+
+import asyncio
+import sqlite3
+import time
+
+import aiosqlite
+
+from tools.task_manager_tool import (
+    add_task,
+    complete_task,
+    create_trip,
+    init_database,
+    list_tasks,
+    list_trips,
+    read_cache,
+    trip_breakdown
+)
+
+
+async def rollup_rows(db_path: str) -> list[tuple]:
+    async with aiosqlite.connect(db_path) as db:
+        async with db.execute(
+            "SELECT trip_id, category, priority, total, completed FROM task_rollup ORDER BY 1, 2, 3"
+        ) as cursor:
+            return await cursor.fetchall()
+
+
+def test_triggers_keep_rollup_current(trips_db):
+    async def scenario():
+        await create_trip.handler({"trip_name": "Roll"})
+        await add_task.handler({"trip_id": "roll", "description": "Hotel", "category": "Accommodation"})
+        await add_task.handler({"trip_id": "roll", "description": "Car", "category": "transport", "priority": "high"})
+        await complete_task.handler({"task_id": 1})
+        return await rollup_rows(trips_db)
+
+    assert asyncio.run(scenario()) == [
+        ("roll", "accommodation", "", 1, 1),
+        ("roll", "transport", "high", 1, 0)
+    ]
+
+
+def test_concurrent_init_backfills_existing_tasks_once(trips_db):
+    async def scenario():
+        await create_trip.handler({"trip_name": "Roll"})
+        for description in ("Hotel", "Car", "Museum"):
+            await add_task.handler({"trip_id": "roll", "description": description, "category": "other"})
+        async with aiosqlite.connect(trips_db) as db:
+            await db.execute("DROP TABLE task_rollup")
+            await db.commit()
+
+        await asyncio.gather(*(init_database() for _ in range(4)))
+        return await rollup_rows(trips_db)
+
+    assert asyncio.run(scenario()) == [("roll", "other", "", 3, 0)]
+
+
+def test_reads_do_not_wait_for_another_connections_write(trips_db):
+    async def scenario():
+        await create_trip.handler({"trip_name": "Roll"})
+        await add_task.handler({"trip_id": "roll", "description": "Hotel", "category": "accommodation"})
+        read_cache.clear()
+
+        writer = sqlite3.connect(trips_db, isolation_level=None)
+        try:
+            writer.execute("BEGIN IMMEDIATE")
+            writer.execute("INSERT INTO trips (trip_id, trip_name) VALUES ('other', 'Other')")
+            started = time.monotonic()
+            results = [
+                await list_trips.handler({}),
+                await list_tasks.handler({"trip_id": "roll"}),
+                await trip_breakdown.handler({"trip_id": "roll"})
+            ]
+            elapsed = time.monotonic() - started
+        finally:
+            writer.rollback()
+            writer.close()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(scenario())
+    assert not any(result.get("is_error") for result in results)
+    assert "Hotel" in results[1]["content"][0]["text"]
+    assert elapsed < 1
@@ -0,0 +1,104 @@
+"""Tests for the walking route optimizer and plan_walking_route's argument handling."""
+
+import asyncio
+import itertools
+import random
+
+import pytest
+
+from tools.route_optimizer import Stop, plan_route, walking_meters
+from tools.walking_route_tool import plan_walking_route
+
+
+def text(result: dict) -> str:
+    return result["content"][0]["text"]
+
+
+def old_town(name: str, dwell: float, north_m: float = 0, east_m: float = 0, must_see: bool = False) -> Stop:
+    """A stop offset from Plaza de los Naranjos, Marbella."""
+    return Stop(name, 36.5103 + north_m / 111_000, -4.8856 + east_m / 89_400, dwell, must_see)
+
+
+def test_without_budget_visits_everything_in_a_short_order():
+    rng = random.Random(3)
+    pois = [old_town(f"P{i}", 5, rng.uniform(-600, 600), rng.uniform(-600, 600)) for i in range(7)]
+    start = old_town("Car park", 0, -700, 0)
+    route = plan_route(pois, start)
+
+    assert route.stops[0] is start
+    assert sorted(stop.name for stop in route.stops[1:]) == sorted(poi.name for poi in pois)
+    assert not route.skipped
+    # 2-opt from nearest neighbour stays within a few percent of the best order
+    brute = min(
+        sum(walking_meters(a, b) for a, b in zip((start, *order), order))
+        for order in itertools.permutations(pois)
+    )
+    assert route.meters <= brute * 1.05
+
+
+def test_budget_drops_the_smallest_stop_that_makes_it_fit():
+    museum = old_town("Museum", 90, 120, 240)
+    view = old_town("View", 10)
+    church = old_town("Church", 20, 80, 135)
+    route = plan_route([museum, view, church], budget_minutes=115)
+
+    assert sorted(stop.name for stop in route.stops) == ["Church", "Museum"]
+    assert [stop.name for stop in route.skipped] == ["View"]
+    assert route.total_minutes <= 115
+
+
+def test_budget_never_drops_must_see_stops():
+    museum = old_town("Museum", 90, 120, 240, must_see=True)
+    view = old_town("View", 10)
+    church = old_town("Church", 20, 80, 135)
+    route = plan_route([museum, view, church], budget_minutes=60)
+
+    assert [stop.name for stop in route.stops] == ["Museum"]
+    assert sorted(stop.name for stop in route.skipped) == ["Church", "View"]
+    assert route.total_minutes > 60
+
+
+def test_budget_keeps_every_stop_that_still_fits():
+    rng = random.Random(11)
+    for _ in range(30):
+        pois = [old_town(f"P{i}", rng.choice([5, 10, 20, 45, 60]), rng.uniform(-800, 800), rng.uniform(-800, 800))
+                for i in range(6)]
+        start = old_town("Car park", 0)
+        budget = rng.uniform(40, 150)
+        route = plan_route(pois, start, return_to_start=True, budget_minutes=budget)
+
+        assert route.total_minutes <= budget
+        visited = route.stops[1:-1]
+        assert len(visited) + len(route.skipped) == len(pois)
+        for stop in route.skipped:
+            assert plan_route(visited + [stop], start, return_to_start=True).total_minutes > budget
+
+
+def test_tool_coerces_numeric_strings_and_parses_must_see():
+    result = asyncio.run(plan_walking_route.handler({"pois": [
+        {"name": "Museum", "latitude": "36.5114", "longitude": "-4.8829", "dwell_minutes": "90", "must_see": "true"},
+        {"name": "View", "latitude": 36.5103, "longitude": -4.8856, "dwell_minutes": 10, "must_see": "false"},
+        {"name": "Church", "latitude": 36.5110, "longitude": -4.8841, "dwell_minutes": 20}
+    ], "time_budget_minutes": 100}))
+
+    assert not result.get("is_error")
+    assert "Museum (1 h 30 min) ★" in text(result)
+    assert "View (" not in text(result) and "Church (" not in text(result)
+    skipped = next(line for line in text(result).splitlines() if line.startswith("**Skipped"))
+    assert sorted(skipped.split(":** ")[1].split(", ")) == ["Church", "View"]
+
+
+@pytest.mark.parametrize("poi, message", [
+    ({"name": "A", "latitude": "north", "longitude": -4.88}, "Invalid latitude/longitude/dwell_minutes for A"),
+    ({"name": "A", "latitude": [36.5], "longitude": -4.88}, "Invalid latitude/longitude/dwell_minutes for A"),
+    ({"name": "A", "latitude": 36.5, "longitude": -4.88, "dwell_minutes": "half an hour"}, "Invalid latitude"),
+    ({"name": "A", "latitude": 36.5, "longitude": -4.88, "dwell_minutes": -5}, "must not be negative (A)"),
+    ({"name": "A", "latitude": 36.5, "longitude": -4.88, "must_see": "maybe"}, "must_see must be true or false"),
+    ({"name": 7, "latitude": 36.5, "longitude": -4.88}, "Invalid point name 7")
+])
+def test_tool_rejects_invalid_points(poi, message):
+    other = {"name": "B", "latitude": 36.51, "longitude": -4.88}
+    result = asyncio.run(plan_walking_route.handler({"pois": [poi, other]}))
+
+    assert result.get("is_error")
+    assert message in text(result)
@@ -0,0 +1,94 @@
+"""Tests for the forecast cache tiers and cache keys."""
+
+import asyncio
+
+import aiosqlite
+import pytest
+
+from tools import weather_cache
+from tools.weather_cache import (
+    INDEX_PRECISION,
+    DiskForecastCache,
+    ForecastCache,
+    geohash_cell_size,
+    geohash_decode,
+    geohash_encode,
+    haversine_km
+)
+
+
+def test_geohash_known_value_and_round_trip():
+    assert geohash_encode(42.6, -5.6, 5) == "ezs42"
+    for latitude, longitude in [(36.51, -4.88), (-33.86, 151.21), (0.0, 0.0), (89.9, -179.9)]:
+        for precision in (5, 6, 8):
+            centre = geohash_decode(geohash_encode(latitude, longitude, precision))
+            lat_size, lon_size = geohash_cell_size(precision)
+            assert abs(centre[0] - latitude) <= lat_size / 2
+            assert abs(centre[1] - longitude) <= lon_size / 2
+
+
+def test_haversine_km():
+    assert haversine_km(36.51, -4.88, 36.51, -4.88) == 0
+    assert haversine_km(36.5101, -4.8826, 37.1773, -3.5986) == pytest.approx(136.2, abs=0.1)  # Marbella-Granada
+
+
+def test_cache_keys_use_the_cache_precision():
+    coarse = ForecastCache(precision=INDEX_PRECISION)
+    fine = ForecastCache(precision=8)
+    assert coarse.key(36.51, -4.88, 20) == ("eykx8", 20)
+    assert fine.key(36.51, -4.88)[0].startswith(coarse.key(36.51, -4.88)[0])
+    assert len(fine.key(36.51, -4.88)[0]) == 8
+
+    with pytest.raises(ValueError):
+        ForecastCache(precision=INDEX_PRECISION - 1)
+
+
+def test_nearby_lookup_at_index_precision():
+    async def scenario():
+        cache = ForecastCache(nearby_km=10, precision=INDEX_PRECISION)
+        await cache.set(cache.key(36.51, -4.88), "marbella", ttl=60)
+        return await cache.get(cache.key(36.53, -4.86)), await cache.get(cache.key(37.18, -3.60))
+
+    near, far = asyncio.run(scenario())
+    assert near == "marbella"
+    assert far is None
+
+
+def test_open_disk_cache_reuses_one_connection(tmp_path, monkeypatch):
+    connects = 0
+    connect = aiosqlite.connect
+
+    def counting_connect(*args, **kwargs):
+        nonlocal connects
+        connects += 1
+        return connect(*args, **kwargs)
+
+    monkeypatch.setattr(weather_cache.aiosqlite, "connect", counting_connect)
+
+    async def scenario():
+        cache = DiskForecastCache(path=str(tmp_path / "weather.db"))
+        await cache.open()
+        try:
+            for i in range(5):
+                await cache.set(("cell", i), {"n": i}, ttl=60)
+                await cache.refresh(("cell", i), ttl=120)
+            found = await asyncio.gather(*(cache.get(("cell", i)) for i in range(5)))
+        finally:
+            await cache.close()
+        return found
+
+    found = asyncio.run(scenario())
+    assert connects == 1
+    assert [entry[0] for entry in found] == [{"n": i} for i in range(5)]
+    assert all(100 < entry[1] <= 120 for entry in found)
+
+
+def test_closed_disk_cache_still_works(tmp_path):
+    async def scenario():
+        cache = DiskForecastCache(path=str(tmp_path / "weather.db"))
+        await cache.set(("cell", 1), [1, 2], ttl=60)
+        return await cache.get(("cell", 1)), await cache.get(("cell", 2))
+
+    hit, miss = asyncio.run(scenario())
+    assert hit[0] == [1, 2]
+    assert miss is None
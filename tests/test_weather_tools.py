@@ -0,0 +1,29 @@
+"""Tests for the weather tools' argument handling (against the local met.no stub)."""
+
+import asyncio
+
+from met_stub import MetNoStub
+from tools.weather_tool import get_weather_forecasts
+
+
+def text(result: dict) -> str:
+    return result["content"][0]["text"]
+
+
+def test_batch_coerces_numeric_strings_and_reports_bad_entries(serve_stub):
+    async def scenario():
+        async with serve_stub(MetNoStub()) as stub:
+            result = await get_weather_forecasts.handler({"locations": [
+                {"latitude": "36.51", "longitude": "-4.88", "name": "Marbella"},
+                {"latitude": "north", "longitude": -4.88, "name": "Typo"},
+                {"latitude": 36.74, "longitude": -5.17, "altitude": "740", "name": "Ronda"}
+            ], "units": "celsius"})
+            return result, stub.queries
+
+    result, queries = asyncio.run(scenario())
+    assert not result.get("is_error")
+    rows = {line.split(" | ")[0].strip("| "): line for line in text(result).splitlines() if line.startswith("| ")}
+    assert "⚠" not in rows["Marbella"]
+    assert "Invalid latitude/longitude/altitude" in rows["Typo"]
+    assert "⚠" not in rows["Ronda"]
+    assert sorted(query.get("altitude", "") for query in queries) == ["", "740"]
@@ -3,8 +3,25 @@ Travel Planning Tools for Marbella Agent
 Exports weather and task management tools as an MCP server.
 """
 
+from typing import Any, Callable
 from claude_agent_sdk import create_sdk_mcp_server
-from .weather_tool import get_weather_forecast
+from .weather_tool import (
+    get_weather_forecast,
+    get_weather_forecasts,
+    forecast_cache,
+    request_stats,
+    circuit_breaker,
+    close_session
+)
+from .climate_tool import get_climate_normals
+from .climate_normals import climate_index
+from .geocode_tool import geocode
+from .drive_time_tool import get_drive_times
+from .drive_times import road_network
+from .walking_route_tool import plan_walking_route
+from .poi_tool import nearby_pois
+from .points_of_interest import poi_index
+from .gazetteer import gazetteer as place_gazetteer
 from .task_manager_tool import (
     create_trip,
     add_task,
@@ -12,16 +29,28 @@ from .task_manager_tool import (
     complete_task,
     update_task,
     delete_task,
-    list_trips
+    list_trips,
+    trip_breakdown,
+    read_cache
 )
+from .cache_warmer import CacheWarmer
+from .db_backup import BackupJob
+from .reminder_scheduler import ReminderEvent, ReminderScheduler
 
 # Create MCP server with all tools
 travel_tools_server = create_sdk_mcp_server(
     name="travel_tools",
     version="1.0.0",
     tools=[
-        # Weather tool
+        # Weather tools
         get_weather_forecast,
+        get_weather_forecasts,
+        get_climate_normals,
+        # Places and travel logistics
+        geocode,
+        get_drive_times,
+        plan_walking_route,
+        nearby_pois,
         # Task management tools
         create_trip,
         add_task,
@@ -29,8 +58,110 @@ travel_tools_server = create_sdk_mcp_server(
         complete_task,
         update_task,
         delete_task,
-        list_trips
+        list_trips,
+        trip_breakdown
     ]
 )
 
-__all__ = ["travel_tools_server"]
+# Keeps forecasts for the usual destinations fresh while the server is in use
+forecast_warmer = CacheWarmer()
+
+# Periodic verified snapshots of the trips database while the server runs
+database_backups = BackupJob()
+
+# Due-date reminder service; running only between startup(reminder_sink=...) and shutdown()
+reminder_scheduler: ReminderScheduler | None = None
+
+
+def get_session_stats() -> dict:
+    """
+    Return cache and service statistics for the tools.
+
+    The caches and counters are process-wide: every agent session in the
+    process shares (and contributes to) them.
+    """
+    return {
+        "read_cache": read_cache.stats(),
+        "weather_cache": forecast_cache.stats(),
+        "weather_requests": dict(request_stats),
+        "weather_breaker": circuit_breaker.stats(),
+        "climate_index": climate_index.stats(),
+        "gazetteer": place_gazetteer.stats(),
+        "road_network": road_network.stats(),
+        "poi_index": poi_index.stats(),
+        "cache_warmer": forecast_warmer.stats()
+    }
+
+
+def reset_session():
+    """
+    Clear the cached read results (called when a conversation is reset).
+
+    The read cache is shared by every session in the process, so this also
+    clears it, and its counters, for the others.
+    """
+    read_cache.clear()
+
+
+async def startup(
+    warm_cache: bool = True,
+    hot_locations: list[tuple[str, float, float]] | None = None,
+    warm_lead_time: float | None = None,
+    warm_idle_timeout: float | None = None,
+    reminder_sink: Callable[[ReminderEvent], Any] | None = None,
+    backup: bool = True,
+    backup_interval: float | None = None,
+    backup_retention: int | None = None
+):
+    """
+    Start background tool services with the server and open the forecast disk cache.
+
+    Args:
+        warm_cache: Run the forecast cache warmer
+        hot_locations: (name, latitude, longitude) tuples to keep warm (default: HOT_LOCATIONS)
+        warm_lead_time: Seconds before expiry to refresh a warm forecast (default: WARM_LEAD_TIME)
+        warm_idle_timeout: Seconds without lookups after which warming pauses (default: WARM_IDLE_TIMEOUT)
+        reminder_sink: Callable receiving a ReminderEvent as each pending task
+            comes due (may be async); due-date reminders are off without one
+        backup: Snapshot the trips database now and then every backup_interval
+        backup_interval: Seconds between snapshots (default: BackupJob's, hourly)
+        backup_retention: Snapshots to keep in backups/ (default: BackupJob's, 24)
+    """
+    global reminder_scheduler
+
+    if forecast_cache.disk is not None:
+        await forecast_cache.disk.open()
+    if hot_locations is not None:
+        forecast_warmer.locations = list(hot_locations)
+    if warm_lead_time is not None:
+        forecast_warmer.lead_time = warm_lead_time
+    if warm_idle_timeout is not None:
+        forecast_warmer.idle_timeout = warm_idle_timeout
+    if warm_cache:
+        forecast_warmer.start()
+    if reminder_sink is not None and reminder_scheduler is None:
+        reminder_scheduler = ReminderScheduler(sink=reminder_sink)
+        await reminder_scheduler.start()
+    if backup_interval is not None:
+        database_backups.interval = backup_interval
+    if backup_retention is not None:
+        database_backups.retention = backup_retention
+    if backup:
+        database_backups.start()
+
+
+async def shutdown():
+    """Stop background services and release shared resources (HTTP connections, disk cache)."""
+    global reminder_scheduler
+
+    if reminder_scheduler is not None:
+        await reminder_scheduler.stop()
+        reminder_scheduler = None
+    await database_backups.stop()
+    await forecast_warmer.stop()
+    await close_session()
+    if forecast_cache.disk is not None:
+        await forecast_cache.disk.close()
+
+
+__all__ = ["travel_tools_server", "get_session_stats", "reset_session", "startup", "shutdown"]
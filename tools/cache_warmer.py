@@ -0,0 +1,136 @@
+"""
+Forecast Cache Warmer
+Background asyncio service that keeps forecasts for frequently requested
+locations fresh, so tool calls for them are served from cache.
+"""
+
+import asyncio
+import time
+
+from . import weather_tool
+from .weather_tool import WeatherFetchError
+
+# Locations the agents ask about most: (name, latitude, longitude)
+HOT_LOCATIONS = [
+    ("Marbella", 36.51, -4.88),
+    ("Granada", 37.18, -3.60),
+    ("Málaga", 36.72, -4.42),
+    ("Ronda", 36.74, -5.17)
+]
+
+# Refresh this long before a cached forecast expires (seconds)
+WARM_LEAD_TIME = 300
+
+# Stop refreshing after this long without a weather lookup (seconds)
+WARM_IDLE_TIMEOUT = 1800
+
+# Minimum spacing between refreshes of one location, and the idle check interval (seconds)
+MIN_REFRESH_INTERVAL = 60
+IDLE_POLL_INTERVAL = 60
+
+
+class CacheWarmer:
+    """
+    Refreshes hot locations in weather_tool.forecast_cache ahead of expiry.
+
+    Each location is re-requested lead_time seconds before its cached entry
+    expires (conditionally, so an unchanged forecast costs a 304). The
+    service sleeps until the next entry is due, and once no weather lookup
+    has happened for idle_timeout seconds it stops making requests until
+    lookups resume. Requests go through the same rate limiter, concurrency
+    limit and request coalescing as tool calls.
+
+    Args:
+        locations: (name, latitude, longitude) tuples to keep warm
+        lead_time: Seconds before expiry to refresh
+        idle_timeout: Seconds without lookups after which warming pauses
+    """
+
+    def __init__(
+        self,
+        locations: list[tuple[str, float, float]] | None = None,
+        lead_time: float = WARM_LEAD_TIME,
+        idle_timeout: float = WARM_IDLE_TIMEOUT
+    ):
+        self.locations = list(HOT_LOCATIONS if locations is None else locations)
+        self.lead_time = lead_time
+        self.idle_timeout = idle_timeout
+        # cache key -> monotonic time before which the location is not refreshed again
+        self._not_before: dict[tuple, float] = {}
+        self._started_at = time.monotonic()
+        self._task: asyncio.Task | None = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def is_idle(self) -> bool:
+        """True once no weather lookup has happened for idle_timeout seconds."""
+        last = weather_tool.forecast_cache.last_lookup
+        last_activity = self._started_at if last is None else max(last, self._started_at)
+        return time.monotonic() - last_activity > self.idle_timeout
+
+    def _due_at(self, key: tuple, now: float) -> float:
+        """Monotonic time at which key should next be refreshed."""
+        expires_in = weather_tool.forecast_cache.expires_in(key)
+        due = now if expires_in is None else now + expires_in - self.lead_time
+        return max(due, self._not_before.get(key, 0.0))
+
+    async def _refresh(self, latitude: float, longitude: float):
+        key = weather_tool.forecast_cache.key(latitude, longitude)
+        now = time.monotonic()
+        try:
+            await weather_tool.refresh_forecast(latitude, longitude)
+            self.refreshes += 1
+        except WeatherFetchError:
+            self.failures += 1
+
+        # A 304 can return the same Expires time; don't re-request until it passes
+        remaining = weather_tool.forecast_cache.expires_in(key)
+        wait = remaining if remaining is not None and remaining < self.lead_time else 0
+        self._not_before[key] = now + max(wait, MIN_REFRESH_INTERVAL)
+
+    async def run_once(self) -> float:
+        """Refresh every due location; return seconds until the next one is due."""
+        now = time.monotonic()
+        due = [(lat, lon) for _, lat, lon in self.locations
+               if self._due_at(weather_tool.forecast_cache.key(lat, lon), now) <= now]
+        await asyncio.gather(*(self._refresh(lat, lon) for lat, lon in due))
+
+        if not self.locations:
+            return IDLE_POLL_INTERVAL
+        now = time.monotonic()
+        next_due = min(self._due_at(weather_tool.forecast_cache.key(lat, lon), now) for _, lat, lon in self.locations)
+        return max(next_due - now, 1.0)
+
+    async def _run(self):
+        while True:
+            if self.is_idle():
+                await asyncio.sleep(IDLE_POLL_INTERVAL)
+                continue
+            await asyncio.sleep(await self.run_once())
+
+    def start(self) -> asyncio.Task:
+        """Start the background loop (no-op if already running)."""
+        if self._task is None or self._task.done():
+            self._started_at = time.monotonic()
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        """Stop the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        """Return refresh counters and whether warming is currently paused."""
+        return {
+            "locations": len(self.locations),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "running": self._task is not None and not self._task.done(),
+            "idle": self.is_idle()
+        }
@@ -0,0 +1,88 @@
+"""
+Circuit Breaker for Upstream APIs
+Stops calling a failing service for a cool-down period, then lets a single
+probe request through to test whether it has recovered.
+"""
+
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Classic three-state circuit breaker.
+
+    closed: requests flow; consecutive failures are counted and
+        failure_threshold of them open the circuit.
+    open: requests are rejected without being sent until reset_timeout
+        seconds have passed.
+    half_open: exactly one probe request is allowed; its success closes
+        the circuit, its failure opens it again for another reset_timeout.
+
+    Callers ask allow_request() before sending and report the outcome with
+    record_success() or record_failure(), or call release_probe() if the
+    request was abandoned (cancelled) without an outcome.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.trips = 0
+        self.rejected = 0
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now (and claim the probe if half-open)."""
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        self.rejected += 1
+        return False
+
+    def is_open(self) -> bool:
+        """True while requests would be rejected (without claiming a probe)."""
+        if self.state == OPEN:
+            return time.monotonic() - self._opened_at < self.reset_timeout
+        return self.state == HALF_OPEN and self._probe_in_flight
+
+    def record_success(self):
+        """The upstream answered: close the circuit."""
+        self.state = CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        """The upstream failed: count it, and open the circuit if warranted."""
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.trips += 1
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+    def release_probe(self):
+        """A request ended without an outcome: free the half-open probe slot for the next caller."""
+        self._probe_in_flight = False
+
+    def stats(self) -> dict:
+        """Return state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected
+        }
@@ -0,0 +1,199 @@
+"""
+Offline Climate Normals
+Bundled monthly climate normals with a gridded in-memory index, for dates
+beyond the reach of the met.no forecast.
+"""
+
+import csv
+import math
+import os
+from array import array
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from .weather_cache import haversine_km
+
+# Station normals shipped with the package: one row per station and month
+CLIMATE_DATA = os.path.join(os.path.dirname(__file__), "data", "climate_normals.csv")
+
+# Size of an index cell in degrees (0.1° ≈ 11 × 9 km in Andalusia)
+GRID_STEP = 0.1
+
+# Cells farther than this from every station have no normals (km)
+MAX_STATION_DISTANCE_KM = 250
+
+# Inverse-distance weighting exponent
+IDW_POWER = 2
+
+# Temperature change per metre of elevation (standard atmosphere, °C/m)
+LAPSE_RATE = 0.0065
+
+# Per-month values, in this order, for each station and cell
+FIELDS = ("tmax", "tmin", "precip", "rain_days", "sun_hours")
+
+MONTH_NAMES = ("January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December")
+
+
+@dataclass
+class MonthNormals:
+    """Typical conditions for one calendar month at one place."""
+    month: int
+    tmax: float  # mean daily maximum (°C)
+    tmin: float  # mean daily minimum (°C)
+    precip: float  # monthly total (mm)
+    rain_days: float  # days with at least 1 mm
+    sun_hours: float  # monthly total
+
+    @property
+    def name(self) -> str:
+        return MONTH_NAMES[self.month - 1]
+
+    @property
+    def days(self) -> int:
+        """Days in the month (non-leap year)."""
+        return (date(2001 + self.month // 12, self.month % 12 + 1, 1) - timedelta(days=1)).day
+
+
+@dataclass
+class Station:
+    """A reference station; values holds FIELDS for months 1–12, temperatures reduced to sea level."""
+    name: str
+    latitude: float
+    longitude: float
+    elevation: float
+    values: array
+
+
+@dataclass
+class CellNormals:
+    """Interpolated normals for one index cell."""
+    elevation: float  # elevation the temperatures refer to unless an altitude is given (m)
+    nearest: Station
+    values: array  # FIELDS for months 1–12, temperatures at sea level
+
+    def month(self, month: int, altitude: float | None = None) -> MonthNormals:
+        """Normals for month (1–12), temperatures adjusted to altitude (default: the cell's elevation)."""
+        height = self.elevation if altitude is None else altitude
+        offset = (month - 1) * len(FIELDS)
+        tmax, tmin, precip, rain_days, sun_hours = self.values[offset:offset + len(FIELDS)]
+        cooling = LAPSE_RATE * height
+        return MonthNormals(month, tmax - cooling, tmin - cooling, precip, rain_days, sun_hours)
+
+
+def load_stations(path: str = CLIMATE_DATA) -> list[Station]:
+    """Read the station normals CSV (lines starting with '#' are comments)."""
+    stations: dict[str, Station] = {}
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = csv.DictReader(line for line in f if not line.startswith("#"))
+        for row in rows:
+            name = row["station"]
+            station = stations.get(name)
+            if station is None:
+                station = stations[name] = Station(
+                    name, float(row["latitude"]), float(row["longitude"]), float(row["elevation_m"]),
+                    array("d", [math.nan] * 12 * len(FIELDS))
+                )
+            warming = LAPSE_RATE * station.elevation
+            offset = (int(row["month"]) - 1) * len(FIELDS)
+            station.values[offset:offset + len(FIELDS)] = array("d", [
+                float(row["tmax_c"]) + warming,
+                float(row["tmin_c"]) + warming,
+                float(row["precip_mm"]),
+                float(row["rain_days"]),
+                float(row["sun_hours"])
+            ])
+    return list(stations.values())
+
+
+class ClimateIndex:
+    """
+    Monthly climate normals for any coordinates, from a small station dataset.
+
+    The map is divided into GRID_STEP cells. The first lookup in a cell
+    interpolates every month from the stations within max_distance_km of the
+    cell centre (inverse-distance weighting, temperatures reduced to sea level
+    with LAPSE_RATE so stations at different heights are comparable) and
+    stores the result; later lookups in the cell are a dict access. Without
+    an explicit altitude, temperatures refer to the weighted station elevation.
+
+    Args:
+        path: Station normals CSV (default: the bundled CLIMATE_DATA)
+        grid_step: Cell size in degrees
+        max_distance_km: Cells with no station this close have no normals
+    """
+
+    def __init__(
+        self,
+        path: str = CLIMATE_DATA,
+        grid_step: float = GRID_STEP,
+        max_distance_km: float = MAX_STATION_DISTANCE_KM
+    ):
+        self.stations = load_stations(path)
+        self.grid_step = grid_step
+        self.max_distance_km = max_distance_km
+        # (row, column) -> CellNormals, or None where no station is near enough
+        self._cells: dict[tuple[int, int], CellNormals | None] = {}
+        self.lookups = 0
+
+    def _interpolate(self, latitude: float, longitude: float) -> CellNormals | None:
+        nearby = []
+        for station in self.stations:
+            distance = haversine_km(latitude, longitude, station.latitude, station.longitude)
+            if distance <= self.max_distance_km:
+                nearby.append((distance, station))
+        if not nearby:
+            return None
+
+        nearby.sort(key=lambda item: item[0])
+        weights = [1 / max(distance, 1.0) ** IDW_POWER for distance, _ in nearby]
+        total = sum(weights)
+        values = array("d", [0.0] * 12 * len(FIELDS))
+        elevation = 0.0
+        for weight, (_, station) in zip(weights, nearby):
+            share = weight / total
+            elevation += share * station.elevation
+            for i, value in enumerate(station.values):
+                values[i] += share * value
+
+        return CellNormals(elevation, nearby[0][1], values)
+
+    def cell(self, latitude: float, longitude: float) -> CellNormals | None:
+        """Interpolated normals for the cell containing the coordinates (None if out of range)."""
+        self.lookups += 1
+        key = (math.floor(latitude / self.grid_step), math.floor(longitude / self.grid_step))
+        if key not in self._cells:
+            centre = ((key[0] + 0.5) * self.grid_step, (key[1] + 0.5) * self.grid_step)
+            self._cells[key] = self._interpolate(*centre)
+        return self._cells[key]
+
+    def normals(self, latitude: float, longitude: float, altitude: float | None = None) -> list[MonthNormals] | None:
+        """All twelve months for the coordinates, or None if no station is in range."""
+        cell = self.cell(latitude, longitude)
+        if cell is None:
+            return None
+        return [cell.month(month, altitude) for month in range(1, 13)]
+
+    def stats(self) -> dict:
+        """Return dataset size and index usage."""
+        return {
+            "stations": len(self.stations),
+            "cells": len(self._cells),
+            "lookups": self.lookups
+        }
+
+
+def month_spans(start: date, end: date) -> list[tuple[int, int]]:
+    """Split start..end (inclusive) into (month, days in window) pairs, in date order."""
+    spans: list[tuple[int, int]] = []
+    day = start
+    while day <= end:
+        next_month = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+        last = min(end, next_month - timedelta(days=1))
+        spans.append((day.month, (last - day).days + 1))
+        day = next_month
+    return spans
+
+
+# Shared index used by the tools
+climate_index = ClimateIndex()
@@ -0,0 +1,193 @@
+"""
+Climate Normals Tool for Marbella Travel Agent
+Answers "what is the weather usually like" for trips beyond the forecast horizon,
+from bundled monthly normals (no network).
+"""
+
+from typing import Any
+from claude_agent_sdk import tool
+from .climate_normals import MonthNormals, climate_index, month_spans
+from .weather_cache import haversine_km
+from .weather_tool import celsius_to_fahrenheit, parse_date_arg, resolve_location
+
+# Longest date range accepted in one call (days)
+MAX_CLIMATE_WINDOW = 366
+
+
+def _temperature(celsius: float, units: str) -> str:
+    """Format a normal temperature rounded to whole degrees."""
+    if units == "celsius":
+        return f"{celsius:.0f}°C"
+    return f"{celsius_to_fahrenheit(celsius):.0f}°F ({celsius:.0f}°C)"
+
+
+def _days(count: float, noun: str = "day") -> str:
+    """Format a (rounded) number of days: '1 day', '3 rainy days'."""
+    rounded = round(count)
+    return f"{rounded} {noun}{'' if rounded == 1 else 's'}"
+
+
+def format_month_normals(normals: MonthNormals, units: str, trip_days: int | None = None) -> str:
+    """Format one month as 'March: highs …, lows …, rain, sunshine' (plus expected rainy trip days)."""
+    label = normals.name if trip_days is None else f"{normals.name} ({_days(trip_days)})"
+    text = (f"{label}: highs around {_temperature(normals.tmax, units)}, "
+            f"lows around {_temperature(normals.tmin, units)}, "
+            f"{normals.precip:.0f} mm rain over ~{_days(normals.rain_days, 'rainy day')} a month, "
+            f"~{normals.sun_hours / normals.days:.0f} h sunshine a day")
+    if trip_days is not None:
+        expected = normals.rain_days * trip_days / normals.days
+        text += f"; expect ~{_days(expected, 'rainy day')} in these {trip_days}"
+    return text
+
+
+@tool(
+    "get_climate_normals",
+    "Get typical (long-term average) weather for any latitude/longitude, or a location_name in Spain: "
+    "monthly average highs and lows, "
+    "rainfall, rainy days and sunshine. Use for trips beyond the ~9-day forecast horizon; pass "
+    "start_date/end_date (YYYY-MM-DD) for a trip, or omit them for the whole year. Answered offline.",
+    {
+        "latitude": float,
+        "longitude": float,
+        "altitude": int,
+        "location_name": str,
+        "units": str,
+        "start_date": str,
+        "end_date": str
+    }
+)
+async def get_climate_normals(args: dict[str, Any]) -> dict[str, Any]:
+    """
+    Look up monthly climate normals for a location.
+
+    Args:
+        latitude: Latitude in decimal degrees (required unless location_name is a known place)
+        longitude: Longitude in decimal degrees (required unless location_name is a known place)
+        altitude: Elevation in meters (optional; temperatures are adjusted to it)
+        location_name: Human-readable location name (optional; looked up in the gazetteer
+            when latitude/longitude are missing, which also supplies the elevation)
+        units: 'fahrenheit' or 'celsius' (default: 'fahrenheit')
+        start_date: First day of the trip, YYYY-MM-DD (optional)
+        end_date: Last day of the trip, inclusive (optional; defaults to start_date)
+
+    Returns:
+        Typical conditions for each month the trip touches, or for all
+        twelve months when no dates are given
+    """
+    latitude = args.get("latitude")
+    longitude = args.get("longitude")
+    altitude = args.get("altitude")
+    location_name = args.get("location_name", "the location")
+    units = args.get("units", "fahrenheit").lower()
+
+    resolved = None
+    if (latitude is None or longitude is None) and args.get("location_name"):
+        try:
+            resolved = resolve_location(location_name)
+        except ValueError as e:
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": str(e)
+                }],
+                "is_error": True
+            }
+        latitude, longitude = resolved.place.latitude, resolved.place.longitude
+        if altitude is None:
+            altitude = resolved.place.elevation
+
+    if latitude is None or longitude is None:
+        return {
+            "content": [{
+                "type": "text",
+                "text": "Error: Pass latitude and longitude, or a location_name to look up."
+            }],
+            "is_error": True
+        }
+
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+        return {
+            "content": [{
+                "type": "text",
+                "text": f"Error: Invalid coordinates: {latitude}, {longitude}."
+            }],
+            "is_error": True
+        }
+
+    if units not in ["fahrenheit", "celsius"]:
+        units = "fahrenheit"
+
+    try:
+        start_date = parse_date_arg(args.get("start_date"), "start_date")
+        end_date = parse_date_arg(args.get("end_date"), "end_date")
+    except ValueError as e:
+        return {
+            "content": [{
+                "type": "text",
+                "text": str(e)
+            }],
+            "is_error": True
+        }
+
+    if start_date is None and end_date is not None:
+        start_date = end_date
+    if start_date is not None and end_date is None:
+        end_date = start_date
+
+    if start_date is not None:
+        if end_date < start_date:
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": f"Error: end_date ({end_date}) is before start_date ({start_date})."
+                }],
+                "is_error": True
+            }
+        if (end_date - start_date).days + 1 > MAX_CLIMATE_WINDOW:
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": f"Error: The date range can span at most {MAX_CLIMATE_WINDOW} days."
+                }],
+                "is_error": True
+            }
+
+    cell = climate_index.cell(latitude, longitude)
+    if cell is None:
+        return {
+            "content": [{
+                "type": "text",
+                "text": (f"No climate normals available for {latitude}°, {longitude}°: the bundled dataset "
+                         f"covers Spain (Andalusia in most detail).")
+            }],
+            "is_error": True
+        }
+
+    if start_date is not None:
+        response_text = f"**Typical Weather for {location_name}, {start_date} to {end_date}**\n\n"
+        for month, days in month_spans(start_date, end_date):
+            response_text += f"- {format_month_normals(cell.month(month, altitude), units, days)}\n"
+    else:
+        response_text = f"**Typical Weather for {location_name} by Month**\n\n"
+        for month in range(1, 13):
+            response_text += f"- {format_month_normals(cell.month(month, altitude), units)}\n"
+
+    response_text += "\n---\n"
+    response_text += ("Long-term monthly averages, not a forecast: actual weather on given days varies. "
+                      "Use get_weather_forecast for dates within the next ~9 days.\n")
+    nearest = cell.nearest
+    distance = haversine_km(latitude, longitude, nearest.latitude, nearest.longitude)
+    response_text += f"Interpolated from reference stations for {latitude}°, {longitude}°"
+    if resolved is not None:
+        response_text += f" (looked up: {resolved.place.name}, {resolved.place.province})"
+    response_text += f", nearest: {nearest.name} ({distance:.0f} km)"
+    if altitude is not None:
+        response_text += f", temperatures adjusted to {altitude}m elevation"
+    response_text += "\nData: approximate AEMET station climate normals, bundled with the tools"
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": response_text
+        }]
+    }
@@ -0,0 +1,210 @@
+"""
+Online Backups for the Trips Database
+Snapshots trips_database.db with SQLite's online backup API while agents keep running.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+
+from .task_manager_tool import DB_PATH
+
+# Default snapshot location (project root / backups)
+BACKUP_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "backups")
+
+# Pages copied per backup step; the source is only locked while a step runs
+PAGES_PER_STEP = 64
+
+# Pause between steps so tool calls can take the database lock
+STEP_SLEEP = 0.005
+
+
+def list_backups(backup_dir: str = BACKUP_DIR) -> list[str]:
+    """Return snapshot paths in backup_dir, newest first."""
+    if not os.path.isdir(backup_dir):
+        return []
+    names = [
+        name for name in os.listdir(backup_dir)
+        if name.startswith("trips_database-") and name.endswith(".db")
+    ]
+    return [os.path.join(backup_dir, name) for name in sorted(names, reverse=True)]
+
+
+async def create_backup(
+    db_path: str = DB_PATH,
+    backup_dir: str = BACKUP_DIR,
+    pages_per_step: int = PAGES_PER_STEP,
+    step_sleep: float = STEP_SLEEP
+) -> str:
+    """
+    Copy the live database into a timestamped snapshot file.
+
+    The copy runs on aiosqlite's worker thread in steps of pages_per_step
+    pages, so the event loop is never blocked and writers only wait for one
+    step at a time. The snapshot is written to a .partial file and renamed
+    once complete, so a crash never leaves a torn backup behind.
+
+    Returns:
+        Path of the new snapshot
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    final_path = os.path.join(backup_dir, f"trips_database-{stamp}.db")
+    partial_path = final_path + ".partial"
+
+    try:
+        async with aiosqlite.connect(db_path) as source, aiosqlite.connect(partial_path) as target:
+            await source.backup(target, pages=pages_per_step, sleep=step_sleep)
+        os.replace(partial_path, final_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    return final_path
+
+
+async def verify_backup(backup_path: str) -> dict[str, Any]:
+    """
+    Restore a snapshot into a scratch in-memory database and check it.
+
+    A snapshot SQLite cannot read at all ("database disk image is
+    malformed") is reported as not ok, like one that fails integrity_check.
+
+    Returns:
+        Dict with 'ok', the integrity_check result (or SQLite's error) and per-table row counts
+    """
+    row_counts = {}
+    try:
+        # Read-only, so a snapshot removed meanwhile is not recreated as an empty database
+        snapshot_uri = Path(backup_path).resolve().as_uri() + "?mode=ro"
+        async with aiosqlite.connect(snapshot_uri, uri=True) as snapshot, aiosqlite.connect(":memory:") as scratch:
+            await snapshot.backup(scratch)
+
+            async with scratch.execute("PRAGMA integrity_check") as cursor:
+                integrity = (await cursor.fetchone())[0]
+
+            async with scratch.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            ) as cursor:
+                tables = [row[0] for row in await cursor.fetchall()]
+
+            for table in tables:
+                async with scratch.execute(f'SELECT COUNT(*) FROM "{table}"') as cursor:
+                    row_counts[table] = (await cursor.fetchone())[0]
+    except aiosqlite.DatabaseError as e:
+        return {
+            "ok": False,
+            "integrity": str(e),
+            "row_counts": row_counts
+        }
+
+    return {
+        "ok": integrity == "ok",
+        "integrity": integrity,
+        "row_counts": row_counts
+    }
+
+
+def prune_backups(retention: int, backup_dir: str = BACKUP_DIR) -> list[str]:
+    """Delete all but the newest `retention` snapshots. Returns removed paths."""
+    removed = list_backups(backup_dir)[max(retention, 0):]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+
+class BackupJob:
+    """
+    Background task that snapshots the trips database on an interval.
+
+    Each run creates a snapshot, optionally verifies it with a restore into
+    memory (unverifiable snapshots are deleted), then prunes old snapshots
+    down to `retention`.
+    """
+
+    def __init__(
+        self,
+        interval: float = 3600,
+        retention: int = 24,
+        verify: bool = True,
+        db_path: str = DB_PATH,
+        backup_dir: str = BACKUP_DIR,
+        pages_per_step: int = PAGES_PER_STEP,
+        step_sleep: float = STEP_SLEEP
+    ):
+        self.interval = interval
+        self.retention = retention
+        self.verify = verify
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.last_backup: str | None = None
+        self.last_error: str | None = None
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> str | None:
+        """Take, verify and prune one snapshot. Returns the snapshot path."""
+        if not os.path.exists(self.db_path):
+            return None
+
+        path = await create_backup(
+            self.db_path, self.backup_dir, self.pages_per_step, self.step_sleep
+        )
+
+        if self.verify:
+            try:
+                result = await verify_backup(path)
+            except BaseException:
+                # Cancelled (stop()) before the check finished: don't keep an unverified snapshot
+                os.remove(path)
+                raise
+            if not result["ok"]:
+                os.remove(path)
+                raise RuntimeError(f"Backup verification failed: {result['integrity']}")
+
+        prune_backups(self.retention, self.backup_dir)
+        self.last_backup = path
+        return path
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> asyncio.Task:
+        """Start the backup loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        """Cancel the backup loop and wait for it to finish."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+if __name__ == "__main__":
+    async def _main():
+        job = BackupJob()
+        path = await job.run_once()
+        if path is None:
+            print(f"No database at {DB_PATH}; nothing to back up.")
+        else:
+            print(f"✓ Backup written and verified: {path}")
+
+    asyncio.run(_main())
@@ -0,0 +1,182 @@
+"""
+Drive Time Tool for Marbella Travel Agent
+Driving distances and times between towns for itinerary logistics, answered
+from the offline road matrix (no network).
+"""
+
+from typing import Any
+from claude_agent_sdk import tool
+from .drive_times import Drive, road_network
+from .gazetteer import Place
+from .weather_tool import resolve_location
+
+# Most stops accepted in one call
+MAX_DRIVE_LOCATIONS = 10
+
+KM_PER_MILE = 1.609344
+
+
+def format_duration(minutes: float) -> str:
+    """Format a drive time rounded to 5 minutes: '25 min', '1 h 20 min'."""
+    rounded = max(5, int(5 * round(minutes / 5)))
+    hours, mins = divmod(rounded, 60)
+    if not hours:
+        return f"{mins} min"
+    return f"{hours} h {mins} min" if mins else f"{hours} h"
+
+
+def format_drive(drive: Drive) -> str:
+    """Format as '31 km (19 mi), ~30 min', starred if estimated."""
+    text = f"{drive.km:.0f} km ({drive.km / KM_PER_MILE:.0f} mi), ~{format_duration(drive.minutes)}"
+    return text + " *" if drive.estimated else text
+
+
+def _resolve_stop(location: Any) -> tuple[str, Place | None, float, float]:
+    """Turn a name or {name, latitude, longitude} into (label, place, latitude, longitude)."""
+    if isinstance(location, str):
+        location = {"name": location}
+    if not isinstance(location, dict):
+        raise ValueError(f"Error: Invalid location {location!r} (expected a place name or an object "
+                         f"with latitude and longitude).")
+
+    name = location.get("name") or location.get("location_name")
+    latitude, longitude = location.get("latitude"), location.get("longitude")
+    if latitude is not None and longitude is not None:
+        # List elements are not checked against the tool schema, so coerce them here
+        try:
+            latitude, longitude = float(latitude), float(longitude)
+        except (TypeError, ValueError):
+            raise ValueError(f"Error: Invalid latitude/longitude for {name or 'a location'} "
+                             f"(expected numbers).") from None
+        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+            raise ValueError(f"Error: Coordinates out of range for {name or 'a location'}: {latitude}, {longitude}")
+        return name or f"{latitude}, {longitude}", None, latitude, longitude
+    if not name:
+        raise ValueError("Error: Each location needs a name or latitude and longitude.")
+
+    place = resolve_location(name).place
+    return place.name, place, place.latitude, place.longitude
+
+
+def drive_between(origin: tuple[str, Place | None, float, float], destination: tuple[str, Place | None, float, float]) -> Drive | None:
+    """Drive between two resolved stops; None if a named place has no road connection (islands)."""
+    _, origin_place, lat1, lon1 = origin
+    _, destination_place, lat2, lon2 = destination
+    for place in (origin_place, destination_place):
+        if place is not None and not road_network.has_place(place):
+            return None
+    if origin_place is not None and destination_place is not None:
+        return road_network.between_places(origin_place, destination_place)
+    return road_network.between_points(lat1, lon1, lat2, lon2)
+
+
+@tool(
+    "get_drive_times",
+    "Get driving distance and time between places in Andalusia/Spain, answered offline. 'locations' is a "
+    "list of place names or {name, latitude, longitude} objects. mode 'route' (default) gives each leg "
+    "in order plus the total (repeat the start at the end for a round trip); mode 'matrix' compares "
+    "every pair.",
+    {
+        "locations": list,
+        "mode": str
+    }
+)
+async def get_drive_times(args: dict[str, Any]) -> dict[str, Any]:
+    """
+    Look up drive times between stops.
+
+    Args:
+        locations: Place names and/or {name, latitude, longitude} objects (2-10)
+        mode: 'route' for consecutive legs and a total, 'matrix' for all pairs (default: 'route')
+
+    Returns:
+        One line per leg with distance and drive time, or a time/distance table
+    """
+    locations = args.get("locations") or []
+    mode = (args.get("mode") or "route").lower()
+
+    if mode not in ["route", "matrix"]:
+        mode = "route"
+
+    if not isinstance(locations, list) or len(locations) < 2:
+        return {
+            "content": [{
+                "type": "text",
+                "text": "Error: locations must be a list of at least two place names or {name, latitude, longitude} objects."
+            }],
+            "is_error": True
+        }
+
+    if len(locations) > MAX_DRIVE_LOCATIONS:
+        return {
+            "content": [{
+                "type": "text",
+                "text": f"Error: At most {MAX_DRIVE_LOCATIONS} locations per call. Got: {len(locations)}"
+            }],
+            "is_error": True
+        }
+
+    try:
+        stops = [_resolve_stop(location) for location in locations]
+    except ValueError as e:
+        return {
+            "content": [{
+                "type": "text",
+                "text": str(e)
+            }],
+            "is_error": True
+        }
+
+    estimated = False
+    unreachable = False
+
+    if mode == "route":
+        response_text = "**Drive Times**\n\n"
+        total_km = total_minutes = 0.0
+        for origin, destination in zip(stops, stops[1:]):
+            drive = drive_between(origin, destination)
+            if drive is None:
+                unreachable = True
+                response_text += f"- {origin[0]} → {destination[0]}: no road connection\n"
+                continue
+            estimated = estimated or drive.estimated
+            total_km += drive.km
+            total_minutes += drive.minutes
+            response_text += f"- {origin[0]} → {destination[0]}: {format_drive(drive)}\n"
+        if len(stops) > 2:
+            response_text += (f"\n**Total driving:** {total_km:.0f} km ({total_km / KM_PER_MILE:.0f} mi), "
+                              f"~{format_duration(total_minutes)}\n")
+    else:
+        names = [stop[0] for stop in stops]
+        response_text = "**Drive Time Matrix**\n\n"
+        response_text += "| From \\ To | " + " | ".join(names) + " |\n"
+        response_text += "|---|" + "---|" * len(names) + "\n"
+        for origin in stops:
+            cells = []
+            for destination in stops:
+                if destination is origin:
+                    cells.append("–")
+                    continue
+                drive = drive_between(origin, destination)
+                if drive is None:
+                    unreachable = True
+                    cells.append("no road")
+                    continue
+                estimated = estimated or drive.estimated
+                cells.append(f"{format_duration(drive.minutes)}, {drive.km:.0f} km" + (" *" if drive.estimated else ""))
+            response_text += f"| {origin[0]} | " + " | ".join(cells) + " |\n"
+
+    response_text += "\n---\n"
+    response_text += ("Off-peak driving times along main roads; allow extra time for summer and rush-hour "
+                      "traffic on the A-7/AP-7 and for parking.")
+    if estimated:
+        response_text += "\n* Estimated from straight-line distance (location not on the built-in road network)."
+    if unreachable:
+        response_text += "\nNo road connection: the place is on an island (ferry or flight needed)."
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": response_text
+        }]
+    }
@@ -0,0 +1,199 @@
+"""
+Offline Drive Times
+Driving distance and time between Andalusian towns and major Spanish cities
+from a precomputed road matrix, with straight-line estimates for other points.
+"""
+
+import csv
+import heapq
+import math
+import os
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .gazetteer import Place, gazetteer
+from .weather_cache import haversine_km
+
+# Main-road links between neighbouring places (km and off-peak minutes)
+ROAD_LINKS = os.path.join(os.path.dirname(__file__), "data", "road_links.csv")
+
+# Straight-line estimates: road distance is this much longer than the crow flies...
+DETOUR_FACTOR = 1.3
+
+# ...driven at town speed, or at open-road speed beyond OPEN_ROAD_KM of road
+LOCAL_SPEED_KMH = 40
+OPEN_ROAD_SPEED_KMH = 75
+OPEN_ROAD_KM = 20
+
+# Points within this distance of a linked place are routed through the matrix (km)
+MAX_SNAP_KM = 25
+
+# Points this close to a linked place count as being at it (no estimated access leg)
+AT_PLACE_KM = 1.0
+
+# Computed point-to-point results kept (LRU)
+PAIR_CACHE_SIZE = 1024
+
+
+@dataclass
+class Drive:
+    """Distance and time for one drive; estimated if any part is not from road links."""
+    km: float
+    minutes: float
+    estimated: bool = False
+
+
+def estimate_drive(straight_km: float) -> Drive:
+    """Estimate a drive from the straight-line distance."""
+    km = straight_km * DETOUR_FACTOR
+    speed = LOCAL_SPEED_KMH if km < OPEN_ROAD_KM else OPEN_ROAD_SPEED_KMH
+    return Drive(km, km / speed * 60, True)
+
+
+def load_links(path: str = ROAD_LINKS) -> list[tuple[str, str, float, float]]:
+    """Read (from, to, km, minutes) links from the CSV (lines starting with '#' are comments)."""
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = csv.DictReader(line for line in f if not line.startswith("#"))
+        return [(row["from"], row["to"], float(row["km"]), float(row["minutes"])) for row in rows]
+
+
+class RoadNetwork:
+    """
+    All-pairs drive times over a small road graph, plus cached point estimates.
+
+    At construction the links are expanded into full N x N minute and km
+    matrices (one Dijkstra per place, fastest path; stored as flat
+    array('d')), so a drive between two linked places is two index lookups.
+
+    Other coordinates are snapped to the nearest linked place within
+    MAX_SNAP_KM and routed through the matrix, with straight-line estimates
+    for the legs to and from it. Coordinates far from the network, or closer
+    to each other than to their nearest places, get a straight-line estimate
+    only. These results are kept in an LRU of cache_size pairs.
+
+    Args:
+        path: Road links CSV (default: the bundled ROAD_LINKS)
+        places: Places the link names refer to (default: the gazetteer's)
+        cache_size: Point-to-point results to keep
+    """
+
+    def __init__(
+        self,
+        path: str = ROAD_LINKS,
+        places: list[Place] | None = None,
+        cache_size: int = PAIR_CACHE_SIZE
+    ):
+        by_name = {place.name: place for place in (gazetteer.places if places is None else places)}
+        links = load_links(path)
+
+        unknown = {name for link in links for name in link[:2] if name not in by_name}
+        if unknown:
+            raise ValueError(f"Road links refer to unknown places: {', '.join(sorted(unknown))}")
+
+        names = sorted({name for link in links for name in link[:2]})
+        self.nodes = [by_name[name] for name in names]
+        self._index = {name: i for i, name in enumerate(names)}
+
+        adjacency: list[list[tuple[int, float, float]]] = [[] for _ in names]
+        for origin, destination, km, minutes in links:
+            a, b = self._index[origin], self._index[destination]
+            adjacency[a].append((b, km, minutes))
+            adjacency[b].append((a, km, minutes))
+
+        size = len(names)
+        self._minutes = array("d", [math.inf]) * (size * size)
+        self._km = array("d", [math.inf]) * (size * size)
+        for source in range(size):
+            self._shortest_paths(source, adjacency)
+
+        self.cache_size = cache_size
+        self._pairs: OrderedDict[tuple[float, float, float, float], Drive] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _shortest_paths(self, source: int, adjacency: list[list[tuple[int, float, float]]]):
+        """Fill the matrix row for source with the fastest path to every node (Dijkstra)."""
+        row = source * len(self.nodes)
+        self._minutes[row + source] = 0.0
+        self._km[row + source] = 0.0
+        queue = [(0.0, 0.0, source)]
+        while queue:
+            minutes, km, node = heapq.heappop(queue)
+            if minutes > self._minutes[row + node]:
+                continue
+            for neighbour, link_km, link_minutes in adjacency[node]:
+                total = minutes + link_minutes
+                if total < self._minutes[row + neighbour]:
+                    self._minutes[row + neighbour] = total
+                    self._km[row + neighbour] = km + link_km
+                    heapq.heappush(queue, (total, km + link_km, neighbour))
+
+    def has_place(self, place: Place) -> bool:
+        """True if place is part of the road network."""
+        return place.name in self._index
+
+    def between_places(self, origin: Place, destination: Place) -> Drive | None:
+        """Matrix drive between two linked places (None if either is not linked or no route exists)."""
+        a, b = self._index.get(origin.name), self._index.get(destination.name)
+        if a is None or b is None:
+            return None
+        cell = a * len(self.nodes) + b
+        if math.isinf(self._minutes[cell]):
+            return None
+        return Drive(self._km[cell], self._minutes[cell])
+
+    def nearest_place(self, latitude: float, longitude: float) -> tuple[int, float]:
+        """(node index, straight-line km) of the linked place closest to the coordinates."""
+        return min(
+            ((i, haversine_km(latitude, longitude, node.latitude, node.longitude)) for i, node in enumerate(self.nodes)),
+            key=lambda item: item[1]
+        )
+
+    def between_points(self, lat1: float, lon1: float, lat2: float, lon2: float) -> Drive:
+        """Drive between arbitrary coordinates (cached)."""
+        key = (round(lat1, 4), round(lon1, 4), round(lat2, 4), round(lon2, 4))
+        drive = self._pairs.get(key)
+        if drive is not None:
+            self._pairs.move_to_end(key)
+            self.hits += 1
+            return drive
+
+        self.misses += 1
+        drive = self._point_drive(*key)
+        self._pairs[key] = drive
+        if len(self._pairs) > self.cache_size:
+            self._pairs.popitem(last=False)
+        return drive
+
+    def _point_drive(self, lat1: float, lon1: float, lat2: float, lon2: float) -> Drive:
+        straight = haversine_km(lat1, lon1, lat2, lon2)
+        a, to_a = self.nearest_place(lat1, lon1)
+        b, from_b = self.nearest_place(lat2, lon2)
+
+        cell = a * len(self.nodes) + b
+        if (a == b or to_a > MAX_SNAP_KM or from_b > MAX_SNAP_KM
+                or straight <= to_a + from_b or math.isinf(self._minutes[cell])):
+            return estimate_drive(straight)
+
+        km, minutes, estimated = self._km[cell], self._minutes[cell], False
+        for leg in (to_a, from_b):
+            if leg > AT_PLACE_KM:
+                access = estimate_drive(leg)
+                km, minutes, estimated = km + access.km, minutes + access.minutes, True
+        return Drive(km, minutes, estimated)
+
+    def stats(self) -> dict:
+        """Return network size and point cache counters."""
+        total = self.hits + self.misses
+        return {
+            "places": len(self.nodes),
+            "cached_pairs": len(self._pairs),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+# Shared network used by the tools
+road_network = RoadNetwork()
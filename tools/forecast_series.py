@@ -0,0 +1,206 @@
+"""
+Column-Oriented Forecast Timeseries
+Compact array-backed form of a met.no forecast with per-day aggregation in local time.
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta, timezone, tzinfo
+from typing import Any
+
+NAN = float("nan")
+
+# met.no symbol variants by sun position ("clearsky_night"); a day's symbol ignores them
+SYMBOL_VARIANTS = ("_day", "_night", "_polartwilight")
+
+
+@dataclass
+class DaySummary:
+    """Aggregated forecast for one local calendar day."""
+    date: date
+    temp_min: float
+    temp_max: float
+    temp_mean: float
+    precipitation: float
+    wind_max: float
+    symbol: str | None
+    samples: int
+
+
+class ForecastSeries:
+    """
+    A forecast timeseries stored as parallel columns.
+
+    Numeric columns are array('d') (NaN marks a missing value) and times are
+    UTC epoch seconds, so a day is a contiguous slice found by bisection and
+    its statistics come from C-level min/max/sum over that slice.
+
+    Precipitation and symbol come from next_1_hours where present, otherwise
+    next_6_hours, and cover the interval starting at each entry.
+    """
+
+    __slots__ = ("times", "temperature", "wind_speed", "wind_direction",
+                 "humidity", "precipitation", "symbols", "has_gaps")
+
+    def __init__(self):
+        self.times = array("d")
+        self.temperature = array("d")
+        self.wind_speed = array("d")
+        self.wind_direction = array("d")
+        self.humidity = array("d")
+        self.precipitation = array("d")
+        self.symbols: list[str | None] = []
+        self.has_gaps = False
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @classmethod
+    def from_timeseries(cls, timeseries: list[dict[str, Any]], horizon_hours: int | None = None) -> "ForecastSeries":
+        """Build the columns in one pass over met.no 'timeseries' entries."""
+        series = cls()
+        cutoff = None
+
+        for entry in timeseries:
+            when = datetime.fromisoformat(entry["time"].replace("Z", "+00:00")).timestamp()
+            if cutoff is None and horizon_hours is not None:
+                cutoff = when + horizon_hours * 3600
+            if cutoff is not None and when > cutoff:
+                break
+
+            entry_data = entry.get("data", {})
+            details = entry_data.get("instant", {}).get("details", {})
+            period = entry_data.get("next_1_hours") or entry_data.get("next_6_hours") or {}
+
+            temperature = details.get("air_temperature")
+            if temperature is None:
+                series.has_gaps = True
+
+            series.times.append(when)
+            series.temperature.append(NAN if temperature is None else temperature)
+            series.wind_speed.append(details.get("wind_speed", NAN))
+            series.wind_direction.append(details.get("wind_from_direction", NAN))
+            series.humidity.append(details.get("relative_humidity", NAN))
+            series.precipitation.append(period.get("details", {}).get("precipitation_amount", 0.0))
+            series.symbols.append(period.get("summary", {}).get("symbol_code"))
+
+        return series
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to plain lists (for the on-disk cache)."""
+        return {
+            "times": self.times.tolist(),
+            "temperature": self.temperature.tolist(),
+            "wind_speed": self.wind_speed.tolist(),
+            "wind_direction": self.wind_direction.tolist(),
+            "humidity": self.humidity.tolist(),
+            "precipitation": self.precipitation.tolist(),
+            "symbols": self.symbols
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ForecastSeries":
+        """Inverse of to_dict()."""
+        series = cls()
+        for column in ("times", "temperature", "wind_speed", "wind_direction", "humidity", "precipitation"):
+            getattr(series, column).extend(data[column])
+        series.symbols = list(data["symbols"])
+        series.has_gaps = any(math.isnan(value) for value in series.temperature)
+        return series
+
+    def current(self) -> dict[str, Any]:
+        """Conditions at the first timestep (None for missing values)."""
+        if not self.times:
+            return {}
+
+        def value(column: array) -> float | None:
+            return None if math.isnan(column[0]) else column[0]
+
+        return {
+            "time": datetime.fromtimestamp(self.times[0], timezone.utc),
+            "temperature": value(self.temperature),
+            "wind_speed": value(self.wind_speed),
+            "wind_direction": value(self.wind_direction),
+            "humidity": value(self.humidity),
+            "precipitation": self.precipitation[0],
+            "symbol": self.symbols[0]
+        }
+
+    def last_date(self, tz: tzinfo) -> date | None:
+        """Local date of the final timestep (the end of the forecast horizon)."""
+        if not self.times:
+            return None
+        return datetime.fromtimestamp(self.times[-1], tz).date()
+
+    def daily_summaries(
+        self,
+        tz: tzinfo = timezone.utc,
+        start: date | None = None,
+        end: date | None = None,
+        days: int | None = None
+    ) -> list[DaySummary]:
+        """
+        Aggregate the series per local calendar day.
+
+        Args:
+            tz: Timezone that defines day boundaries
+            start: First day (default: the local date of the first timestep)
+            end: Last day, inclusive (default: the last day with data)
+            days: Maximum number of days to return
+
+        Returns:
+            One DaySummary per day in range that has at least one timestep
+        """
+        if not self.times:
+            return []
+
+        start = start or datetime.fromtimestamp(self.times[0], tz).date()
+        end = min(end or self.last_date(tz), self.last_date(tz))
+
+        summaries = []
+        day = start
+        lower = bisect_left(self.times, _local_midnight(day, tz))
+        while day <= end and (days is None or len(summaries) < days):
+            next_day = day + timedelta(days=1)
+            upper = bisect_left(self.times, _local_midnight(next_day, tz), lower)
+
+            if upper > lower:
+                summaries.append(self._summarize(day, lower, upper))
+
+            day, lower = next_day, upper
+
+        return summaries
+
+    def _summarize(self, day: date, lower: int, upper: int) -> DaySummary:
+        temps = self.temperature[lower:upper]
+        if self.has_gaps:
+            temps = array("d", (value for value in temps if not math.isnan(value))) or array("d", [NAN])
+        winds = self.wind_speed[lower:upper]
+        symbols = Counter(_base_symbol(symbol) for symbol in self.symbols[lower:upper] if symbol)
+
+        return DaySummary(
+            date=day,
+            temp_min=min(temps),
+            temp_max=max(temps),
+            temp_mean=sum(temps) / len(temps),
+            precipitation=sum(self.precipitation[lower:upper]),
+            wind_max=max(winds),
+            symbol=symbols.most_common(1)[0][0] if symbols else None,
+            samples=upper - lower
+        )
+
+
+def _base_symbol(symbol: str) -> str:
+    """Symbol code without its day/night/polar-twilight variant suffix."""
+    for variant in SYMBOL_VARIANTS:
+        if symbol.endswith(variant):
+            return symbol[:-len(variant)]
+    return symbol
+
+
+def _local_midnight(day: date, tz: tzinfo) -> float:
+    """Epoch seconds of 00:00 local time on `day`."""
+    return datetime.combine(day, dt_time(0), tzinfo=tz).timestamp()
@@ -0,0 +1,247 @@
+"""
+Offline Gazetteer
+Resolves place names (Andalusian towns, villages and sights, major Spanish
+cities) to coordinates from a bundled dataset, without network access.
+"""
+
+import csv
+import os
+import unicodedata
+from dataclasses import dataclass
+from typing import Any
+
+# Places shipped with the package: one row per place
+PLACES_DATA = os.path.join(os.path.dirname(__file__), "data", "places.csv")
+
+# Words a name is not indexed from on their own ("de la Frontera" -> "frontera" only)
+STOPWORDS = {"de", "del", "la", "las", "el", "los", "y"}
+
+# Queries shorter than this must match exactly or by prefix; typo matching
+# allows one edit, or two from FUZZY_LONG_QUERY characters
+FUZZY_MIN_LENGTH = 4
+FUZZY_LONG_QUERY = 8
+
+# How a query matched a name, best first
+EXACT = "exact"  # the whole name or an alternate name
+WORD = "word"  # the name from a later word on ("Banús" for Puerto Banús)
+PREFIX = "prefix"  # the start of a name
+FUZZY = "fuzzy"  # within a small edit distance
+MATCH_RANK = {EXACT: 0, WORD: 1, PREFIX: 2, FUZZY: 3}
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse spaces: 'Vélez-Málaga' -> 'velez malaga'."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    letters = "".join(" " if not ch.isalnum() else ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(letters.split())
+
+
+@dataclass
+class Place:
+    """One gazetteer entry."""
+    name: str
+    alt_names: tuple[str, ...]
+    province: str
+    latitude: float
+    longitude: float
+    elevation: int  # meters
+    population: int  # 0 for areas and sights
+    kind: str  # city, town, village, area or sight
+
+    @property
+    def label(self) -> str:
+        return f"{self.name} ({self.province})" if self.province != self.name else self.name
+
+
+@dataclass
+class PlaceMatch:
+    """A search result: the place, how it matched and the edit distance for fuzzy matches."""
+    place: Place
+    match: str
+    distance: int = 0
+
+
+class _TrieNode:
+    __slots__ = ("children", "entries")
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        self.entries: list[tuple[int, bool]] = []
+
+
+class NameTrie:
+    """
+    Character trie over normalized names.
+
+    Each key maps to (place index, is_full_name) entries. Besides exact and
+    prefix lookups it supports bounded edit-distance search (Levenshtein plus
+    adjacent transpositions): one row per trie node, so shared prefixes are
+    computed once, only cells near the diagonal are filled, and a branch is
+    dropped as soon as every cell of its row exceeds the limit.
+    """
+
+    def __init__(self):
+        self.root = _TrieNode()
+        self.keys = 0
+
+    def insert(self, key: str, entry: tuple[int, bool]):
+        node = self.root
+        for ch in key:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = _TrieNode()
+            node = child
+        if not node.entries:
+            self.keys += 1
+        node.entries.append(entry)
+
+    def _node(self, key: str) -> _TrieNode | None:
+        node = self.root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node
+
+    def exact(self, key: str) -> list[tuple[int, bool]]:
+        """Entries stored under exactly key."""
+        node = self._node(key)
+        return list(node.entries) if node is not None else []
+
+    def prefix(self, key: str) -> list[tuple[int, bool]]:
+        """Entries of every key starting with key."""
+        node = self._node(key)
+        if node is None:
+            return []
+        entries = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            entries.extend(node.entries)
+            stack.extend(node.children.values())
+        return entries
+
+    def fuzzy(self, key: str, max_distance: int) -> list[tuple[int, tuple[int, bool]]]:
+        """(edit distance, entry) for every key within max_distance edits of key (adjacent swaps count once)."""
+        results = []
+        size = len(key)
+        limit = max_distance + 1
+        first = list(range(size + 1))
+        stack = [(child, ch, first, None, "") for ch, child in self.root.children.items()]
+        while stack:
+            node, ch, previous, before, previous_ch = stack.pop()
+            depth = previous[0] + 1
+            # Cells more than max_distance off the diagonal can't be within the limit
+            row = [depth] + [limit] * size
+            for i in range(max(1, depth - max_distance), min(size, depth + max_distance) + 1):
+                key_ch = key[i - 1]
+                cost = min(row[i - 1] + 1, previous[i] + 1, previous[i - 1] + (key_ch != ch))
+                if before is not None and i > 1 and key_ch == previous_ch and key[i - 2] == ch:
+                    cost = min(cost, before[i - 2] + 1)
+                row[i] = min(cost, limit)
+            if row[-1] <= max_distance:
+                results.extend((row[-1], entry) for entry in node.entries)
+            if min(row) <= max_distance:
+                stack.extend((child, next_ch, row, previous, ch) for next_ch, child in node.children.items())
+        return results
+
+
+def load_places(path: str = PLACES_DATA) -> list[Place]:
+    """Read the places CSV (lines starting with '#' are comments)."""
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = csv.DictReader(line for line in f if not line.startswith("#"))
+        return [
+            Place(
+                name=row["name"],
+                alt_names=tuple(name for name in row["alt_names"].split("|") if name),
+                province=row["province"],
+                latitude=float(row["latitude"]),
+                longitude=float(row["longitude"]),
+                elevation=int(row["elevation_m"]),
+                population=int(row["population"]),
+                kind=row["kind"]
+            )
+            for row in rows
+        ]
+
+
+class Gazetteer:
+    """
+    Accent-insensitive place search over a small bundled dataset.
+
+    Every name and alternate name is indexed in a NameTrie in normalized
+    form, together with the tails of multi-word names that start at a
+    non-stopword ("banus", "mijas" for "La Cala de Mijas"). A query is
+    matched exactly, then by prefix, and only if neither finds anything,
+    by edit distance. Results are ranked by match quality, then
+    population. Text after a comma ("Santiago, A Coruña") is used to narrow
+    the results by province when it names one.
+
+    Args:
+        path: Places CSV (default: the bundled PLACES_DATA)
+    """
+
+    def __init__(self, path: str = PLACES_DATA):
+        self.places = load_places(path)
+        self.trie = NameTrie()
+        for index, place in enumerate(self.places):
+            for name in (place.name, *place.alt_names):
+                key = normalize_name(name)
+                self.trie.insert(key, (index, True))
+                words = key.split()
+                for start in range(1, len(words)):
+                    if words[start] not in STOPWORDS:
+                        self.trie.insert(" ".join(words[start:]), (index, False))
+        self.lookups = 0
+
+    def search(self, query: str, limit: int = 5) -> list[PlaceMatch]:
+        """Best matches for query, best first."""
+        self.lookups += 1
+        name, _, qualifier = query.partition(",")
+        key = normalize_name(name)
+        if not key:
+            return []
+
+        # place index -> (rank, distance, match)
+        best: dict[int, tuple[int, int, str]] = {}
+
+        def offer(index: int, match: str, distance: int = 0):
+            candidate = (MATCH_RANK[match], distance, match)
+            if index not in best or candidate < best[index]:
+                best[index] = candidate
+
+        for index, full in self.trie.exact(key):
+            offer(index, EXACT if full else WORD)
+        for index, _ in self.trie.prefix(key):
+            offer(index, PREFIX)
+        if not best and len(key) >= FUZZY_MIN_LENGTH:
+            max_distance = 2 if len(key) >= FUZZY_LONG_QUERY else 1
+            for distance, (index, _) in self.trie.fuzzy(key, max_distance):
+                offer(index, FUZZY, distance)
+
+        province = normalize_name(qualifier)
+        if province:
+            narrowed = {index: rank for index, rank in best.items()
+                        if normalize_name(self.places[index].province) == province}
+            best = narrowed or best
+
+        ranked = sorted(best.items(), key=lambda item: (item[1][:2], -self.places[item[0]].population))
+        return [PlaceMatch(self.places[index], match, distance)
+                for index, (_, distance, match) in ranked[:limit]]
+
+    def resolve(self, query: str) -> PlaceMatch | None:
+        """The single best match for query, or None."""
+        matches = self.search(query, limit=1)
+        return matches[0] if matches else None
+
+    def stats(self) -> dict[str, Any]:
+        """Return dataset size and usage."""
+        return {
+            "places": len(self.places),
+            "names_indexed": self.trie.keys,
+            "lookups": self.lookups
+        }
+
+
+# Shared gazetteer used by the tools
+gazetteer = Gazetteer()
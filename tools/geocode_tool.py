@@ -0,0 +1,85 @@
+"""
+Geocoding Tool for Marbella Travel Agent
+Looks up coordinates for place names in the bundled gazetteer (no network).
+"""
+
+from typing import Any
+from claude_agent_sdk import tool
+from .gazetteer import EXACT, FUZZY, PREFIX, WORD, PlaceMatch, gazetteer
+
+# Most matches returned in one call
+MAX_GEOCODE_RESULTS = 10
+
+MATCH_NOTES = {
+    EXACT: "",
+    WORD: "name match",
+    PREFIX: "partial name",
+    FUZZY: "similar spelling"
+}
+
+
+def format_place_match(match: PlaceMatch) -> str:
+    """Format a match as 'Ronda (Málaga): 36.7423, -5.1671, 739 m (town)'."""
+    place = match.place
+    details = ", ".join(note for note in (place.kind, MATCH_NOTES[match.match]) if note)
+    return f"{place.label}: {place.latitude:.4f}, {place.longitude:.4f}, {place.elevation} m ({details})"
+
+
+@tool(
+    "geocode",
+    "Look up latitude, longitude and elevation for a place name: towns, villages and sights in Andalusia "
+    "and major Spanish cities. Accent-insensitive, accepts partial names and small typos; add the province "
+    "after a comma to disambiguate (e.g. 'Santiago, A Coruña'). Answered offline.",
+    {
+        "query": str,
+        "limit": int
+    }
+)
+async def geocode(args: dict[str, Any]) -> dict[str, Any]:
+    """
+    Search the offline gazetteer.
+
+    Args:
+        query: Place name (required)
+        limit: Maximum number of matches (default: 5, max: 10)
+
+    Returns:
+        Matching places, best first, with coordinates and elevation
+    """
+    query = (args.get("query") or "").strip()
+    limit = args.get("limit") or 5
+
+    if not query:
+        return {
+            "content": [{
+                "type": "text",
+                "text": "Error: query is required."
+            }],
+            "is_error": True
+        }
+
+    limit = max(1, min(int(limit), MAX_GEOCODE_RESULTS))
+    matches = gazetteer.search(query, limit)
+
+    if not matches:
+        return {
+            "content": [{
+                "type": "text",
+                "text": (f"No places found matching '{query}'. The offline gazetteer covers Andalusian towns "
+                         f"and sights and major Spanish cities; use known coordinates for other places.")
+            }],
+            "is_error": True
+        }
+
+    response_text = f"**Places matching '{query}'**\n\n"
+    for i, match in enumerate(matches, 1):
+        response_text += f"{i}. {format_place_match(match)}\n"
+    response_text += ("\nThe weather and climate tools also accept a known place as location_name "
+                      "without coordinates.")
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": response_text
+        }]
+    }
@@ -0,0 +1,191 @@
+"""
+Nearby POI Tool for Marbella Travel Agent
+Finds car parks, restaurants, sights, viewpoints and beaches near a place
+from the offline POI index (no network).
+"""
+
+from typing import Any
+from claude_agent_sdk import tool
+from .points_of_interest import poi_index
+from .route_optimizer import WALK_DETOUR_FACTOR, WALKING_SPEED_KMH
+from .walking_route_tool import format_distance, format_minutes
+from .weather_tool import resolve_location
+
+# Results returned without a radius_km or limit
+DEFAULT_POI_RESULTS = 5
+
+# Most results returned in one call when a limit is given
+MAX_POI_RESULTS = 25
+
+# Widest search radius accepted (km)
+MAX_POI_RADIUS_KM = 50
+
+# Walking times are only shown up to this distance (km)
+MAX_WALK_KM = 3
+
+
+def format_poi_distance(km: float) -> str:
+    """Format as '350 m, ~6 min walk', or '12.4 km' beyond walking distance."""
+    text = format_distance(km * 1000)
+    minutes = km * WALK_DETOUR_FACTOR / WALKING_SPEED_KMH * 60
+    if 0.5 <= minutes and km <= MAX_WALK_KM:
+        text += f", ~{format_minutes(minutes)} walk"
+    return text
+
+
+@tool(
+    "nearby_pois",
+    "Find car parks, restaurants, sights, viewpoints or beaches near a point, answered offline from a "
+    "curated list for Marbella, Ronda, Estepona, Mijas, Málaga, Nerja, Granada, Sevilla, Córdoba and other "
+    "popular towns. Give latitude/longitude, a town name or a listed POI name as location_name; "
+    "'category' filters (comma-separated). With radius_km, returns everything within the radius "
+    "(or the 'limit' nearest of those); otherwise the 'limit' nearest (default 5, max 25).",
+    {
+        "latitude": float,
+        "longitude": float,
+        "location_name": str,
+        "category": str,
+        "radius_km": float,
+        "limit": int
+    }
+)
+async def nearby_pois(args: dict[str, Any]) -> dict[str, Any]:
+    """
+    Search the offline POI index.
+
+    Args:
+        latitude: Latitude of the search centre
+        longitude: Longitude of the search centre
+        location_name: Town or POI name, used when coordinates are not given
+        category: parking, restaurant, sight, viewpoint or beach; comma-separated for several (default: all)
+        radius_km: Search radius (optional, max 50)
+        limit: Maximum number of results (default: 5, or all within radius_km; max 25)
+
+    Returns:
+        Matching POIs, nearest first, with distance, walking time and notes
+    """
+    latitude = args.get("latitude")
+    longitude = args.get("longitude")
+    location_name = args.get("location_name")
+    radius_km = args.get("radius_km")
+    limit = args.get("limit")
+
+    if latitude is None or longitude is None:
+        if not location_name:
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": "Error: latitude and longitude, or location_name, are required."
+                }],
+                "is_error": True
+            }
+        poi = poi_index.find(location_name)
+        if poi is not None:
+            latitude, longitude, location_name = poi.latitude, poi.longitude, poi.name
+        else:
+            try:
+                place = resolve_location(location_name).place
+            except ValueError as e:
+                return {
+                    "content": [{
+                        "type": "text",
+                        "text": str(e)
+                    }],
+                    "is_error": True
+                }
+            latitude, longitude, location_name = place.latitude, place.longitude, place.name
+
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+        return {
+            "content": [{
+                "type": "text",
+                "text": f"Error: Coordinates out of range: {latitude}, {longitude}"
+            }],
+            "is_error": True
+        }
+
+    try:
+        radius_km = None if radius_km is None else float(radius_km)
+    except (TypeError, ValueError):
+        return {
+            "content": [{
+                "type": "text",
+                "text": f"Error: radius_km must be a number. Got: {radius_km}"
+            }],
+            "is_error": True
+        }
+
+    try:
+        limit = None if limit is None else int(limit)
+    except (TypeError, ValueError):
+        return {
+            "content": [{
+                "type": "text",
+                "text": f"Error: limit must be a whole number. Got: {limit}"
+            }],
+            "is_error": True
+        }
+
+    if radius_km is not None and not (0 < radius_km <= MAX_POI_RADIUS_KM):
+        return {
+            "content": [{
+                "type": "text",
+                "text": f"Error: radius_km must be between 0 and {MAX_POI_RADIUS_KM}. Got: {radius_km}"
+            }],
+            "is_error": True
+        }
+
+    categories = None
+    if args.get("category"):
+        categories = []
+        for name in str(args["category"]).split(","):
+            category = poi_index.category(name)
+            if category is None:
+                return {
+                    "content": [{
+                        "type": "text",
+                        "text": (f"Error: Unknown category '{name.strip()}'. "
+                                 f"Use one of: {', '.join(poi_index.categories)}")
+                    }],
+                    "is_error": True
+                }
+            if category not in categories:
+                categories.append(category)
+
+    if limit is not None:
+        limit = max(1, min(limit, MAX_POI_RESULTS))
+    elif radius_km is None:
+        limit = DEFAULT_POI_RESULTS
+    results = poi_index.nearby(latitude, longitude, categories, radius_km, limit)
+
+    what = " and ".join(c if c == "parking" else f"{c}s" for c in categories) if categories else "points of interest"
+    where = location_name or f"{latitude:.4f}, {longitude:.4f}"
+    if not results:
+        within = f"within {radius_km:g} km of" if radius_km else "near"
+        return {
+            "content": [{
+                "type": "text",
+                "text": (f"No {what} found {within} {where} in the offline POI list, which covers the "
+                         f"main sights, car parks and restaurants of popular towns. Use WebSearch for other places.")
+            }]
+        }
+
+    response_text = f"**Nearby {what}: {where}**"
+    if radius_km:
+        response_text += f" (within {radius_km:g} km)"
+    response_text += "\n\n"
+    for i, (km, poi) in enumerate(results, 1):
+        response_text += f"{i}. {poi.name} ({poi.category}, {poi.town}): {format_poi_distance(km)}\n"
+        if poi.notes:
+            response_text += f"   {poi.notes}\n"
+
+    response_text += "\n---\n"
+    response_text += ("Distances are straight-line from the search point. Opening hours, prices and parking "
+                      "availability are not included; check before recommending.")
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": response_text
+        }]
+    }
@@ -0,0 +1,268 @@
+"""
+Offline Points of Interest
+Car parks, restaurants, sights, viewpoints and beaches from a bundled (or
+user-supplied) dataset, with a KD-tree for nearby and nearest queries.
+"""
+
+import csv
+import heapq
+import math
+import os
+from dataclasses import dataclass
+from typing import Any
+
+from .gazetteer import normalize_name
+from .weather_cache import EARTH_RADIUS_KM, haversine_km
+
+# POIs shipped with the package; set POI_DATA to a CSV in the same format to use your own
+POI_DATA = os.getenv("POI_DATA", os.path.join(os.path.dirname(__file__), "data", "pois.csv"))
+
+# Category names as written in the dataset, and other words accepted for them
+CATEGORY_ALIASES = {
+    "car park": "parking",
+    "carpark": "parking",
+    "garage": "parking",
+    "food": "restaurant",
+    "dining": "restaurant",
+    "tapas": "restaurant",
+    "bar": "restaurant",
+    "attraction": "sight",
+    "sightseeing": "sight",
+    "monument": "sight",
+    "museum": "sight",
+    "mirador": "viewpoint",
+    "view": "viewpoint",
+    "playa": "beach"
+}
+
+
+@dataclass
+class PointOfInterest:
+    """One POI from the dataset."""
+    name: str
+    category: str
+    town: str
+    latitude: float
+    longitude: float
+    notes: str = ""
+
+
+def load_pois(path: str = POI_DATA) -> list[PointOfInterest]:
+    """Read POIs from the CSV (lines starting with '#' are comments)."""
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = csv.DictReader(line for line in f if not line.startswith("#"))
+        return [
+            PointOfInterest(
+                name=row["name"].strip(),
+                category=row["category"].strip().lower(),
+                town=row["town"].strip(),
+                latitude=float(row["latitude"]),
+                longitude=float(row["longitude"]),
+                notes=(row.get("notes") or "").strip()
+            )
+            for row in rows
+        ]
+
+
+def to_unit_vector(latitude: float, longitude: float) -> tuple[float, float, float]:
+    """Point on the unit sphere; straight-line (chord) distance between two grows with great-circle distance."""
+    phi, lam = math.radians(latitude), math.radians(longitude)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+def km_to_chord(km: float) -> float:
+    """Chord length on the unit sphere for a great-circle distance."""
+    return 2 * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+def _squared(a: tuple[float, float, float], b: tuple[float, float, float]) -> float:
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+class KDTree:
+    """
+    Static 3-d tree over unit-sphere vectors.
+
+    Built once by median splits on the axis of widest spread and stored as
+    an implicit balanced tree: the node for a slice [lo, hi) of the point
+    order is its middle element, so no node objects are allocated. Radius
+    and k-nearest searches skip a subtree when the splitting plane is
+    farther away than the current bound.
+
+    Args:
+        points: Unit vectors, one per item
+        items: Item ids, parallel to points (returned by the queries)
+    """
+
+    def __init__(self, points: list[tuple[float, float, float]], items: list[int]):
+        self._points = list(points)
+        self._items = list(items)
+        self._axes = [0] * len(self._points)
+        self._build(0, len(self._points))
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _build(self, lo: int, hi: int):
+        if hi - lo <= 1:
+            return
+        axis = max(range(3), key=lambda a: max(p[a] for p in self._points[lo:hi]) - min(p[a] for p in self._points[lo:hi]))
+        ranked = sorted(zip(self._points[lo:hi], self._items[lo:hi]), key=lambda pair: pair[0][axis])
+        self._points[lo:hi] = [point for point, _ in ranked]
+        self._items[lo:hi] = [item for _, item in ranked]
+        mid = (lo + hi) // 2
+        self._axes[mid] = axis
+        self._build(lo, mid)
+        self._build(mid + 1, hi)
+
+    def within(self, target: tuple[float, float, float], chord: float) -> list[tuple[float, int]]:
+        """(squared chord, item) for every point within chord of target, unordered."""
+        found: list[tuple[float, int]] = []
+        limit = chord * chord
+        stack = [(0, len(self._points))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            point = self._points[mid]
+            squared = _squared(point, target)
+            if squared <= limit:
+                found.append((squared, self._items[mid]))
+            offset = target[self._axes[mid]] - point[self._axes[mid]]
+            if offset <= chord:
+                stack.append((lo, mid))
+            if offset >= -chord:
+                stack.append((mid + 1, hi))
+        return found
+
+    def nearest(self, target: tuple[float, float, float], k: int, chord: float = math.inf) -> list[tuple[float, int]]:
+        """Up to k (squared chord, item) pairs closest to target (within chord), nearest first."""
+        heap: list[tuple[float, int]] = []  # max-heap of the best k via negated distances
+        limit = chord * chord
+
+        def bound() -> float:
+            return -heap[0][0] if len(heap) == k else limit
+
+        def visit(lo: int, hi: int):
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            point = self._points[mid]
+            squared = _squared(point, target)
+            if squared <= bound():
+                if len(heap) == k:
+                    heapq.heapreplace(heap, (-squared, self._items[mid]))
+                else:
+                    heapq.heappush(heap, (-squared, self._items[mid]))
+            offset = target[self._axes[mid]] - point[self._axes[mid]]
+            near, far = ((lo, mid), (mid + 1, hi)) if offset < 0 else ((mid + 1, hi), (lo, mid))
+            visit(*near)
+            if offset * offset <= bound():
+                visit(*far)
+
+        if k > 0:
+            visit(0, len(self._points))
+        return sorted((-negated, item) for negated, item in heap)
+
+
+class POIIndex:
+    """
+    Points of interest with one KD-tree per category.
+
+    A query with several categories (or none, meaning all) searches each
+    tree and merges the results; distances are then measured exactly with
+    haversine. With a few hundred POIs a query takes tens of microseconds.
+
+    Args:
+        path: POI CSV (default: POI_DATA, the bundled file unless overridden)
+    """
+
+    def __init__(self, path: str = POI_DATA):
+        self.path = path
+        self.pois = load_pois(path)
+        by_category: dict[str, list[int]] = {}
+        for index, poi in enumerate(self.pois):
+            by_category.setdefault(poi.category, []).append(index)
+        self.trees = {
+            category: KDTree([to_unit_vector(self.pois[i].latitude, self.pois[i].longitude) for i in indexes], indexes)
+            for category, indexes in by_category.items()
+        }
+        self._names: dict[str, list[int]] = {}
+        for index, poi in enumerate(self.pois):
+            self._names.setdefault(normalize_name(poi.name), []).append(index)
+        self.queries = 0
+
+    @property
+    def categories(self) -> list[str]:
+        return sorted(self.trees)
+
+    def category(self, name: str) -> str | None:
+        """Dataset category for a name, plural or alias ('car parks' -> 'parking'); None if unknown."""
+        key = " ".join(name.lower().split())
+        for candidate in (key, key[:-1] if key.endswith("s") else key):
+            candidate = CATEGORY_ALIASES.get(candidate, candidate)
+            if candidate in self.trees:
+                return candidate
+        return None
+
+    def nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        categories: list[str] | None = None,
+        radius_km: float | None = None,
+        limit: int | None = None
+    ) -> list[tuple[float, PointOfInterest]]:
+        """
+        POIs near a point, nearest first, as (km, poi).
+
+        Args:
+            latitude: Query latitude
+            longitude: Query longitude
+            categories: Dataset categories to include (default: all)
+            radius_km: Only POIs within this distance (default: no limit)
+            limit: At most this many results (default: no limit; required without radius_km)
+
+        Returns:
+            (great-circle km, POI) pairs sorted by distance
+        """
+        self.queries += 1
+        target = to_unit_vector(latitude, longitude)
+        chord = km_to_chord(radius_km) if radius_km is not None else math.inf
+        trees = [self.trees[c] for c in (categories or self.categories) if c in self.trees]
+
+        candidates: list[tuple[float, int]] = []
+        for tree in trees:
+            if limit is None:
+                candidates.extend(tree.within(target, chord))
+            else:
+                candidates.extend(tree.nearest(target, limit, chord))
+        candidates.sort()
+        if limit is not None:
+            candidates = candidates[:limit]
+
+        return [
+            (haversine_km(latitude, longitude, self.pois[i].latitude, self.pois[i].longitude), self.pois[i])
+            for _, i in candidates
+        ]
+
+    def find(self, query: str) -> PointOfInterest | None:
+        """POI by exact name, ignoring case and accents; 'name, town' picks between namesakes."""
+        name, _, town = query.partition(",")
+        matches = [self.pois[i] for i in self._names.get(normalize_name(name), [])]
+        if town.strip():
+            matches = [poi for poi in matches if normalize_name(poi.town) == normalize_name(town)] or matches
+        return matches[0] if matches else None
+
+    def stats(self) -> dict[str, Any]:
+        """Return dataset size per category and usage."""
+        return {
+            "pois": len(self.pois),
+            "categories": {category: len(tree) for category, tree in sorted(self.trees.items())},
+            "queries": self.queries
+        }
+
+
+# Shared POI index used by the tools
+poi_index = POIIndex()
@@ -0,0 +1,78 @@
+"""
+Rate Limiting and Backoff Helpers
+Client-side request budget and retry delays for upstream APIs (met.no).
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` requests per second with bursts up to `capacity`.
+
+    Callers that find the bucket empty wait their turn (in arrival order)
+    instead of failing, so excess load turns into queueing delay.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.waits = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Take one token, sleeping until one is available."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+        # The lock keeps waiters in FIFO order while one sleeps for a token
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                self.waits += 1
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)  # '-0000' zone: UTC per RFC 5322
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, retry_after: str | None = None, base: float = 0.5, cap: float = 8.0) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0-based).
+
+    Honors Retry-After when the server sends one; otherwise uses exponential
+    backoff with full jitter, capped at `cap`.
+    """
+    delay = parse_retry_after(retry_after)
+    if delay is not None:
+        return delay
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -0,0 +1,201 @@
+"""
+Due-Date Reminder Scheduler
+Background asyncio service that emits reminders as task due dates approach.
+"""
+
+import asyncio
+import heapq
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+import aiosqlite
+
+from . import task_manager_tool
+from .task_manager_tool import init_database
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReminderEvent:
+    """A reminder that a pending task is coming due."""
+    task_id: int
+    trip_id: str
+    description: str
+    due_date: str
+    remind_at: datetime
+
+
+def print_sink(event: ReminderEvent):
+    """Default sink: print the reminder to stdout."""
+    print(f"⏰ Reminder: task #{event.task_id} '{event.description}' "
+          f"({event.trip_id}) is due {event.due_date}")
+
+
+def parse_due_date(due_date: str | None) -> datetime | None:
+    """Parse an ISO due date (YYYY-MM-DD or full timestamp); None if unusable."""
+    if not due_date:
+        return None
+    try:
+        return datetime.fromisoformat(due_date)
+    except ValueError:
+        return None
+
+
+class ReminderScheduler:
+    """
+    Min-heap of pending task deadlines with a single sleeping timer.
+
+    The heap is loaded once from the database and afterwards kept current
+    from task mutations (via task_manager_tool.task_listeners), so the
+    database is never polled. Superseded heap entries are skipped lazily
+    when they reach the top. Between deadlines the service just awaits an
+    event with a timeout, so it uses no CPU however many tasks are queued.
+
+    Each task is reminded once per due date: edits that keep the due date
+    leave its reminder where it is, and a reminder that has fired is only
+    scheduled again if the due date changes.
+
+    Args:
+        sink: Callable receiving each ReminderEvent (may be async)
+        lead_time: How long before the due date the reminder fires
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[ReminderEvent], Any] = print_sink,
+        lead_time: timedelta = timedelta(days=1)
+    ):
+        self.sink = sink
+        self.lead_time = lead_time
+        # Heap of (remind_at timestamp, task_id, version)
+        self._heap: list[tuple[float, int, int]] = []
+        # task_id -> (version, ReminderEvent) for the live reminder of each task
+        self._pending: dict[int, tuple[int, ReminderEvent]] = {}
+        # task_id -> due_date of the reminder already emitted for each task
+        self._fired: dict[int, str] = {}
+        self._version = 0
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _make_event(self, task_id, trip_id, description, due_date) -> ReminderEvent | None:
+        due = parse_due_date(due_date)
+        if due is None:
+            return None
+        return ReminderEvent(task_id, trip_id, description, due_date, due - self.lead_time)
+
+    async def load(self, db_path: str | None = None):
+        """Load every pending task with a due date into the heap."""
+        db_path = db_path or task_manager_tool.DB_PATH
+        if db_path == task_manager_tool.DB_PATH:
+            await init_database()
+
+        async with aiosqlite.connect(db_path) as db:
+            async with db.execute(
+                "SELECT task_id, trip_id, description, due_date FROM tasks "
+                "WHERE status = 'pending' AND due_date IS NOT NULL AND due_date != ''"
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+        self._heap.clear()
+        self._pending.clear()
+        for task_id, trip_id, description, due_date in rows:
+            event = self._make_event(task_id, trip_id, description, due_date)
+            if event is not None and self._fired.get(task_id) != due_date:
+                self._version += 1
+                self._pending[task_id] = (self._version, event)
+                self._heap.append((event.remind_at.timestamp(), task_id, self._version))
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def on_task_changed(self, task_id: int, trip_id: str, description: str, due_date: str | None, status: str):
+        """Task listener: reschedule or drop the reminder for a mutated task."""
+        event = self._make_event(task_id, trip_id, description, due_date) if status == "pending" else None
+
+        if event is None:
+            if status != "pending":
+                self._fired.pop(task_id, None)
+            if self._pending.pop(task_id, None) is not None:
+                self._wakeup.set()
+            return
+
+        if self._fired.get(task_id) == due_date:
+            return  # already reminded for this due date
+
+        live = self._pending.get(task_id)
+        if live is not None and live[1].due_date == due_date:
+            # Same deadline: keep the heap entry, refresh what the reminder says
+            self._pending[task_id] = (live[0], event)
+            return
+
+        self._version += 1
+        self._pending[task_id] = (self._version, event)
+        heapq.heappush(self._heap, (event.remind_at.timestamp(), task_id, self._version))
+        self._wakeup.set()
+
+    def _pop_due(self, now: float) -> tuple[list[ReminderEvent], float | None]:
+        """Pop all reminders due by `now`; return them and seconds until the next one."""
+        due = []
+        while self._heap:
+            remind_at, task_id, version = self._heap[0]
+            live = self._pending.get(task_id)
+            if live is None or live[0] != version:
+                heapq.heappop(self._heap)  # superseded or dropped
+                continue
+            if remind_at > now:
+                return due, remind_at - now
+            heapq.heappop(self._heap)
+            del self._pending[task_id]
+            self._fired[task_id] = live[1].due_date
+            due.append(live[1])
+        return due, None
+
+    async def _emit(self, event: ReminderEvent):
+        result = self.sink(event)
+        if inspect.isawaitable(result):
+            await result
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            due, delay = self._pop_due(time.time())
+            for event in due:
+                try:
+                    await self._emit(event)
+                except Exception:
+                    # A failing sink must not stop the scheduler
+                    logger.exception("Reminder sink %r failed for task #%s", self.sink, event.task_id)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self, load: bool = True) -> asyncio.Task:
+        """Load due dates, subscribe to task mutations and start the timer."""
+        if load:
+            await self.load()
+        if self.on_task_changed not in task_manager_tool.task_listeners:
+            task_manager_tool.task_listeners.append(self.on_task_changed)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        """Unsubscribe from task mutations and stop the timer."""
+        if self.on_task_changed in task_manager_tool.task_listeners:
+            task_manager_tool.task_listeners.remove(self.on_task_changed)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
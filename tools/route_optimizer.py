@@ -0,0 +1,210 @@
+"""
+Walking Route Optimizer
+Orders points of interest into an efficient walking tour (nearest neighbour
+plus 2-opt) and trims it to fit a time budget.
+"""
+
+from dataclasses import dataclass
+
+from .weather_cache import haversine_km
+
+# Average sightseeing pace, including crossings and slopes (km/h)
+WALKING_SPEED_KMH = 4.5
+
+# Street distance relative to the straight line in old town centres
+WALK_DETOUR_FACTOR = 1.25
+
+# Upper bound on 2-opt improvement passes over one route
+MAX_TWO_OPT_PASSES = 50
+
+
+@dataclass
+class Stop:
+    """A place on a walking route; dwell_minutes is time spent there."""
+    name: str
+    latitude: float
+    longitude: float
+    dwell_minutes: float = 0.0
+    must_see: bool = False
+
+
+@dataclass
+class Leg:
+    """Walk between two consecutive stops."""
+    origin: Stop
+    destination: Stop
+    meters: float
+    minutes: float
+
+
+@dataclass
+class WalkingRoute:
+    """An ordered walking route; start/end are included in stops when given."""
+    stops: list[Stop]
+    legs: list[Leg]
+    skipped: list[Stop]
+
+    @property
+    def meters(self) -> float:
+        return sum(leg.meters for leg in self.legs)
+
+    @property
+    def walking_minutes(self) -> float:
+        return sum(leg.minutes for leg in self.legs)
+
+    @property
+    def dwell_minutes(self) -> float:
+        return sum(stop.dwell_minutes for stop in self.stops)
+
+    @property
+    def total_minutes(self) -> float:
+        return self.walking_minutes + self.dwell_minutes
+
+
+def walking_meters(a: Stop, b: Stop) -> float:
+    """Estimated walking distance between two stops."""
+    return haversine_km(a.latitude, a.longitude, b.latitude, b.longitude) * WALK_DETOUR_FACTOR * 1000
+
+
+def _path_cost(order: list[int], minutes: list[list[float]], closed: bool) -> float:
+    cost = sum(minutes[a][b] for a, b in zip(order, order[1:]))
+    if closed and len(order) > 1:
+        cost += minutes[order[-1]][order[0]]
+    return cost
+
+
+def _nearest_neighbour(first: int, nodes: list[int], minutes: list[list[float]]) -> list[int]:
+    order = [first]
+    remaining = [node for node in nodes if node != first]
+    while remaining:
+        last = order[-1]
+        nearest = min(remaining, key=lambda node: minutes[last][node])
+        order.append(nearest)
+        remaining.remove(nearest)
+    return order
+
+
+def _two_opt(order: list[int], minutes: list[list[float]], closed: bool) -> list[int]:
+    """Reverse segments while that shortens the route; order[0] stays first."""
+    order = list(order)
+    size = len(order)
+    for _ in range(MAX_TWO_OPT_PASSES):
+        improved = False
+        for i in range(1, size - 1):
+            for j in range(i + 1, size):
+                before = minutes[order[i - 1]][order[i]]
+                after = minutes[order[i - 1]][order[j]]
+                if j + 1 < size:
+                    before += minutes[order[j]][order[j + 1]]
+                    after += minutes[order[i]][order[j + 1]]
+                elif closed:
+                    before += minutes[order[j]][order[0]]
+                    after += minutes[order[i]][order[0]]
+                if after < before - 1e-9:
+                    order[i:j + 1] = reversed(order[i:j + 1])
+                    improved = True
+        if not improved:
+            break
+    return order
+
+
+def _best_order(nodes: list[int], minutes: list[list[float]], first: int | None, closed: bool) -> list[int]:
+    """Shortest order found from the fixed first node, or from every candidate first node."""
+    candidates = [first] if first is not None else (nodes[:1] if closed else nodes)
+    best = None
+    for candidate in candidates:
+        order = _two_opt(_nearest_neighbour(candidate, nodes, minutes), minutes, closed)
+        if best is None or _path_cost(order, minutes, closed) < _path_cost(best, minutes, closed):
+            best = order
+    return best or []
+
+
+def plan_route(
+    pois: list[Stop],
+    start: Stop | None = None,
+    return_to_start: bool = False,
+    budget_minutes: float | None = None,
+    speed_kmh: float = WALKING_SPEED_KMH
+) -> WalkingRoute:
+    """
+    Order pois into a short walking route.
+
+    The visiting order is built by nearest neighbour and improved with 2-opt,
+    from start when given, otherwise from whichever POI gives the shortest
+    route. With return_to_start the route is a loop.
+
+    When the route (walking plus dwell time) exceeds budget_minutes, POIs
+    are dropped one at a time (never must_see ones) and the route is
+    re-optimized, until it fits or only must-see POIs are left. Each step
+    drops the POI with the smallest saving that makes the route fit, or, if
+    no single POI does, the one with the largest saving. Skipped POIs are
+    then put back, shortest dwell first, wherever the route still fits, so
+    that as many POIs as possible are visited.
+
+    Args:
+        pois: Places to visit
+        start: Fixed starting point, e.g. a car park (not counted as a visit)
+        return_to_start: End where the route started
+        budget_minutes: Time available for walking and visits
+        speed_kmh: Walking speed
+
+    Returns:
+        WalkingRoute with stops in order, legs between them and skipped POIs
+    """
+    points = ([start] if start is not None else []) + list(pois)
+    meters = [[walking_meters(a, b) for b in points] for a in points]
+    minutes = [[distance / 1000 / speed_kmh * 60 for distance in row] for row in meters]
+    dwell = [point.dwell_minutes for point in points]
+
+    first = 0 if start is not None else None
+    closed = return_to_start
+    visiting = list(range(len(points)))
+    skipped: list[int] = []
+
+    def route_minutes(order: list[int]) -> float:
+        return _path_cost(order, minutes, closed) + sum(dwell[node] for node in order)
+
+    order = _best_order(visiting, minutes, first, closed)
+    while budget_minutes is not None and route_minutes(order) > budget_minutes:
+        droppable = [k for k, node in enumerate(order) if node != first and not points[node].must_see]
+        if not droppable:
+            break
+
+        def saving(k: int) -> float:
+            node = order[k]
+            previous = order[k - 1] if k > 0 else None
+            following = order[k + 1] if k + 1 < len(order) else (order[0] if closed else None)
+            saved = dwell[node]
+            if previous is not None:
+                saved += minutes[previous][node]
+            if following is not None:
+                saved += minutes[node][following]
+            if previous is not None and following is not None:
+                saved -= minutes[previous][following]
+            return saved
+
+        excess = route_minutes(order) - budget_minutes
+        savings = {k: saving(k) for k in droppable}
+        fitting = [k for k in droppable if savings[k] >= excess]
+        k = min(fitting, key=savings.get) if fitting else max(droppable, key=savings.get)
+        skipped.append(order[k])
+        visiting.remove(order[k])
+        order = _best_order(visiting, minutes, first, closed)
+
+    # A later drop may have freed enough time for an earlier one
+    for node in sorted(skipped, key=lambda node: dwell[node]):
+        trial = _best_order(visiting + [node], minutes, first, closed)
+        if route_minutes(trial) <= budget_minutes:
+            skipped.remove(node)
+            visiting.append(node)
+            order = trial
+
+    if closed and order:
+        order = order + [order[0]]
+
+    stops = [points[node] for node in order]
+    if closed and start is None and stops:
+        # The loop passes its first POI twice; count the visit once
+        stops[-1] = Stop(stops[-1].name, stops[-1].latitude, stops[-1].longitude)
+    legs = [Leg(points[a], points[b], meters[a][b], minutes[a][b]) for a, b in zip(order, order[1:])]
+    return WalkingRoute(stops, legs, [points[node] for node in skipped])
@@ -4,18 +4,215 @@ SQLite-based task management with trip organization.
 """
 
 import aiosqlite
+import asyncio
+import copy
+import hashlib
+import json
+import logging
 import os
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
 from claude_agent_sdk import tool
 
+logger = logging.getLogger(__name__)
+
 # Database file path
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "trips_database.db")
 
 
+class ReadResultCache:
+    """
+    Memo of read-only tool results.
+
+    Entries are keyed on tool name and arguments and indexed by the trip they
+    describe, so a write only drops the results for the trip it touched.
+    Results that span every trip (list_trips) are stored under trip None and
+    are dropped by any write.
+
+    Every invalidation also bumps a per-trip generation. A read captures
+    generation() before querying and passes it to put(), which discards the
+    result if a write to that trip happened in between (the result may
+    predate the write). Results are copied in and out, so callers can
+    modify what they get.
+
+    One instance (read_cache) is shared by every agent session in the
+    process, since they all use the same database; reset_session() clears
+    it for all of them.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple, dict[str, Any]] = {}
+        self._keys_by_trip: dict[str | None, set[tuple]] = {}
+        self._generations: dict[str | None, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(tool_name: str, args: dict[str, Any]) -> tuple:
+        """Build a hashable cache key from a tool name and its arguments."""
+        return (tool_name, tuple(sorted((k, repr(v)) for k, v in args.items())))
+
+    def get(self, key: tuple) -> dict[str, Any] | None:
+        """Return the cached result for key, counting the hit or miss."""
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(result)
+
+    def generation(self, trip_id: str | None) -> tuple[int, int]:
+        """Token identifying the current state of a trip's cached reads (pass it to put())."""
+        return self._epoch, self._generations.get(trip_id, 0)
+
+    def put(self, key: tuple, trip_id: str | None, result: dict[str, Any], generation: tuple[int, int] | None = None):
+        """
+        Store a successful read result under the trip it describes.
+
+        If generation (from generation(), taken before the read) is no longer
+        current, the trip was written to during the read and nothing is stored.
+        """
+        if result.get("is_error"):
+            return
+        if generation is not None and generation != self.generation(trip_id):
+            return
+        self._entries[key] = copy.deepcopy(result)
+        self._keys_by_trip.setdefault(trip_id, set()).add(key)
+
+    def invalidate_trip(self, trip_id: str | None):
+        """Drop cached reads for a trip plus the cross-trip summaries."""
+        for owner in {trip_id, None}:
+            self._generations[owner] = self._generations.get(owner, 0) + 1
+            for key in self._keys_by_trip.pop(owner, ()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Forget all cached results and reset the counters."""
+        self._entries.clear()
+        self._keys_by_trip.clear()
+        self._epoch += 1
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return entry count, hits, misses and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+# Shared by list_trips / list_tasks; write tools invalidate it per trip
+read_cache = ReadResultCache()
+
+# Most recent idempotency keys kept in the database
+IDEMPOTENCY_KEY_LIMIT = 1000
+
+
+class _KeyLock:
+    """Lock for one idempotency key and the number of callers holding or awaiting it."""
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+# Serializes concurrent calls that share an idempotency key in this process;
+# an entry is dropped once no caller holds or awaits it
+_idempotency_locks: dict[tuple[str, str], _KeyLock] = {}
+
+# (tool_name, idempotency_key, args fingerprint) of the keyed write being handled
+_idempotency_scope: ContextVar[tuple[str, str, str] | None] = ContextVar("idempotency_scope", default=None)
+
+# Callbacks notified after a task is added, changed, completed or deleted.
+# Each is called as listener(task_id, trip_id, description, due_date, status);
+# deleted tasks are reported with status 'deleted'.
+task_listeners: list[Callable[[int, str, str, str | None, str], None]] = []
+
+
+def notify_task_changed(task_id: int, trip_id: str, description: str, due_date: str | None, status: str):
+    """Tell every registered task listener about a task mutation; a failing listener is logged and skipped."""
+    for listener in list(task_listeners):
+        try:
+            listener(task_id, trip_id, description, due_date, status)
+        except Exception:
+            logger.exception("Task listener %r failed for task #%s", listener, task_id)
+
+
+# Rollup keys: lower-cased category/priority, '' when unset
+_ROLLUP_CATEGORY = "COALESCE(LOWER(TRIM({row}.category)), '')"
+_ROLLUP_PRIORITY = "COALESCE(LOWER(TRIM({row}.priority)), '')"
+
+
+def _rollup_add_sql(row: str, sign: str) -> str:
+    """SQL adding (sign '+') or removing (sign '-') one task row from task_rollup."""
+    category = _ROLLUP_CATEGORY.format(row=row)
+    priority = _ROLLUP_PRIORITY.format(row=row)
+    return f"""
+        INSERT OR IGNORE INTO task_rollup (trip_id, category, priority)
+        VALUES ({row}.trip_id, {category}, {priority});
+        UPDATE task_rollup
+        SET total = total {sign} 1,
+            completed = completed {sign} ({row}.status = 'completed')
+        WHERE trip_id = {row}.trip_id AND category = {category} AND priority = {priority};
+    """
+
+
+_ROLLUP_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_rollup_insert AFTER INSERT ON tasks
+    BEGIN {_rollup_add_sql("NEW", "+")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_rollup_delete AFTER DELETE ON tasks
+    BEGIN {_rollup_add_sql("OLD", "-")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_rollup_update
+    AFTER UPDATE OF trip_id, category, priority, status ON tasks
+    BEGIN {_rollup_add_sql("OLD", "-")} {_rollup_add_sql("NEW", "+")} END
+    """
+]
+
+
+# Tables and triggers init_database creates; once all exist it has nothing to do
+_SCHEMA_OBJECTS = {
+    "trips", "tasks", "idempotency_keys", "task_rollup",
+    "task_rollup_insert", "task_rollup_delete", "task_rollup_update"
+}
+
+
+async def _schema_is_current(db: aiosqlite.Connection) -> bool:
+    """True if every table, trigger and column init_database sets up exists (reads only, takes no write lock)."""
+    async with db.execute(
+        "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+    ) as cursor:
+        names = {row[0] for row in await cursor.fetchall()}
+    if not _SCHEMA_OBJECTS <= names:
+        return False
+    async with db.execute("PRAGMA table_info(idempotency_keys)") as cursor:
+        return "args_hash" in {row[1] for row in await cursor.fetchall()}
+
+
 async def init_database():
     """Initialize the database schema if it doesn't exist."""
     async with aiosqlite.connect(DB_PATH) as db:
+        # Usually the schema is complete: check with a plain read, so tool
+        # calls (reads especially) don't queue behind another connection's
+        # write transaction
+        if await _schema_is_current(db):
+            return
+
+        # One write transaction, so processes starting together see (and
+        # backfill) the schema exactly once
+        await db.execute("BEGIN IMMEDIATE")
+
         # Create trips table
         await db.execute("""
             CREATE TABLE IF NOT EXISTS trips (
@@ -41,9 +238,185 @@ async def init_database():
             )
         """)
 
+        # Create idempotency table (results of keyed write tool calls)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                tool_name TEXT NOT NULL,
+                idempotency_key TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                args_hash TEXT,
+                PRIMARY KEY (tool_name, idempotency_key)
+            )
+        """)
+
+        # Databases created before args_hash existed get the column (old keys match any args)
+        async with db.execute("PRAGMA table_info(idempotency_keys)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        if "args_hash" not in columns:
+            await db.execute("ALTER TABLE idempotency_keys ADD COLUMN args_hash TEXT")
+
+        # Create rollup of task counts per trip/category/priority, kept
+        # current by triggers (backfilled from tasks when first created)
+        async with db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_rollup'"
+        ) as cursor:
+            rollup_exists = await cursor.fetchone()
+
+        if not rollup_exists:
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS task_rollup (
+                    trip_id TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    total INTEGER NOT NULL DEFAULT 0,
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (trip_id, category, priority)
+                )
+            """)
+            await db.execute(f"""
+                INSERT INTO task_rollup (trip_id, category, priority, total, completed)
+                SELECT trip_id, {_ROLLUP_CATEGORY.format(row="tasks")}, {_ROLLUP_PRIORITY.format(row="tasks")},
+                       COUNT(*), SUM(status = 'completed')
+                FROM tasks
+                GROUP BY 1, 2, 3
+            """)
+
+        for trigger_sql in _ROLLUP_TRIGGERS:
+            await db.execute(trigger_sql)
+
         await db.commit()
 
 
+def args_fingerprint(args: dict[str, Any]) -> str:
+    """Hash of a tool call's arguments, excluding its idempotency_key."""
+    payload = {name: value for name, value in args.items() if name != "idempotency_key"}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+async def _store_idempotent_result(
+    db: aiosqlite.Connection,
+    tool_name: str,
+    key: str,
+    fingerprint: str,
+    result: dict[str, Any]
+):
+    """
+    Insert a key's result and trim to IDEMPOTENCY_KEY_LIMIT keys; the caller commits.
+
+    Raises sqlite3.IntegrityError if the key is already stored, e.g. by
+    another process that used the same key, so the caller's transaction
+    can be rolled back instead of applying the write a second time.
+    """
+    await db.execute(
+        "INSERT INTO idempotency_keys (tool_name, idempotency_key, args_hash, result) VALUES (?, ?, ?, ?)",
+        (tool_name, key, fingerprint, json.dumps(result))
+    )
+    await db.execute(
+        """DELETE FROM idempotency_keys WHERE rowid NOT IN (
+               SELECT rowid FROM idempotency_keys ORDER BY rowid DESC LIMIT ?
+           )""",
+        (IDEMPOTENCY_KEY_LIMIT,)
+    )
+
+
+async def record_idempotent_result(db: aiosqlite.Connection, result: dict[str, Any]):
+    """
+    Store result under the idempotency key of the call being handled, if it has one.
+
+    Write handlers call this on their connection just before committing, so
+    the key is saved in the same transaction as the write it describes. If
+    the key was stored meanwhile, this raises and the handler's write is
+    rolled back; run_idempotent then returns the stored result.
+    """
+    scope = _idempotency_scope.get()
+    if scope is not None and not result.get("is_error"):
+        await _store_idempotent_result(db, *scope, result)
+
+
+async def _stored_idempotent_result(tool_name: str, key: str, fingerprint: str) -> dict[str, Any] | None:
+    """Result stored under key (an error if it was stored for other arguments), or None."""
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            "SELECT result, args_hash FROM idempotency_keys WHERE tool_name = ? AND idempotency_key = ?",
+            (tool_name, key)
+        ) as cursor:
+            stored = await cursor.fetchone()
+
+    if stored is None:
+        return None
+    if stored[1] is not None and stored[1] != fingerprint:
+        return {
+            "content": [{
+                "type": "text",
+                "text": (f"Error: idempotency_key '{key}' was already used for a different "
+                         f"{tool_name} call. Use a new key for a new request.")
+            }],
+            "is_error": True
+        }
+    return json.loads(stored[0])
+
+
+async def run_idempotent(tool_name: str, args: dict[str, Any], handler) -> dict[str, Any]:
+    """
+    Run a write tool handler at most once per idempotency key.
+
+    If args carries an idempotency_key that was already used with this tool,
+    the stored result is returned without touching the data again, or an
+    error if the earlier call had different arguments. Successful results
+    are recorded in the idempotency_keys table (by the handler, in the same
+    transaction as its write; see record_idempotent_result), which is
+    trimmed to the newest IDEMPOTENCY_KEY_LIMIT entries.
+
+    Concurrent calls with one key are serialized in this process. Across
+    processes the key's primary key decides: the call whose key insert
+    fails has its write rolled back and returns the stored result.
+    """
+    key = args.get("idempotency_key")
+    if not key:
+        return await handler(args)
+
+    fingerprint = args_fingerprint(args)
+    lock_key = (tool_name, key)
+    entry = _idempotency_locks.get(lock_key)
+    if entry is None:
+        entry = _idempotency_locks[lock_key] = _KeyLock()
+    entry.users += 1
+
+    try:
+        async with entry.lock:
+            await init_database()
+
+            stored = await _stored_idempotent_result(tool_name, key, fingerprint)
+            if stored is not None:
+                return stored
+
+            scope = _idempotency_scope.set((tool_name, key, fingerprint))
+            try:
+                result = await handler(args)
+            finally:
+                _idempotency_scope.reset(scope)
+
+            if result.get("is_error"):
+                # The handler's key insert fails if another process stored the key first
+                return await _stored_idempotent_result(tool_name, key, fingerprint) or result
+
+            # Successful calls that wrote nothing (e.g. "already completed") are keyed here;
+            # calls that wrote were keyed by the handler, and get their own result back
+            try:
+                async with aiosqlite.connect(DB_PATH) as db:
+                    await _store_idempotent_result(db, tool_name, key, fingerprint, result)
+                    await db.commit()
+            except aiosqlite.IntegrityError:
+                return await _stored_idempotent_result(tool_name, key, fingerprint) or result
+
+            return result
+    finally:
+        entry.users -= 1
+        if not entry.users:
+            del _idempotency_locks[lock_key]
+
+
 def generate_trip_id(trip_name: str) -> str:
     """Generate a trip_id from trip_name (lowercase, underscores)."""
     return trip_name.lower().replace(" ", "_").replace("-", "_")
@@ -53,7 +426,8 @@ def generate_trip_id(trip_name: str) -> str:
     "create_trip",
     "Create a new trip to organize planning tasks. Returns the trip_id for adding tasks.",
     {
-        "trip_name": str
+        "trip_name": str,
+        "idempotency_key": str
     }
 )
 async def create_trip(args: dict[str, Any]) -> dict[str, Any]:
@@ -62,10 +436,16 @@ async def create_trip(args: dict[str, Any]) -> dict[str, Any]:
 
     Args:
         trip_name: Name of the trip (e.g., "Summer 2026 Marbella")
+        idempotency_key: Optional key; repeating a call with the same key returns the original result
 
     Returns:
         Confirmation with trip_id
     """
+    return await run_idempotent("create_trip", args, _create_trip)
+
+
+async def _create_trip(args: dict[str, Any]) -> dict[str, Any]:
+    """Apply create_trip (without idempotency handling)."""
     trip_name = args.get("trip_name")
 
     if not trip_name:
@@ -103,14 +483,18 @@ async def create_trip(args: dict[str, Any]) -> dict[str, Any]:
                 "INSERT INTO trips (trip_id, trip_name) VALUES (?, ?)",
                 (trip_id, trip_name)
             )
+            result = {
+                "content": [{
+                    "type": "text",
+                    "text": f"✓ Created trip '{trip_name}' with ID: {trip_id}\n\nYou can now add tasks using this trip_id."
+                }]
+            }
+            await record_idempotent_result(db, result)
             await db.commit()
 
-        return {
-            "content": [{
-                "type": "text",
-                "text": f"✓ Created trip '{trip_name}' with ID: {trip_id}\n\nYou can now add tasks using this trip_id."
-            }]
-        }
+        read_cache.invalidate_trip(trip_id)
+
+        return result
 
     except Exception as e:
         return {
@@ -130,7 +514,8 @@ async def create_trip(args: dict[str, Any]) -> dict[str, Any]:
         "description": str,
         "category": str,
         "priority": str,
-        "due_date": str
+        "due_date": str,
+        "idempotency_key": str
     }
 )
 async def add_task(args: dict[str, Any]) -> dict[str, Any]:
@@ -143,10 +528,16 @@ async def add_task(args: dict[str, Any]) -> dict[str, Any]:
         category: Optional category ('accommodation', 'activities', 'dining', 'transport', 'other')
         priority: Optional priority ('low', 'medium', 'high')
         due_date: Optional due date in ISO format (YYYY-MM-DD)
+        idempotency_key: Optional key; repeating a call with the same key returns the original result
 
     Returns:
         Confirmation with task_id
     """
+    return await run_idempotent("add_task", args, _add_task)
+
+
+async def _add_task(args: dict[str, Any]) -> dict[str, Any]:
+    """Apply add_task (without idempotency handling)."""
     trip_id = args.get("trip_id")
     description = args.get("description")
     category = args.get("category")
@@ -190,24 +581,25 @@ async def add_task(args: dict[str, Any]) -> dict[str, Any]:
                 (trip_id, description, category, priority, due_date)
             )
             task_id = cursor.lastrowid
-            await db.commit()
 
-        # Build response
-        response = f"✓ Added task #{task_id}: {description}\n"
-        if category:
-            response += f"  Category: {category}\n"
-        if priority:
-            response += f"  Priority: {priority}\n"
-        if due_date:
-            response += f"  Due: {due_date}\n"
-        response += f"  Trip: {trip[0]}"
+            # Build response
+            response = f"✓ Added task #{task_id}: {description}\n"
+            if category:
+                response += f"  Category: {category}\n"
+            if priority:
+                response += f"  Priority: {priority}\n"
+            if due_date:
+                response += f"  Due: {due_date}\n"
+            response += f"  Trip: {trip[0]}"
 
-        return {
-            "content": [{
-                "type": "text",
-                "text": response
-            }]
-        }
+            result = {
+                "content": [{
+                    "type": "text",
+                    "text": response
+                }]
+            }
+            await record_idempotent_result(db, result)
+            await db.commit()
 
     except Exception as e:
         return {
@@ -218,6 +610,12 @@ async def add_task(args: dict[str, Any]) -> dict[str, Any]:
             "is_error": True
         }
 
+    # Listeners run only once the write is committed and cannot turn it into an error
+    read_cache.invalidate_trip(trip_id)
+    notify_task_changed(task_id, trip_id, description, due_date, "pending")
+
+    return result
+
 
 @tool(
     "list_tasks",
@@ -238,6 +636,19 @@ async def list_tasks(args: dict[str, Any]) -> dict[str, Any]:
     Returns:
         Formatted list of tasks
     """
+    cache_key = read_cache.make_key("list_tasks", args)
+    cached = read_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    generation = read_cache.generation(args.get("trip_id"))
+    result = await _list_tasks(args)
+    read_cache.put(cache_key, args.get("trip_id"), result, generation)
+    return result
+
+
+async def _list_tasks(args: dict[str, Any]) -> dict[str, Any]:
+    """Query and format the tasks for a trip (uncached)."""
     trip_id = args.get("trip_id")
     status_filter = args.get("status", "all").lower()
 
@@ -350,7 +761,8 @@ async def list_tasks(args: dict[str, Any]) -> dict[str, Any]:
     "complete_task",
     "Mark a task as completed.",
     {
-        "task_id": int
+        "task_id": int,
+        "idempotency_key": str
     }
 )
 async def complete_task(args: dict[str, Any]) -> dict[str, Any]:
@@ -359,10 +771,16 @@ async def complete_task(args: dict[str, Any]) -> dict[str, Any]:
 
     Args:
         task_id: The ID of the task to complete
+        idempotency_key: Optional key; repeating a call with the same key returns the original result
 
     Returns:
         Confirmation with timestamp
     """
+    return await run_idempotent("complete_task", args, _complete_task)
+
+
+async def _complete_task(args: dict[str, Any]) -> dict[str, Any]:
+    """Apply complete_task (without idempotency handling)."""
     task_id = args.get("task_id")
 
     if task_id is None:
@@ -380,7 +798,7 @@ async def complete_task(args: dict[str, Any]) -> dict[str, Any]:
         async with aiosqlite.connect(DB_PATH) as db:
             # Get task details before updating
             async with db.execute(
-                "SELECT description, status FROM tasks WHERE task_id = ?",
+                "SELECT description, status, trip_id, due_date FROM tasks WHERE task_id = ?",
                 (task_id,)
             ) as cursor:
                 task = await cursor.fetchone()
@@ -394,7 +812,7 @@ async def complete_task(args: dict[str, Any]) -> dict[str, Any]:
                     "is_error": True
                 }
 
-            description, current_status = task
+            description, current_status, trip_id, current_due_date = task
 
             if current_status == "completed":
                 return {
@@ -410,15 +828,15 @@ async def complete_task(args: dict[str, Any]) -> dict[str, Any]:
                 "UPDATE tasks SET status = 'completed', completed_at = ? WHERE task_id = ?",
                 (now, task_id)
             )
+            result = {
+                "content": [{
+                    "type": "text",
+                    "text": f"✓ Completed task #{task_id}: {description}\nCompleted at: {now}"
+                }]
+            }
+            await record_idempotent_result(db, result)
             await db.commit()
 
-        return {
-            "content": [{
-                "type": "text",
-                "text": f"✓ Completed task #{task_id}: {description}\nCompleted at: {now}"
-            }]
-        }
-
     except Exception as e:
         return {
             "content": [{
@@ -428,6 +846,11 @@ async def complete_task(args: dict[str, Any]) -> dict[str, Any]:
             "is_error": True
         }
 
+    read_cache.invalidate_trip(trip_id)
+    notify_task_changed(task_id, trip_id, description, current_due_date, "completed")
+
+    return result
+
 
 @tool(
     "update_task",
@@ -437,7 +860,8 @@ async def complete_task(args: dict[str, Any]) -> dict[str, Any]:
         "description": str,
         "category": str,
         "priority": str,
-        "due_date": str
+        "due_date": str,
+        "idempotency_key": str
     }
 )
 async def update_task(args: dict[str, Any]) -> dict[str, Any]:
@@ -450,10 +874,16 @@ async def update_task(args: dict[str, Any]) -> dict[str, Any]:
         category: New category (optional)
         priority: New priority (optional)
         due_date: New due date (optional)
+        idempotency_key: Optional key; repeating a call with the same key returns the original result
 
     Returns:
         Confirmation of updated fields
     """
+    return await run_idempotent("update_task", args, _update_task)
+
+
+async def _update_task(args: dict[str, Any]) -> dict[str, Any]:
+    """Apply update_task (without idempotency handling)."""
     task_id = args.get("task_id")
     description = args.get("description")
     category = args.get("category")
@@ -484,7 +914,7 @@ async def update_task(args: dict[str, Any]) -> dict[str, Any]:
         async with aiosqlite.connect(DB_PATH) as db:
             # Verify task exists
             async with db.execute(
-                "SELECT description FROM tasks WHERE task_id = ?",
+                "SELECT description, trip_id, due_date, status FROM tasks WHERE task_id = ?",
                 (task_id,)
             ) as cursor:
                 task = await cursor.fetchone()
@@ -519,25 +949,26 @@ async def update_task(args: dict[str, Any]) -> dict[str, Any]:
 
             query = f"UPDATE tasks SET {', '.join(updates)} WHERE task_id = ?"
             await db.execute(query, params)
-            await db.commit()
 
-        # Build response
-        updated_fields = []
-        if description:
-            updated_fields.append(f"description: {description}")
-        if category:
-            updated_fields.append(f"category: {category}")
-        if priority:
-            updated_fields.append(f"priority: {priority}")
-        if due_date:
-            updated_fields.append(f"due_date: {due_date}")
+            # Build response
+            updated_fields = []
+            if description:
+                updated_fields.append(f"description: {description}")
+            if category:
+                updated_fields.append(f"category: {category}")
+            if priority:
+                updated_fields.append(f"priority: {priority}")
+            if due_date:
+                updated_fields.append(f"due_date: {due_date}")
 
-        return {
-            "content": [{
-                "type": "text",
-                "text": f"✓ Updated task #{task_id}\nChanged: {', '.join(updated_fields)}"
-            }]
-        }
+            result = {
+                "content": [{
+                    "type": "text",
+                    "text": f"✓ Updated task #{task_id}\nChanged: {', '.join(updated_fields)}"
+                }]
+            }
+            await record_idempotent_result(db, result)
+            await db.commit()
 
     except Exception as e:
         return {
@@ -548,12 +979,19 @@ async def update_task(args: dict[str, Any]) -> dict[str, Any]:
             "is_error": True
         }
 
+    old_description, trip_id, old_due_date, status = task
+    read_cache.invalidate_trip(trip_id)
+    notify_task_changed(task_id, trip_id, description or old_description, due_date or old_due_date, status)
+
+    return result
+
 
 @tool(
     "delete_task",
     "Delete a task permanently.",
     {
-        "task_id": int
+        "task_id": int,
+        "idempotency_key": str
     }
 )
 async def delete_task(args: dict[str, Any]) -> dict[str, Any]:
@@ -562,10 +1000,16 @@ async def delete_task(args: dict[str, Any]) -> dict[str, Any]:
 
     Args:
         task_id: The ID of the task to delete
+        idempotency_key: Optional key; repeating a call with the same key returns the original result
 
     Returns:
         Confirmation
     """
+    return await run_idempotent("delete_task", args, _delete_task)
+
+
+async def _delete_task(args: dict[str, Any]) -> dict[str, Any]:
+    """Apply delete_task (without idempotency handling)."""
     task_id = args.get("task_id")
 
     if task_id is None:
@@ -583,7 +1027,7 @@ async def delete_task(args: dict[str, Any]) -> dict[str, Any]:
         async with aiosqlite.connect(DB_PATH) as db:
             # Get task details before deleting
             async with db.execute(
-                "SELECT description FROM tasks WHERE task_id = ?",
+                "SELECT description, trip_id FROM tasks WHERE task_id = ?",
                 (task_id,)
             ) as cursor:
                 task = await cursor.fetchone()
@@ -597,22 +1041,22 @@ async def delete_task(args: dict[str, Any]) -> dict[str, Any]:
                     "is_error": True
                 }
 
-            description = task[0]
+            description, trip_id = task
 
             # Delete task
             await db.execute(
                 "DELETE FROM tasks WHERE task_id = ?",
                 (task_id,)
             )
+            result = {
+                "content": [{
+                    "type": "text",
+                    "text": f"✓ Deleted task #{task_id}: {description}"
+                }]
+            }
+            await record_idempotent_result(db, result)
             await db.commit()
 
-        return {
-            "content": [{
-                "type": "text",
-                "text": f"✓ Deleted task #{task_id}: {description}"
-            }]
-        }
-
     except Exception as e:
         return {
             "content": [{
@@ -622,6 +1066,11 @@ async def delete_task(args: dict[str, Any]) -> dict[str, Any]:
             "is_error": True
         }
 
+    read_cache.invalidate_trip(trip_id)
+    notify_task_changed(task_id, trip_id, description, None, "deleted")
+
+    return result
+
 
 @tool(
     "list_trips",
@@ -635,6 +1084,19 @@ async def list_trips(args: dict[str, Any]) -> dict[str, Any]:
     Returns:
         List of all trips with task statistics
     """
+    cache_key = read_cache.make_key("list_trips", args)
+    cached = read_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    generation = read_cache.generation(None)
+    result = await _list_trips(args)
+    read_cache.put(cache_key, None, result, generation)
+    return result
+
+
+async def _list_trips(args: dict[str, Any]) -> dict[str, Any]:
+    """Query and format all trips with task counts (uncached)."""
     await init_database()
 
     try:
@@ -688,3 +1150,122 @@ async def list_trips(args: dict[str, Any]) -> dict[str, Any]:
             }],
             "is_error": True
         }
+
+
+@tool(
+    "trip_breakdown",
+    "Get task counts and completion percentages by category and priority for one trip, or all trips if trip_id is omitted.",
+    {
+        "trip_id": str
+    }
+)
+async def trip_breakdown(args: dict[str, Any]) -> dict[str, Any]:
+    """
+    Summarize tasks per category and per priority.
+
+    Served from the trigger-maintained task_rollup table in a single query.
+
+    Args:
+        trip_id: Optional trip ID; all trips are aggregated when omitted
+
+    Returns:
+        Counts and completion percentages per category and priority
+    """
+    cache_key = read_cache.make_key("trip_breakdown", args)
+    cached = read_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    generation = read_cache.generation(args.get("trip_id") or None)
+    result = await _trip_breakdown(args)
+    read_cache.put(cache_key, args.get("trip_id") or None, result, generation)
+    return result
+
+
+async def _trip_breakdown(args: dict[str, Any]) -> dict[str, Any]:
+    """Query and format the category/priority rollup (uncached)."""
+    trip_id = args.get("trip_id")
+
+    await init_database()
+
+    try:
+        async with aiosqlite.connect(DB_PATH) as db:
+            if trip_id:
+                query = """
+                    SELECT t.trip_name, r.category, r.priority, r.total, r.completed
+                    FROM trips t
+                    LEFT JOIN task_rollup r ON r.trip_id = t.trip_id AND r.total > 0
+                    WHERE t.trip_id = ?
+                """
+                params = (trip_id,)
+            else:
+                query = """
+                    SELECT 'All trips', category, priority, SUM(total), SUM(completed)
+                    FROM task_rollup
+                    WHERE total > 0
+                    GROUP BY category, priority
+                """
+                params = ()
+
+            async with db.execute(query, params) as cursor:
+                rows = await cursor.fetchall()
+
+        if trip_id and not rows:
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": f"Error: Trip '{trip_id}' not found"
+                }],
+                "is_error": True
+            }
+
+        title = rows[0][0] if rows else "All trips"
+        rows = [row for row in rows if row[3]]
+
+        if not rows:
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": f"No tasks found for '{title}'"
+                }]
+            }
+
+        by_category: dict[str, list[int]] = {}
+        by_priority: dict[str, list[int]] = {}
+        for _, category, priority, total, completed in rows:
+            for groups, name in ((by_category, category or "uncategorized"), (by_priority, priority or "none")):
+                counts = groups.setdefault(name, [0, 0])
+                counts[0] += total
+                counts[1] += completed
+
+        def format_group(groups: dict[str, list[int]]) -> str:
+            lines = ""
+            for name, (total, completed) in sorted(groups.items(), key=lambda item: -item[1][0]):
+                percent = 100 * completed / total
+                lines += f"- {name}: {total} tasks, {completed} completed ({percent:.0f}%)\n"
+            return lines
+
+        grand_total = sum(counts[0] for counts in by_category.values())
+        grand_completed = sum(counts[1] for counts in by_category.values())
+
+        response = f"**Task Breakdown for '{title}'**\n\n"
+        response += "**By Category:**\n" + format_group(by_category)
+        response += "\n**By Priority:**\n" + format_group(by_priority)
+        response += "\n---\n"
+        response += f"Total: {grand_total} tasks, {grand_completed} completed ({100 * grand_completed / grand_total:.0f}%)"
+
+        return {
+            "content": [{
+                "type": "text",
+                "text": response
+            }]
+        }
+
+    except Exception as e:
+        return {
+            "content": [{
+                "type": "text",
+                "text": f"Error building trip breakdown: {str(e)}"
+            }],
+            "is_error": True
+        }
@@ -0,0 +1,209 @@
+"""
+Walking Route Tool for Marbella Travel Agent
+Sequences sights into an efficient walking tour within a time budget
+(computed locally, no network).
+"""
+
+from datetime import datetime, timedelta
+from typing import Any
+from claude_agent_sdk import tool
+from .points_of_interest import poi_index
+from .route_optimizer import WALKING_SPEED_KMH, Stop, plan_route
+from .weather_tool import resolve_location
+
+# Most POIs accepted in one call
+MAX_ROUTE_POIS = 15
+
+# must_see given as a string
+TRUE_STRINGS = ("true", "yes", "1")
+FALSE_STRINGS = ("false", "no", "0", "")
+
+
+def format_minutes(minutes: float) -> str:
+    """Format a duration to the minute: '7 min', '1 h 55 min'."""
+    rounded = max(1, round(minutes)) if minutes > 0 else 0
+    hours, mins = divmod(rounded, 60)
+    if not hours:
+        return f"{mins} min"
+    return f"{hours} h {mins} min" if mins else f"{hours} h"
+
+
+def format_distance(meters: float) -> str:
+    """Format a walking distance: '350 m', '2.4 km'."""
+    if meters < 1000:
+        return f"{round(meters / 10) * 10:.0f} m"
+    return f"{meters / 1000:.1f} km"
+
+
+def _parse_stop(value: Any, visit: bool = True) -> Stop:
+    """Turn a name or {name, latitude, longitude, dwell_minutes, must_see} into a Stop (visit=False: start point)."""
+    if isinstance(value, str):
+        value = {"name": value}
+    if not isinstance(value, dict):
+        raise ValueError(f"Error: Invalid point {value!r} (expected an object with name, latitude and longitude).")
+
+    name = value.get("name") or value.get("location_name")
+    if name is not None and not isinstance(name, str):
+        raise ValueError(f"Error: Invalid point name {name!r} (expected a string).")
+    latitude, longitude = value.get("latitude"), value.get("longitude")
+    if latitude is None or longitude is None:
+        if not name:
+            raise ValueError("Error: Each point needs latitude and longitude (or a known place name).")
+        poi = poi_index.find(name)
+        place = poi if poi is not None else resolve_location(name).place
+        latitude, longitude = place.latitude, place.longitude
+
+    # List elements are not checked against the tool schema, so coerce them here
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+        dwell = float(value.get("dwell_minutes") or 0)
+    except (TypeError, ValueError):
+        raise ValueError(f"Error: Invalid latitude/longitude/dwell_minutes for {name or 'a point'} "
+                         f"(expected numbers).") from None
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+        raise ValueError(f"Error: Coordinates out of range for {name or 'a point'}: {latitude}, {longitude}")
+    if not dwell >= 0:
+        raise ValueError(f"Error: dwell_minutes must not be negative ({name or 'a point'}).")
+
+    must_see = value.get("must_see", False)
+    if isinstance(must_see, str):
+        flag = must_see.strip().lower()
+        if flag not in TRUE_STRINGS + FALSE_STRINGS:
+            raise ValueError(f"Error: must_see must be true or false ({name or 'a point'}). Got: {must_see}")
+        must_see = flag in TRUE_STRINGS
+    if not visit:
+        return Stop(name or f"{latitude}, {longitude}", latitude, longitude)
+    return Stop(name or f"{latitude}, {longitude}", latitude, longitude, dwell, bool(must_see))
+
+
+@tool(
+    "plan_walking_route",
+    "Order sights into an efficient walking tour. 'pois' is a list of {name, latitude, longitude, "
+    "dwell_minutes, must_see} objects (coordinates may be left out for places known to nearby_pois or "
+    "geocode); optional 'start' (e.g. a car park), 'return_to_start', 'time_budget_minutes' (stops are "
+    "dropped to fit, keeping as many as possible and never must_see ones), 'start_time' (HH:MM) and "
+    "'walking_speed_kmh'. Returns the ordered route with walking legs, arrival times and "
+    "total duration. Computed locally in milliseconds.",
+    {
+        "pois": list,
+        "start": dict,
+        "return_to_start": bool,
+        "time_budget_minutes": int,
+        "start_time": str,
+        "walking_speed_kmh": float
+    }
+)
+async def plan_walking_route(args: dict[str, Any]) -> dict[str, Any]:
+    """
+    Plan a walking tour.
+
+    Args:
+        pois: Sights to visit, each {name, latitude, longitude, dwell_minutes?, must_see?} (2-15)
+        start: Fixed starting point {name, latitude, longitude} (optional)
+        return_to_start: Finish where the tour started (default: False)
+        time_budget_minutes: Time available for walking and visits (optional)
+        start_time: Departure time, HH:MM, for an arrival timetable (optional)
+        walking_speed_kmh: Walking pace (default: 4.5)
+
+    Returns:
+        Ordered route with legs, arrival times, totals and any skipped sights
+    """
+    pois = args.get("pois") or []
+    budget = args.get("time_budget_minutes")
+    speed = args.get("walking_speed_kmh") or WALKING_SPEED_KMH
+    return_to_start = bool(args.get("return_to_start"))
+
+    if not isinstance(pois, list) or len(pois) < 2:
+        return {
+            "content": [{
+                "type": "text",
+                "text": "Error: pois must be a list of at least two {name, latitude, longitude, dwell_minutes} objects."
+            }],
+            "is_error": True
+        }
+
+    if len(pois) > MAX_ROUTE_POIS:
+        return {
+            "content": [{
+                "type": "text",
+                "text": f"Error: At most {MAX_ROUTE_POIS} points per route. Got: {len(pois)}"
+            }],
+            "is_error": True
+        }
+
+    if not (1 <= speed <= 8):
+        return {
+            "content": [{
+                "type": "text",
+                "text": f"Error: walking_speed_kmh must be between 1 and 8. Got: {speed}"
+            }],
+            "is_error": True
+        }
+
+    departure = None
+    if args.get("start_time"):
+        try:
+            departure = datetime.strptime(str(args["start_time"]).strip(), "%H:%M")
+        except ValueError:
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": f"Error: start_time must be HH:MM (24-hour). Got: {args['start_time']}"
+                }],
+                "is_error": True
+            }
+
+    try:
+        stops = [_parse_stop(poi) for poi in pois]
+        start = _parse_stop(args["start"], visit=False) if args.get("start") else None
+    except ValueError as e:
+        return {
+            "content": [{
+                "type": "text",
+                "text": str(e)
+            }],
+            "is_error": True
+        }
+
+    route = plan_route(stops, start, return_to_start, budget, speed)
+
+    visits = len(route.stops) - (start is not None) - return_to_start
+    response_text = f"**Walking Route** ({visits} stop{'s' if visits != 1 else ''}"
+    if budget:
+        response_text += f", {format_minutes(route.total_minutes)} of a {format_minutes(budget)} budget"
+    response_text += ")\n\n"
+
+    elapsed = 0.0
+    for i, stop in enumerate(route.stops):
+        if i > 0:
+            leg = route.legs[i - 1]
+            response_text += f"   ↓ walk {format_distance(leg.meters)}, {format_minutes(leg.minutes)}\n"
+            elapsed += leg.minutes
+        clock = f"{(departure + timedelta(minutes=elapsed)).strftime('%H:%M')} " if departure else ""
+        if (i == 0 and start is not None) or (i == len(route.stops) - 1 and return_to_start):
+            label = "Start" if i == 0 else "Finish"
+            response_text += f"{i + 1}. {clock}{label}: {stop.name}\n"
+        else:
+            dwell = f" ({format_minutes(stop.dwell_minutes)})" if stop.dwell_minutes else ""
+            response_text += f"{i + 1}. {clock}{stop.name}{dwell}{' ★' if stop.must_see else ''}\n"
+        elapsed += stop.dwell_minutes
+
+    response_text += (f"\n**Total:** {format_minutes(route.total_minutes)}: "
+                      f"{format_distance(route.meters)} walking ({format_minutes(route.walking_minutes)}) "
+                      f"+ {format_minutes(route.dwell_minutes)} at stops\n")
+
+    if route.skipped:
+        response_text += f"**Skipped to fit the budget:** {', '.join(stop.name for stop in route.skipped)}\n"
+    if budget and route.total_minutes > budget:
+        response_text += "⚠️ The must-see stops alone exceed the time budget.\n"
+
+    response_text += "\n---\n"
+    response_text += (f"Walking times assume {speed:g} km/h over street distances estimated from coordinates; "
+                      f"allow extra time for hills and steps.")
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": response_text
+        }]
+    }
@@ -0,0 +1,483 @@
+"""
+Forecast Cache for the Weather Tool
+In-memory LRU cache of met.no forecasts with expiry driven by response headers,
+backed by an optional on-disk SQLite tier shared by processes on the same host.
+"""
+
+import contextlib
+import json
+import math
+import os
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Mapping
+
+import aiosqlite
+
+# Fallback lifetime when a response carries no usable Expires header (seconds)
+DEFAULT_TTL = 1800
+
+# Default on-disk cache file (project root)
+DISK_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "weather_cache.db")
+
+# Disk entries this long past expiry are deleted (seconds)
+DISK_RETENTION = 86400
+
+# met.no asks clients not to send more than 4 decimals of precision
+COORDINATE_DECIMALS = 4
+
+# Cache keys use the geohash cell of the coordinates. Precision 6 cells are
+# about 1.2 x 0.6 km, finer than met.no's model grid, so every point in a
+# cell gets the same forecast.
+GEOHASH_PRECISION = 6
+
+# Precision of the cells used to index entries for nearby lookups (~5 km)
+INDEX_PRECISION = 5
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_KM = 6371.0
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode coordinates as a geohash of `precision` characters."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # bits alternate longitude, latitude
+
+    while len(chars) < precision:
+        target, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if target >= mid:
+            value = (value << 1) | 1
+            bounds[0] = mid
+        else:
+            value <<= 1
+            bounds[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = value = 0
+
+    return "".join(chars)
+
+
+def geohash_decode(geohash: str) -> tuple[float, float]:
+    """Return the (latitude, longitude) centre of a geohash cell."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        value = GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            bounds = lon_range if even else lat_range
+            mid = (bounds[0] + bounds[1]) / 2
+            if (value >> shift) & 1:
+                bounds[0] = mid
+            else:
+                bounds[1] = mid
+            even = not even
+
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def geohash_cell_size(precision: int) -> tuple[float, float]:
+    """Return (latitude, longitude) extent in degrees of a geohash cell."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def make_forecast_key(
+    latitude: float,
+    longitude: float,
+    altitude: int | None = None,
+    precision: int | None = None
+) -> tuple:
+    """
+    Build the cache key for a location: (geohash, altitude).
+
+    Coordinates that differ only slightly (36.51/-4.88 vs 36.5101/-4.8826)
+    share a key. precision defaults to GEOHASH_PRECISION.
+    """
+    return (
+        geohash_encode(float(latitude), float(longitude), precision or GEOHASH_PRECISION),
+        None if altitude is None else int(altitude)
+    )
+
+
+def key_coordinates(key: tuple) -> tuple[float, float]:
+    """Coordinates to request for a key: its cell centre, rounded to 4 decimals."""
+    latitude, longitude = geohash_decode(key[0])
+    return round(latitude, COORDINATE_DECIMALS), round(longitude, COORDINATE_DECIMALS)
+
+
+def ttl_from_headers(headers: Mapping[str, str], default: float = DEFAULT_TTL) -> float:
+    """
+    Compute how long a response may be cached from its Expires header.
+
+    The lifetime is measured against the response's Date header when present
+    so local clock skew does not shorten or stretch it.
+    """
+    expires = headers.get("Expires")
+    if not expires:
+        return default
+
+    try:
+        expires_at = parsedate_to_datetime(expires)
+        date = headers.get("Date")
+        now = parsedate_to_datetime(date) if date else datetime.now(timezone.utc)
+    except (TypeError, ValueError):
+        return default
+
+    return max((expires_at - now).total_seconds(), 0.0)
+
+
+class DiskForecastCache:
+    """
+    SQLite-backed forecast store that survives restarts.
+
+    Payloads are stored as zlib-compressed JSON with a wall-clock expiry so
+    every process on the host sees the same validity window. Disk errors
+    are treated as misses; the cache never fails a forecast lookup.
+
+    Between open() and close() (tools.startup()/shutdown()) all reads and
+    writes share one connection and its worker thread; otherwise each call
+    opens its own.
+
+    Args:
+        path: SQLite file location
+        encode: Converts a payload to JSON-serializable data before storing
+        decode: Rebuilds a payload from stored data; entries it rejects are misses
+    """
+
+    def __init__(
+        self,
+        path: str = DISK_CACHE_PATH,
+        encode: Callable[[Any], Any] | None = None,
+        decode: Callable[[Any], Any] | None = None
+    ):
+        self.path = path
+        self.encode = encode
+        self.decode = decode
+        self._initialized = False
+        self._db: aiosqlite.Connection | None = None
+
+    @staticmethod
+    def _key(key: tuple) -> str:
+        return json.dumps(key)
+
+    async def open(self):
+        """Open the shared connection (no-op if already open; disk errors leave per-call connections)."""
+        if self._db is not None:
+            return
+        try:
+            db = await aiosqlite.connect(self.path, timeout=1.0)
+        except sqlite3.Error:
+            return
+        try:
+            await self._ensure_schema(db)
+        except sqlite3.Error:
+            await db.close()
+            return
+        self._db = db
+
+    async def close(self):
+        """Close the shared connection."""
+        if self._db is not None:
+            db, self._db = self._db, None
+            await db.close()
+
+    @contextlib.asynccontextmanager
+    async def _connect(self):
+        """The shared connection if open, else a connection for this call only."""
+        db = self._db
+        if db is not None:
+            try:
+                yield db
+            except sqlite3.Error:
+                # Don't leave a failed write's transaction open on the shared connection
+                with contextlib.suppress(sqlite3.Error):
+                    await db.rollback()
+                raise
+            return
+        async with aiosqlite.connect(self.path, timeout=1.0) as db:
+            await self._ensure_schema(db)
+            yield db
+
+    async def _ensure_schema(self, db: aiosqlite.Connection):
+        """Create the forecasts table (once per process)."""
+        if self._initialized:
+            return
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS forecasts (
+                cache_key TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                expires_at REAL NOT NULL,
+                last_modified TEXT
+            )
+        """)
+        await db.commit()
+        self._initialized = True
+
+    async def get(self, key: tuple) -> tuple[Any, float, str | None] | None:
+        """Return (payload, seconds until expiry, Last-Modified) or None."""
+        try:
+            async with self._connect() as db:
+                async with db.execute(
+                    "SELECT payload, expires_at, last_modified FROM forecasts WHERE cache_key = ?",
+                    (self._key(key),)
+                ) as cursor:
+                    row = await cursor.fetchone()
+        except sqlite3.Error:
+            return None
+
+        if row is None:
+            return None
+        blob, expires_at, last_modified = row
+        try:
+            payload = json.loads(zlib.decompress(blob))
+            if self.decode is not None:
+                payload = self.decode(payload)
+        except (zlib.error, ValueError, KeyError, TypeError):
+            return None  # corrupt or written in an older format
+        return payload, expires_at - time.time(), last_modified
+
+    async def set(self, key: tuple, payload: Any, ttl: float, last_modified: str | None = None):
+        """Store a payload for ttl seconds and drop long-expired entries."""
+        if self.encode is not None:
+            payload = self.encode(payload)
+        blob = zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+        now = time.time()
+        try:
+            async with self._connect() as db:
+                await db.execute(
+                    "INSERT OR REPLACE INTO forecasts (cache_key, payload, expires_at, last_modified) VALUES (?, ?, ?, ?)",
+                    (self._key(key), blob, now + ttl, last_modified)
+                )
+                await db.execute(
+                    "DELETE FROM forecasts WHERE expires_at < ?",
+                    (now - DISK_RETENTION,)
+                )
+                await db.commit()
+        except sqlite3.Error:
+            pass
+
+    async def refresh(self, key: tuple, ttl: float):
+        """Extend an entry's expiry after a 304 Not Modified."""
+        try:
+            async with self._connect() as db:
+                await db.execute(
+                    "UPDATE forecasts SET expires_at = ? WHERE cache_key = ?",
+                    (time.time() + ttl, self._key(key))
+                )
+                await db.commit()
+        except sqlite3.Error:
+            pass
+
+
+class ForecastCache:
+    """
+    Bounded LRU cache of forecast payloads with per-entry expiry.
+
+    Expired entries are reported as misses but kept (with their
+    Last-Modified value) so the caller can revalidate them and, on a 304,
+    extend them with refresh(). Once max_entries is reached the least
+    recently used entry is evicted.
+
+    With a disk tier, memory misses fall through to it and fresh disk
+    entries are promoted into memory; writes and refreshes go to both.
+
+    With nearby_km > 0, a lookup that misses both tiers is answered by the
+    closest fresh in-memory entry (same altitude) whose cell centre lies
+    within nearby_km. Entries are indexed by their INDEX_PRECISION geohash
+    cell, so only the surrounding cells are searched.
+
+    Keys come from key(), which uses `precision` geohash characters
+    (GEOHASH_PRECISION by default); it must be at least INDEX_PRECISION so
+    every key lies inside one index cell.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        disk: DiskForecastCache | None = None,
+        nearby_km: float = 0.0,
+        precision: int = GEOHASH_PRECISION
+    ):
+        if precision < INDEX_PRECISION:
+            raise ValueError(f"precision must be at least INDEX_PRECISION ({INDEX_PRECISION}). Got: {precision}")
+        self.max_entries = max_entries
+        self.disk = disk
+        self.nearby_km = nearby_km
+        self.precision = precision
+        # key -> (payload, expires_at on the monotonic clock, Last-Modified)
+        self._entries: OrderedDict[tuple, tuple[Any, float, str | None]] = OrderedDict()
+        # INDEX_PRECISION geohash -> keys of entries in that cell
+        self._cells: dict[str, set[tuple]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.revalidated = 0
+        self.disk_hits = 0
+        self.nearby_hits = 0
+        # Monotonic time of the last get() (i.e. the last tool lookup)
+        self.last_lookup: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, latitude: float, longitude: float, altitude: int | None = None) -> tuple:
+        """Cache key for a location at this cache's precision (see make_forecast_key)."""
+        return make_forecast_key(latitude, longitude, altitude, self.precision)
+
+    async def get(self, key: tuple) -> Any | None:
+        """Return the cached payload for key if it has not expired."""
+        self.last_lookup = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() < entry[1]:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        if self.disk is not None:
+            stored = await self.disk.get(key)
+            if stored is not None:
+                payload, ttl, last_modified = stored
+                if ttl > 0:
+                    self._store(key, payload, ttl, last_modified)
+                    self.disk_hits += 1
+                    self.hits += 1
+                    return payload
+                if entry is None:
+                    # Keep the expired copy so it can be revalidated (or served stale)
+                    self._store(key, payload, ttl, last_modified)
+
+        if self.nearby_km > 0:
+            payload = self._get_nearby(key)
+            if payload is not None:
+                self.nearby_hits += 1
+                self.hits += 1
+                return payload
+
+        if entry is not None:
+            self.expired += 1
+        self.misses += 1
+        return None
+
+    def _get_nearby(self, key: tuple) -> Any | None:
+        """Return the payload of the closest fresh entry within nearby_km, if any."""
+        latitude, longitude = geohash_decode(key[0])
+        cell_lat, cell_lon = geohash_cell_size(INDEX_PRECISION)
+
+        # Rings of index cells needed to cover the radius at this latitude
+        km_per_degree = math.pi * EARTH_RADIUS_KM / 180
+        lat_rings = math.ceil(self.nearby_km / (cell_lat * km_per_degree))
+        lon_km = cell_lon * km_per_degree * max(math.cos(math.radians(latitude)), 0.01)
+        lon_rings = math.ceil(self.nearby_km / lon_km)
+
+        now = time.monotonic()
+        best, best_distance = None, self.nearby_km
+        for i in range(-lat_rings, lat_rings + 1):
+            for j in range(-lon_rings, lon_rings + 1):
+                cell_latitude = max(min(latitude + i * cell_lat, 90.0), -90.0)
+                cell_longitude = (longitude + j * cell_lon + 180.0) % 360.0 - 180.0
+                cell = geohash_encode(cell_latitude, cell_longitude, INDEX_PRECISION)
+                for candidate in self._cells.get(cell, ()):
+                    if candidate[1] != key[1] or self._entries[candidate][1] <= now:
+                        continue
+                    distance = haversine_km(latitude, longitude, *geohash_decode(candidate[0]))
+                    if distance <= best_distance:
+                        best, best_distance = candidate, distance
+
+        if best is None:
+            return None
+        self._entries.move_to_end(best)
+        return self._entries[best][0]
+
+    async def get_stale(self, key: tuple) -> tuple[Any, str | None] | None:
+        """Return (payload, Last-Modified) for key regardless of expiry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[0], entry[2]
+
+    def expires_in(self, key: tuple) -> float | None:
+        """Seconds until the in-memory entry for key expires (negative if expired, None if absent)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[1] - time.monotonic()
+
+    def _store(self, key: tuple, payload: Any, ttl: float, last_modified: str | None):
+        """Put an entry in memory, evicting the LRU entry if full."""
+        assert len(key[0]) >= INDEX_PRECISION, f"cache key {key} is coarser than INDEX_PRECISION"
+        self._entries[key] = (payload, time.monotonic() + ttl, last_modified)
+        self._entries.move_to_end(key)
+        self._cells.setdefault(key[0][:INDEX_PRECISION], set()).add(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            cell = self._cells[evicted[0][:INDEX_PRECISION]]
+            cell.discard(evicted)
+            if not cell:
+                del self._cells[evicted[0][:INDEX_PRECISION]]
+            self.evictions += 1
+
+    async def set(self, key: tuple, payload: Any, ttl: float, last_modified: str | None = None):
+        """Store a payload for ttl seconds in memory and on disk."""
+        self._store(key, payload, ttl, last_modified)
+        if self.disk is not None:
+            await self.disk.set(key, payload, ttl, last_modified)
+
+    async def refresh(self, key: tuple, ttl: float):
+        """Extend an entry after a 304 Not Modified, keeping its payload."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        payload, _, last_modified = entry
+        self._entries[key] = (payload, time.monotonic() + ttl, last_modified)
+        self._entries.move_to_end(key)
+        self.revalidated += 1
+        if self.disk is not None:
+            await self.disk.refresh(key, ttl)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self._cells.clear()
+        self.hits = self.misses = self.expired = self.evictions = self.revalidated = 0
+        self.disk_hits = self.nearby_hits = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return entry count, hit/miss counters and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "revalidated": self.revalidated,
+            "disk_hits": self.disk_hits,
+            "nearby_hits": self.nearby_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -4,8 +4,551 @@ Fetches weather forecasts from yr.no API for any location.
 """
 
 import aiohttp
+import asyncio
+import json
+import math
+import os
+import ssl
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone, tzinfo
 from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from claude_agent_sdk import tool
+from .circuit_breaker import CircuitBreaker
+from .climate_normals import MonthNormals, climate_index
+from .forecast_series import DaySummary, ForecastSeries
+from .gazetteer import EXACT, PREFIX, WORD, PlaceMatch, gazetteer
+from .rate_limit import TokenBucket, backoff_delay
+from .weather_cache import DiskForecastCache, ForecastCache, key_coordinates, ttl_from_headers
+
+# Optional faster JSON decoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# met.no Locationforecast endpoint; set MET_NO_URL to use a mirror or the
+# local stand-in server (met_stub.py)
+MET_NO_URL = os.getenv("MET_NO_URL", "https://api.met.no/weatherapi/locationforecast/2.0/compact")
+
+# Required User-Agent header
+HEADERS = {
+    "User-Agent": "MarbellaAgent/1.0 (github.com/user/marbella-agent)"
+}
+
+# Lookups with no cached forecast for their own geohash cell may reuse a fresh
+# forecast for a point this close (km); 0 disables nearby reuse
+NEARBY_RADIUS_KM = 1.5
+
+# Shared forecast cache of parsed ForecastSeries; entries live until met.no's
+# Expires time. The disk tier (weather_cache.db) lets new processes start warm.
+forecast_cache = ForecastCache(
+    max_entries=256,
+    disk=DiskForecastCache(encode=ForecastSeries.to_dict, decode=ForecastSeries.from_dict),
+    nearby_km=NEARBY_RADIUS_KM
+)
+
+# Timezone that defines "a day" in daily summaries (the agents plan Spanish trips)
+LOCAL_TIMEZONE = "Europe/Madrid"
+
+# Connection pool settings for the shared HTTP session
+CONNECTION_LIMIT_PER_HOST = 8
+KEEPALIVE_TIMEOUT = 60  # seconds an idle connection stays open
+DNS_CACHE_TTL = 300  # seconds
+
+# TLS context for the shared session (None = aiohttp's default verification)
+SSL_CONTEXT: ssl.SSLContext | None = None
+
+# Upper bound on simultaneous requests to met.no across all callers
+MAX_CONCURRENT_REQUESTS = 4
+
+# Most locations accepted by get_weather_forecasts in one call
+MAX_BATCH_LOCATIONS = 12
+
+# Near matches suggested when a location_name has no exact gazetteer match
+RESOLVE_CANDIDATES = 5
+
+# Longest start_date/end_date window get_weather_forecast will list (days)
+MAX_DATE_WINDOW = 31
+
+# Hours of each response kept after its first timestep. met.no's compact
+# product ends after ~9 days and the tools show all of it, so this only
+# bounds longer payloads from mirrors or other providers.
+FORECAST_HORIZON_HOURS = 10 * 24
+
+# Process-wide request budget for met.no (well under their 20 req/s ceiling)
+rate_limiter = TokenBucket(rate=10, capacity=10)
+
+# Upstream statuses retried with backoff, and the total time allowed for retries
+RETRY_STATUSES = {429, 503}
+RETRY_DEADLINE = 20  # seconds
+
+# Stops requests to met.no after 5 consecutive failures; probes again after 30 s
+circuit_breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+
+# With an expired forecast cached, tool calls wait at most this long for a
+# fresh one before answering with the expired copy (seconds)
+STALE_SERVE_AFTER = 2.0
+
+# Oldest expired forecast the tools will fall back to (seconds past expiry)
+MAX_STALE_AGE = 6 * 3600
+
+# Hedging: if the primary provider has not answered within its recent p95
+# latency, the same request is sent to the secondary provider and the first
+# good answer wins. Until enough samples exist HEDGE_DELAY_DEFAULT is used,
+# and at most HEDGE_MAX_RATIO of requests are hedged.
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+HEDGE_DELAY_DEFAULT = 1.0  # seconds
+HEDGE_MIN_DELAY = 0.05  # seconds
+HEDGE_MAX_RATIO = 0.1
+
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+
+# Requests currently on the wire, by cache key; concurrent callers share them
+_inflight: dict[tuple, asyncio.Task] = {}
+
+# Upstream request counters (reported in session stats)
+request_stats = {
+    "requests": 0,
+    "coalesced": 0,
+    "retries": 0,
+    "stale_served": 0,
+    "hedged": 0,
+    "hedge_wins": 0
+}
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared HTTP session, creating it on first use.
+
+    Reusing one session keeps TCP/TLS connections to api.met.no alive and
+    caches DNS lookups between calls. A new session is created if the old
+    one was closed or belongs to a different event loop.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit_per_host=CONNECTION_LIMIT_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            ssl=SSL_CONTEXT if SSL_CONTEXT is not None else True
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            headers=HEADERS,
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+        _session_loop = loop
+
+    return _session
+
+
+async def close_session():
+    """Close the shared HTTP session (call on server shutdown)."""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
+class WeatherFetchError(Exception):
+    """Raised when a forecast cannot be fetched; the message is shown to the model."""
+
+
+@dataclass
+class ProviderResponse:
+    """One HTTP answer from a forecast provider (body read only for 200)."""
+    provider: "ForecastProvider"
+    status: int
+    headers: Any
+    body: bytes | None
+
+
+class ForecastProvider:
+    """
+    An endpoint serving the met.no Locationforecast compact format.
+
+    Each provider has its own concurrency limit, optional rate limiter and
+    a window of recent response times used to decide when to hedge.
+
+    Args:
+        name: Label used in stats
+        url: Forecast endpoint
+        rate_limiter: Request budget for this endpoint (None = unlimited)
+        max_concurrent: Requests allowed in flight at once
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        rate_limiter: TokenBucket | None = None,
+        max_concurrent: int = MAX_CONCURRENT_REQUESTS
+    ):
+        self.name = name
+        self._url = url
+        self._rate_limiter = rate_limiter
+        self.max_concurrent = max_concurrent
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._slots: asyncio.Semaphore | None = None
+        self._slots_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    @property
+    def rate_limiter(self) -> TokenBucket | None:
+        return self._rate_limiter
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for this provider before hedging: its recent p95 latency."""
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return HEDGE_DELAY_DEFAULT
+        ordered = sorted(self.latencies)
+        return max(ordered[math.ceil(len(ordered) * 0.95) - 1], HEDGE_MIN_DELAY)
+
+    async def request(
+        self,
+        params: dict[str, Any],
+        headers: dict[str, str],
+        sent: asyncio.Event | None = None
+    ) -> ProviderResponse:
+        """
+        Send one GET; response times (including abandoned requests) feed hedge_delay().
+
+        Time spent waiting for the rate limiter or a free slot is not counted;
+        `sent` (if given) is set once those are passed and the GET starts.
+        """
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+            self._slots_loop = loop
+
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+
+        async with self._slots:
+            start = time.monotonic()
+            if sent is not None:
+                sent.set()
+            try:
+                async with get_session().get(self.url, params=params, headers=headers) as response:
+                    body = await response.read() if response.status == 200 else None
+                    result = ProviderResponse(self, response.status, response.headers, body)
+            except asyncio.CancelledError:
+                # A cancelled hedge loser took at least this long
+                self.latencies.append(time.monotonic() - start)
+                raise
+            self.latencies.append(time.monotonic() - start)
+            return result
+
+
+class MetNoProvider(ForecastProvider):
+    """api.met.no, reading MET_NO_URL and rate_limiter from this module at request time."""
+
+    def __init__(self):
+        super().__init__("met.no", MET_NO_URL)
+
+    @property
+    def url(self) -> str:
+        return MET_NO_URL
+
+    @property
+    def rate_limiter(self) -> TokenBucket | None:
+        return rate_limiter
+
+
+# Primary forecast source, and an optional secondary serving the same format
+# (an alternate endpoint or local mirror) used for hedged requests. Set
+# MET_NO_FALLBACK_URL or assign secondary_provider to enable hedging.
+primary_provider: ForecastProvider = MetNoProvider()
+secondary_provider: ForecastProvider | None = (
+    ForecastProvider("fallback", os.environ["MET_NO_FALLBACK_URL"]) if os.getenv("MET_NO_FALLBACK_URL") else None
+)
+
+
+async def _hedged_get(params: dict[str, Any], headers: dict[str, str]) -> ProviderResponse:
+    """
+    Send a request to the primary provider, hedging to the secondary if it is slow.
+
+    The hedge is sent once the primary has been on the wire for its p95
+    latency (and the hedge budget allows); time queued behind the local rate
+    limiter and concurrency limit does not count. The first 200/304 answer
+    wins and the other request is cancelled; if neither is good, the
+    primary's outcome is returned (or raised).
+    """
+    secondary = secondary_provider
+    if secondary is None or request_stats["hedged"] >= HEDGE_MAX_RATIO * request_stats["requests"] + 1:
+        return await primary_provider.request(params, headers)
+
+    sent = asyncio.Event()
+    primary = asyncio.ensure_future(primary_provider.request(params, headers, sent))
+    sending = asyncio.ensure_future(sent.wait())
+    pending = {primary, sending}
+    try:
+        await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        pending.discard(sending)
+        sending.cancel()
+        if not primary.done():
+            await asyncio.wait(pending, timeout=primary_provider.hedge_delay())
+        if primary.done():
+            return primary.result()
+
+        request_stats["hedged"] += 1
+        pending.add(asyncio.ensure_future(secondary.request(params, headers)))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None and task.result().status in (200, 304):
+                    if task is not primary:
+                        request_stats["hedge_wins"] += 1
+                    return task.result()
+
+        # Neither answer was usable: report the primary's
+        return primary.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def fetch_forecast(latitude: float, longitude: float, altitude: int | None = None) -> ForecastSeries:
+    """
+    Return the parsed met.no forecast for a location.
+
+    Locations are cached by geohash cell (see ForecastCache.key), and a
+    miss may be served from a fresh forecast within NEARBY_RADIUS_KM.
+    Served from forecast_cache while the last response is still within its
+    Expires time. Once it has expired the request is made conditional with
+    If-Modified-Since; a 304 reply extends the cached payload without
+    downloading or parsing the timeseries again.
+
+    Concurrent calls for the same location share a single request: the
+    first caller starts it and the others await the same task.
+
+    Raises:
+        WeatherFetchError: On rate limiting, HTTP errors or network failures
+    """
+    key = forecast_cache.key(latitude, longitude, altitude)
+    data = await forecast_cache.get(key)
+    if data is not None:
+        return data
+
+    return await _shared_request(key)
+
+
+async def refresh_forecast(latitude: float, longitude: float, altitude: int | None = None) -> ForecastSeries:
+    """
+    Re-request a location even if its cached forecast is still fresh.
+
+    Used to refresh entries ahead of expiry. The request is conditional when
+    a Last-Modified value is cached, so an unchanged forecast costs a 304.
+    """
+    return await _shared_request(forecast_cache.key(latitude, longitude, altitude))
+
+
+async def fetch_forecast_or_stale(
+    latitude: float,
+    longitude: float,
+    altitude: int | None = None
+) -> tuple[ForecastSeries, float | None]:
+    """
+    Like fetch_forecast, but answer with an expired forecast rather than wait or fail.
+
+    When the cached forecast has expired and the expired copy is at most
+    MAX_STALE_AGE old, that copy is returned immediately while the circuit
+    breaker is open, when the request fails, or once STALE_SERVE_AFTER
+    seconds have passed. In the last case the request carries on in the
+    background and refreshes the cache.
+
+    Returns:
+        (forecast, seconds since it expired), with None for a fresh forecast
+
+    Raises:
+        WeatherFetchError: If no fresh forecast can be fetched and no usable
+            expired copy is cached
+    """
+    key = forecast_cache.key(latitude, longitude, altitude)
+    data = await forecast_cache.get(key)
+    if data is not None:
+        return data, None
+
+    stale = await forecast_cache.get_stale(key)
+    age = -forecast_cache.expires_in(key) if stale is not None else None
+    if stale is None or age > MAX_STALE_AGE:
+        return await _shared_request(key), None
+
+    try:
+        task = _start_request(key)
+        return await asyncio.wait_for(asyncio.shield(task), STALE_SERVE_AFTER), None
+    except (WeatherFetchError, asyncio.TimeoutError):
+        request_stats["stale_served"] += 1
+        return stale[0], age
+
+
+def _start_request(key: tuple) -> asyncio.Task:
+    """
+    Return the in-flight request for key, starting one if needed.
+
+    Raises:
+        WeatherFetchError: If a new request is needed but the circuit is open
+    """
+    task = _inflight.get(key)
+    if task is not None:
+        request_stats["coalesced"] += 1
+        return task
+
+    if not circuit_breaker.allow_request():
+        raise WeatherFetchError(
+            "The weather service is temporarily unavailable after repeated failures. "
+            "Please try again in a minute."
+        )
+
+    task = asyncio.ensure_future(_request_forecast(key))
+    _inflight[key] = task
+    task.add_done_callback(lambda done: _finish_inflight(key, done))
+    return task
+
+
+async def _shared_request(key: tuple) -> ForecastSeries:
+    """Start or join the in-flight request for key."""
+    # Shield so a cancelled caller does not cancel the request for the others
+    return await asyncio.shield(_start_request(key))
+
+
+def _finish_inflight(key: tuple, task: asyncio.Task):
+    """Forget a completed request and mark its exception as retrieved."""
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()
+
+
+async def _request_forecast(key: tuple) -> ForecastSeries:
+    """
+    Fetch (or revalidate) one location from met.no and update the cache.
+
+    Each attempt goes to primary_provider (hedged to secondary_provider
+    when one is configured, see _hedged_get) and first takes a token from
+    the provider's rate limiter. 429 and 503
+    replies are retried after the server's Retry-After (or jittered
+    exponential backoff) for as long as RETRY_DEADLINE allows. The outcome
+    is reported to circuit_breaker: network errors, timeouts, 5xx and
+    exhausted 429 retries count as failures.
+    """
+    request_stats["requests"] += 1
+    lat, lon = key_coordinates(key)
+    alt = key[1]
+    params = {
+        "lat": lat,
+        "lon": lon
+    }
+
+    if alt is not None:
+        params["altitude"] = alt
+
+    headers = {}
+    stale = await forecast_cache.get_stale(key)
+    if stale is not None and stale[1]:
+        headers["If-Modified-Since"] = stale[1]
+
+    deadline = time.monotonic() + RETRY_DEADLINE
+    attempt = 0
+
+    try:
+        while True:
+            response = await _hedged_get(params, headers)
+
+            # Cached copy is still current: extend it, skip the body
+            if response.status == 304 and stale is not None:
+                circuit_breaker.record_success()
+                await forecast_cache.refresh(key, ttl_from_headers(response.headers))
+                return stale[0]
+
+            if response.status == 200:
+                circuit_breaker.record_success()
+                data = parse_forecast(response.body, FORECAST_HORIZON_HOURS)
+                ttl = ttl_from_headers(response.headers)
+                last_modified = response.headers.get("Last-Modified")
+                break
+
+            status = response.status
+            delay = backoff_delay(attempt, response.headers.get("Retry-After"))
+
+            # Retry throttling / temporary unavailability within the deadline
+            if status in RETRY_STATUSES and time.monotonic() + delay < deadline:
+                request_stats["retries"] += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+
+            # Sustained throttling or server errors count against the circuit
+            if status == 429 or status >= 500:
+                circuit_breaker.record_failure()
+            else:
+                circuit_breaker.record_success()
+
+            # Handle rate limiting
+            if status == 429:
+                raise WeatherFetchError("Weather API rate limit exceeded. Please try again in a few moments.")
+
+            # Handle other HTTP errors
+            raise WeatherFetchError(f"Weather API error: HTTP {status}. Unable to fetch forecast.")
+
+    except WeatherFetchError:
+        raise
+    except asyncio.CancelledError:
+        # No outcome to report, but a half-open probe must not stay claimed forever
+        circuit_breaker.release_probe()
+        raise
+    except asyncio.TimeoutError:
+        circuit_breaker.record_failure()
+        raise WeatherFetchError("Weather API did not respond in time. Please try again in a few moments.")
+    except aiohttp.ClientError as e:
+        circuit_breaker.record_failure()
+        raise WeatherFetchError(
+            f"Network error while fetching weather data: {str(e)}. Please check your connection and try again."
+        )
+    except Exception as e:
+        circuit_breaker.record_failure()
+        raise WeatherFetchError(f"Unexpected error: {str(e)}")
+
+    await forecast_cache.set(key, data, ttl, last_modified)
+    return data
+
+
+def parse_forecast(body: bytes, horizon_hours: int | None = None) -> ForecastSeries:
+    """
+    Decode a met.no compact payload straight into a ForecastSeries.
+
+    Uses orjson when installed. Only the columns the tools read are kept
+    (geometry, meta and unused fields are dropped) and, if horizon_hours is
+    given, parsing stops after that many hours. This is what gets cached,
+    so memory and disk entries stay small.
+
+    Building the columns costs about 0.2 ms on a 9-day payload on top of the
+    decode, so with the stdlib json decoder this is slower than a bare
+    json.loads; only orjson makes the whole parse faster.
+    """
+    raw = orjson.loads(body) if orjson is not None else json.loads(body)
+    timeseries = raw.get("properties", {}).get("timeseries", [])
+    return ForecastSeries.from_timeseries(timeseries, horizon_hours)
+
+
+def local_timezone() -> tzinfo:
+    """Return LOCAL_TIMEZONE, or UTC if the timezone database is unavailable."""
+    try:
+        return ZoneInfo(LOCAL_TIMEZONE)
+    except ZoneInfoNotFoundError:
+        return timezone.utc
 
 
 def celsius_to_fahrenheit(celsius: float) -> float:
@@ -22,15 +565,127 @@ def format_temperature(celsius: float, units: str = "fahrenheit") -> str:
         return f"{fahrenheit:.1f}°F ({celsius:.1f}°C)"
 
 
+def format_age(seconds: float) -> str:
+    """Format a duration as '12 min' or '3 h'."""
+    minutes = max(int(seconds // 60), 1)
+    if minutes < 90:
+        return f"{minutes} min"
+    return f"{round(minutes / 60)} h"
+
+
+def format_day_summary(day: DaySummary, units: str = "fahrenheit") -> str:
+    """Format one DaySummary as 'date (weekday): low–high, mean, conditions, precipitation'."""
+    text = f"{day.date.isoformat()} ({day.date.strftime('%a')}): "
+
+    if math.isnan(day.temp_min):
+        text += "temperature n/a"
+    elif units == "celsius":
+        text += f"{day.temp_min:.1f}–{day.temp_max:.1f}°C, avg {day.temp_mean:.1f}°C"
+    else:
+        low, high = celsius_to_fahrenheit(day.temp_min), celsius_to_fahrenheit(day.temp_max)
+        text += (f"{low:.0f}–{high:.0f}°F ({day.temp_min:.0f}–{day.temp_max:.0f}°C), "
+                 f"avg {celsius_to_fahrenheit(day.temp_mean):.0f}°F")
+
+    text += f", {(day.symbol or 'unknown').replace('_', ' ').title()}"
+    if day.precipitation > 0:
+        text += f", {day.precipitation:.1f} mm precipitation"
+    return text
+
+
+def parse_date_arg(value: Any, name: str) -> date | None:
+    """Parse an optional YYYY-MM-DD tool argument; raise ValueError with a model-facing message."""
+    if value in (None, ""):
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        raise ValueError(f"Error: {name} must be a date in YYYY-MM-DD format. Got: {value}")
+
+
+def resolve_location(location_name: str) -> PlaceMatch:
+    """
+    Look up a place name in the offline gazetteer.
+
+    Only whole-name matches (or a later word of a name, "Banús") are used:
+    a prefix or typo match may be a different town, so those raise a
+    ValueError listing the candidates instead, as does an unknown name.
+    A later-word match is only used when no other place matches as well
+    ("Frontera" is in four town names, "Sierra" also starts Sierra Nevada).
+    The messages are model-facing.
+    """
+    matches = gazetteer.search(location_name, limit=RESOLVE_CANDIDATES)
+    if matches and matches[0].match == EXACT:
+        return matches[0]
+    close = [match for match in matches if match.match in (EXACT, WORD, PREFIX)]
+    if matches and matches[0].match == WORD and len(close) == 1:
+        return matches[0]
+    if matches:
+        candidates = "; ".join(
+            place.name if place.province == place.name else f"{place.name}, {place.province}"
+            for place in (match.place for match in matches)
+        )
+        if matches[0].match == WORD:
+            raise ValueError(f"Error: '{location_name}' is part of several place names: {candidates}. "
+                             f"Repeat the call with one of these names, or pass latitude and longitude.")
+        raise ValueError(f"Error: No place is named exactly '{location_name}'. Did you mean: {candidates}? "
+                         f"Repeat the call with one of these names, or pass latitude and longitude.")
+    raise ValueError(f"Error: Unknown location '{location_name}'. Pass latitude and longitude, "
+                     f"or use geocode to search for the place.")
+
+
+def format_date_window(
+    data: ForecastSeries,
+    start: date,
+    end: date,
+    units: str,
+    tz: tzinfo,
+    normals: list[MonthNormals] | None = None
+) -> str:
+    """
+    List every day from start to end: a daily summary where the forecast covers
+    it, otherwise a marker saying the day is past or beyond the forecast horizon
+    (with the month's typical range when normals are given).
+    """
+    summaries = {day.date: day for day in data.daily_summaries(tz, start, end)}
+    today = datetime.now(tz).date()
+    horizon = data.last_date(tz)
+
+    lines = []
+    day = start
+    while day <= end:
+        label = f"{day.isoformat()} ({day.strftime('%a')})"
+        if day in summaries:
+            line = format_day_summary(summaries[day], units)
+            if day == horizon:
+                line += " (partial: last forecast day)"
+        elif day < today:
+            line = f"{label}: in the past, no forecast"
+        else:
+            line = f"{label}: beyond the forecast horizon (forecast ends {horizon}), check closer to the date"
+            if normals is not None:
+                typical = normals[day.month - 1]
+                line += (f"; typical for {typical.name}: {_short_temperature(typical.tmin, units)}–"
+                         f"{_short_temperature(typical.tmax, units)}")
+        lines.append(f"- {line}")
+        day += timedelta(days=1)
+
+    return "\n".join(lines)
+
+
 @tool(
     "get_weather_forecast",
-    "Get weather forecast for any location using latitude and longitude. Returns current conditions and 3-day forecast.",
+    "Get weather forecast for any location using latitude and longitude, or just location_name for towns in "
+    "Andalusia and major Spanish cities (looked up offline). Returns current conditions and "
+    "3-day forecast, or per-day summaries for a trip window when start_date/end_date (YYYY-MM-DD) are given; "
+    "days beyond the ~9-day forecast horizon are marked with the typical range for the month (see get_climate_normals).",
     {
         "latitude": float,
         "longitude": float,
         "altitude": int,
         "location_name": str,
-        "units": str
+        "units": str,
+        "start_date": str,
+        "end_date": str
     }
 )
 async def get_weather_forecast(args: dict[str, Any]) -> dict[str, Any]:
@@ -38,14 +693,18 @@ async def get_weather_forecast(args: dict[str, Any]) -> dict[str, Any]:
     Fetch weather forecast from yr.no API.
 
     Args:
-        latitude: Latitude in decimal degrees (required)
-        longitude: Longitude in decimal degrees (required)
+        latitude: Latitude in decimal degrees (required unless location_name is a known place)
+        longitude: Longitude in decimal degrees (required unless location_name is a known place)
         altitude: Elevation in meters (optional, for better accuracy)
-        location_name: Human-readable location name (optional)
+        location_name: Human-readable location name (optional; looked up in the gazetteer
+            when latitude/longitude are missing)
         units: 'fahrenheit' or 'celsius' (default: 'fahrenheit')
+        start_date: First day of a date window, YYYY-MM-DD (optional)
+        end_date: Last day of the window, inclusive (optional; defaults to start_date)
 
     Returns:
-        Formatted weather forecast with current conditions and 3-day summary
+        Formatted weather forecast with current conditions and a 3-day
+        summary, or one line per day of the requested window
     """
     # Extract and validate parameters
     latitude = args.get("latitude")
@@ -54,12 +713,27 @@ async def get_weather_forecast(args: dict[str, Any]) -> dict[str, Any]:
     location_name = args.get("location_name", "the location")
     units = args.get("units", "fahrenheit").lower()
 
+    # Resolve a bare place name from the offline gazetteer
+    resolved = None
+    if (latitude is None or longitude is None) and args.get("location_name"):
+        try:
+            resolved = resolve_location(location_name)
+        except ValueError as e:
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": str(e)
+                }],
+                "is_error": True
+            }
+        latitude, longitude = resolved.place.latitude, resolved.place.longitude
+
     # Validate required parameters
     if latitude is None or longitude is None:
         return {
             "content": [{
                 "type": "text",
-                "text": "Error: Both latitude and longitude are required parameters."
+                "text": "Error: Pass latitude and longitude, or a location_name to look up."
             }],
             "is_error": True
         }
@@ -87,70 +761,57 @@ async def get_weather_forecast(args: dict[str, Any]) -> dict[str, Any]:
     if units not in ["fahrenheit", "celsius"]:
         units = "fahrenheit"
 
-    # Build API URL
-    url = f"https://api.met.no/weatherapi/locationforecast/2.0/compact"
-    params = {
-        "lat": latitude,
-        "lon": longitude
-    }
-
-    if altitude is not None:
-        params["altitude"] = altitude
-
-    # Required User-Agent header
-    headers = {
-        "User-Agent": "MarbellaAgent/1.0 (github.com/user/marbella-agent)"
-    }
-
+    # Validate the optional date window
+    tz = local_timezone()
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
-
-                # Handle rate limiting
-                if response.status == 429:
-                    return {
-                        "content": [{
-                            "type": "text",
-                            "text": "Weather API rate limit exceeded. Please try again in a few moments."
-                        }],
-                        "is_error": True
-                    }
-
-                # Handle other HTTP errors
-                if response.status != 200:
-                    return {
-                        "content": [{
-                            "type": "text",
-                            "text": f"Weather API error: HTTP {response.status}. Unable to fetch forecast."
-                        }],
-                        "is_error": True
-                    }
-
-                data = await response.json()
-
-    except aiohttp.ClientError as e:
+        start_date = parse_date_arg(args.get("start_date"), "start_date")
+        end_date = parse_date_arg(args.get("end_date"), "end_date")
+    except ValueError as e:
         return {
             "content": [{
                 "type": "text",
-                "text": f"Network error while fetching weather data: {str(e)}. Please check your connection and try again."
+                "text": str(e)
             }],
             "is_error": True
         }
-    except Exception as e:
+
+    if end_date is not None and start_date is None:
+        start_date = datetime.now(tz).date()
+    if start_date is not None and end_date is None:
+        end_date = start_date
+
+    if start_date is not None:
+        if end_date < start_date:
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": f"Error: end_date ({end_date}) is before start_date ({start_date})."
+                }],
+                "is_error": True
+            }
+        if (end_date - start_date).days + 1 > MAX_DATE_WINDOW:
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": f"Error: The date window can span at most {MAX_DATE_WINDOW} days."
+                }],
+                "is_error": True
+            }
+
+    try:
+        data, stale_age = await fetch_forecast_or_stale(latitude, longitude, altitude)
+    except WeatherFetchError as e:
         return {
             "content": [{
                 "type": "text",
-                "text": f"Unexpected error: {str(e)}"
+                "text": str(e)
             }],
             "is_error": True
         }
 
-    # Parse weather data
+    # Summarize weather data
     try:
-        properties = data.get("properties", {})
-        timeseries = properties.get("timeseries", [])
-
-        if not timeseries:
+        if not len(data):
             return {
                 "content": [{
                     "type": "text",
@@ -159,60 +820,22 @@ async def get_weather_forecast(args: dict[str, Any]) -> dict[str, Any]:
                 "is_error": True
             }
 
-        # Get current conditions (first entry)
-        current = timeseries[0]
-        current_data = current.get("data", {})
-        instant = current_data.get("instant", {}).get("details", {})
-
-        # Extract current weather
-        current_temp = instant.get("air_temperature")
-        wind_speed = instant.get("wind_speed", 0)
-        wind_direction = instant.get("wind_from_direction", 0)
-        humidity = instant.get("relative_humidity", 0)
-
-        # Get next hours data for precipitation and symbol
-        next_1h = current_data.get("next_1_hours", {})
-        next_6h = current_data.get("next_6_hours", {})
-
-        # Try to get weather symbol
-        symbol_code = None
-        if next_1h:
-            symbol_code = next_1h.get("summary", {}).get("symbol_code")
-        elif next_6h:
-            symbol_code = next_6h.get("summary", {}).get("symbol_code")
-
-        # Try to get precipitation
-        precipitation = None
-        if next_1h:
-            precipitation = next_1h.get("details", {}).get("precipitation_amount")
-        elif next_6h:
-            precipitation = next_6h.get("details", {}).get("precipitation_amount")
-
-        # Build forecast summary for next 3 days
-        forecast_days = []
-
-        # Group by day (take samples every 6 hours for 3 days)
-        for i in range(0, min(len(timeseries), 72), 6):  # 3 days * 24 hours / 6-hour intervals
-            entry = timeseries[i]
-            entry_data = entry.get("data", {})
-            entry_instant = entry_data.get("instant", {}).get("details", {})
-
-            day_temp = entry_instant.get("air_temperature")
-
-            # Get symbol for this period
-            day_next_6h = entry_data.get("next_6_hours", {})
-            day_symbol = day_next_6h.get("summary", {}).get("symbol_code", "unknown")
-
-            if day_temp is not None:
-                forecast_days.append({
-                    "time": entry.get("time", ""),
-                    "temp": day_temp,
-                    "symbol": day_symbol
-                })
+        # Current conditions (first timestep)
+        current = data.current()
+        current_temp = current["temperature"]
+        wind_speed = current["wind_speed"] or 0
+        wind_direction = current["wind_direction"] or 0
+        humidity = current["humidity"] or 0
+        precipitation = current["precipitation"]
+        symbol_code = current["symbol"]
 
         # Format the response
         response_text = f"**Weather Forecast for {location_name}**\n\n"
 
+        if stale_age is not None:
+            response_text += (f"⚠️ The weather service is not responding; this is the last available "
+                              f"forecast (expired {format_age(stale_age)} ago).\n\n")
+
         # Current conditions
         response_text += "**Current Conditions:**\n"
         if current_temp is not None:
@@ -228,27 +851,25 @@ async def get_weather_forecast(args: dict[str, Any]) -> dict[str, Any]:
             weather_desc = symbol_code.replace("_", " ").title()
             response_text += f"- Conditions: {weather_desc}\n"
 
-        # 3-day forecast summary
-        response_text += "\n**3-Day Forecast:**\n"
-
-        days_shown = 0
-        for i, day in enumerate(forecast_days):
-            if days_shown >= 3:
-                break
-
-            # Only show one entry per day (skip similar times)
-            if i % 4 == 0:  # Roughly one per day
-                time_str = day["time"][:10]  # Extract date
-                temp_str = format_temperature(day["temp"], units)
-                conditions = day["symbol"].replace("_", " ").title()
+        if start_date is not None:
+            # Exactly the requested window, from the same cached timeseries
+            response_text += f"\n**Forecast for {start_date} to {end_date}:**\n\n"
+            normals = climate_index.normals(latitude, longitude, altitude)
+            response_text += format_date_window(data, start_date, end_date, units, tz, normals)
+        else:
+            # 3-day forecast summary
+            response_text += "\n**3-Day Forecast:**\n"
 
-                response_text += f"\n- {time_str}: {temp_str}, {conditions}"
-                days_shown += 1
+            # True per-day aggregates over every timestep, by local calendar day
+            for day in data.daily_summaries(tz, days=3):
+                response_text += f"\n- {format_day_summary(day, units)}"
 
         response_text += "\n\n---\n"
         response_text += f"Coordinates: {latitude}°, {longitude}°"
         if altitude:
             response_text += f" at {altitude}m elevation"
+        if resolved is not None:
+            response_text += f" (looked up: {resolved.place.name}, {resolved.place.province})"
         response_text += "\nData provided by yr.no / Norwegian Meteorological Institute"
 
         return {
@@ -266,3 +887,164 @@ async def get_weather_forecast(args: dict[str, Any]) -> dict[str, Any]:
             }],
             "is_error": True
         }
+
+
+def _short_temperature(celsius: float, units: str) -> str:
+    """Format a temperature compactly for comparison tables."""
+    if units == "celsius":
+        return f"{celsius:.0f}°C"
+    return f"{celsius_to_fahrenheit(celsius):.0f}°F"
+
+
+def summarize_forecast(data: ForecastSeries, days: int = 3) -> dict[str, Any]:
+    """
+    Reduce a forecast to current conditions plus per-day temperature ranges.
+
+    Returns:
+        Dict with 'temp', 'symbol' (current) and 'days' mapping the first
+        `days` local dates (ISO strings) to (min, max) air temperature in Celsius
+    """
+    if not len(data):
+        raise ValueError("No forecast data available for this location.")
+
+    current = data.current()
+    return {
+        "temp": current["temperature"],
+        "symbol": current["symbol"],
+        "days": {
+            day.date.isoformat(): (day.temp_min, day.temp_max)
+            for day in data.daily_summaries(local_timezone(), days=days)
+            if not math.isnan(day.temp_min)
+        }
+    }
+
+
+@tool(
+    "get_weather_forecasts",
+    "Compare weather for several locations in one call. 'locations' is a list of objects with "
+    "latitude, longitude and optional name/altitude, or just place names for towns in Andalusia and major "
+    "Spanish cities. Returns a side-by-side table of current "
+    "conditions and 3-day temperature ranges.",
+    {
+        "locations": list,
+        "units": str
+    }
+)
+async def get_weather_forecasts(args: dict[str, Any]) -> dict[str, Any]:
+    """
+    Fetch forecasts for several locations concurrently.
+
+    Requests share the module's concurrency limit (MAX_CONCURRENT_REQUESTS),
+    so a batch never exceeds what a single caller would send to met.no.
+
+    Args:
+        locations: List of {latitude, longitude, name?, altitude?}; entries with only
+            a name (or plain strings) are looked up in the gazetteer
+        units: 'fahrenheit' or 'celsius' (default: 'fahrenheit')
+
+    Returns:
+        Compact comparison table, one row per location
+    """
+    locations = args.get("locations") or []
+    units = (args.get("units") or "fahrenheit").lower()
+
+    if units not in ["fahrenheit", "celsius"]:
+        units = "fahrenheit"
+
+    if not isinstance(locations, list) or not locations:
+        return {
+            "content": [{
+                "type": "text",
+                "text": "Error: locations must be a non-empty list of {latitude, longitude, name} objects."
+            }],
+            "is_error": True
+        }
+
+    if len(locations) > MAX_BATCH_LOCATIONS:
+        return {
+            "content": [{
+                "type": "text",
+                "text": f"Error: At most {MAX_BATCH_LOCATIONS} locations can be compared in one call. Got: {len(locations)}"
+            }],
+            "is_error": True
+        }
+
+    async def fetch_one(location: Any) -> tuple[str, dict[str, Any] | str]:
+        if isinstance(location, str):
+            location = {"name": location}
+        if not isinstance(location, dict):
+            return str(location), "Invalid location (expected an object with latitude and longitude)"
+
+        latitude = location.get("latitude")
+        longitude = location.get("longitude")
+        name = location.get("name") or location.get("location_name") or f"{latitude}, {longitude}"
+
+        if (latitude is None or longitude is None) and (location.get("name") or location.get("location_name")):
+            try:
+                place = resolve_location(name).place
+            except ValueError as e:
+                return name, str(e).removeprefix("Error: ")
+            latitude, longitude = place.latitude, place.longitude
+
+        if latitude is None or longitude is None:
+            return name, "Missing latitude/longitude"
+
+        # List elements are not checked against the tool schema, so coerce them here
+        altitude = location.get("altitude")
+        try:
+            latitude, longitude = float(latitude), float(longitude)
+            altitude = None if altitude is None else int(float(altitude))
+        except (TypeError, ValueError):
+            return name, "Invalid latitude/longitude/altitude (expected numbers)"
+        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+            return name, "Coordinates out of range"
+
+        try:
+            data, stale_age = await fetch_forecast_or_stale(latitude, longitude, altitude)
+            if stale_age is not None:
+                name += " (stale)"
+            return name, summarize_forecast(data)
+        except WeatherFetchError as e:
+            return name, str(e)
+        except (KeyError, ValueError, TypeError) as e:
+            return name, f"Error parsing weather data: {str(e)}"
+
+    results = await asyncio.gather(*(fetch_one(location) for location in locations))
+
+    days = sorted({day for _, summary in results if isinstance(summary, dict) for day in summary["days"]})[:3]
+
+    response_text = "**Weather Comparison**\n\n"
+    response_text += "| Location | Now | Conditions | " + " | ".join(days) + " |\n"
+    response_text += "|---|---|---|" + "---|" * len(days) + "\n"
+
+    for name, summary in results:
+        if isinstance(summary, str):
+            response_text += f"| {name} | ⚠ {summary} |" + " |" * (len(days) + 1) + "\n"
+            continue
+
+        now = _short_temperature(summary["temp"], units) if summary["temp"] is not None else "–"
+        conditions = (summary["symbol"] or "unknown").replace("_", " ").title()
+        cells = []
+        for day in days:
+            if day in summary["days"]:
+                low, high = summary["days"][day]
+                cells.append(f"{_short_temperature(low, units)}–{_short_temperature(high, units)}")
+            else:
+                cells.append("–")
+        response_text += f"| {name} | {now} | {conditions} | " + " | ".join(cells) + " |\n"
+
+    response_text += "\nDaily columns show min–max temperature (local dates)."
+    if any(name.endswith(" (stale)") for name, _ in results):
+        response_text += ("\n(stale) rows show the last available forecast because the weather service "
+                          "is not responding.")
+    response_text += "\nData provided by yr.no / Norwegian Meteorological Institute"
+
+    result = {
+        "content": [{
+            "type": "text",
+            "text": response_text
+        }]
+    }
+    if all(isinstance(summary, str) for _, summary in results):
+        result["is_error"] = True
+    return result